@@ -0,0 +1,193 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ConversationStore:
+    """
+    Keeps the state of each seller's conversation (e.g. a pending ingestion waiting for its price)
+    between messages, keyed by `sender_id`, so a multi-message dialog builds one product.
+
+    Reads are served from an in-memory LRU of at most `max_entries` conversations. Every write goes
+    through to a local SQLite file, so nothing is lost when a conversation is evicted or the process
+    restarts. Conversations expire `ttl` seconds after their last update.
+
+    `snapshot()` dumps the in-memory conversations to a file and `restore()` loads them back, so
+    after a deploy the active conversations are hot again without a query per sender.
+
+    States must be JSON serializable (don't store pywa objects or asyncio tasks).
+    """
+    def __init__(self, path: str, max_entries: int = 10_000, ttl: float = 1800.0):
+        """
+        Initializes the ConversationStore.
+
+        Args:
+            path: The SQLite database file (created if missing).
+            max_entries: The maximum number of conversations kept in memory.
+            ttl: How long (in seconds) to keep a conversation after its last update.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict() # sender_id -> (updated_at, state)
+        self._lock = threading.Lock() # The store is used from the event loop and from worker threads
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None) # autocommit
+        self._db.execute("PRAGMA journal_mode=WAL") # Writers don't block readers, and commits are cheap
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS conversations ("
+            "sender_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        # Simple counters, exposed via stats()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, sender_id: str, updated_at: float, state: Dict[str, Any]):
+        """Adds the conversation to the in-memory LRU, evicting the least recently used one if full."""
+        self._cache[sender_id] = (updated_at, state)
+        self._cache.move_to_end(sender_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False) # Still in SQLite
+
+    def get(self, sender_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets the state of the sender's conversation.
+
+        Args:
+            sender_id: The WhatsApp ID of the sender.
+
+        Returns:
+            dict: A copy of the state, or None if there is no conversation (or it expired).
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(sender_id)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._cache.move_to_end(sender_id)
+                    self.hits += 1
+                    return dict(entry[1])
+                del self._cache[sender_id]
+            self.misses += 1
+            row = self._db.execute(
+                "SELECT state, updated_at FROM conversations WHERE sender_id = ?", (sender_id,)
+            ).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                return None
+            state = json.loads(row[0])
+            self._remember(sender_id, row[1], state)
+            return dict(state)
+
+    def put(self, sender_id: str, state: Dict[str, Any]):
+        """
+        Saves the state of the sender's conversation (in memory and in SQLite).
+
+        Args:
+            sender_id: The WhatsApp ID of the sender.
+            state: The state to save (JSON serializable).
+        """
+        data = json.dumps(state) # Fails before touching the store if the state isn't serializable
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO conversations (sender_id, state, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(sender_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                (sender_id, data, now),
+            )
+            self._remember(sender_id, now, dict(state))
+
+    def delete(self, sender_id: str):
+        """Ends the sender's conversation."""
+        with self._lock:
+            self._cache.pop(sender_id, None)
+            self._db.execute("DELETE FROM conversations WHERE sender_id = ?", (sender_id,))
+
+    def purge_expired(self) -> int:
+        """
+        Deletes the expired conversations from SQLite (they are already ignored by `get`).
+
+        Returns:
+            int: The number of conversations deleted.
+        """
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for sender_id in [s for s, (updated_at, _) in self._cache.items() if updated_at <= cutoff]:
+                del self._cache[sender_id]
+            return self._db.execute("DELETE FROM conversations WHERE updated_at <= ?", (cutoff,)).rowcount
+
+    def snapshot(self, path: str) -> int:
+        """
+        Writes the in-memory conversations to a file (atomically), to `restore` them after a restart.
+
+        Args:
+            path: The snapshot file.
+
+        Returns:
+            int: The number of conversations written.
+        """
+        with self._lock:
+            entries = [[sender_id, updated_at, state] for sender_id, (updated_at, state) in self._cache.items()]
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.info(f"Saved a snapshot of {len(entries)} conversations to {path}")
+        return len(entries)
+
+    def restore(self, path: str) -> int:
+        """
+        Loads the conversations of a snapshot into memory (the ones that did not expire meanwhile).
+
+        Conversations updated in SQLite after the snapshot was taken are loaded from SQLite instead, and the ones
+        deleted since (no longer in SQLite) are skipped.
+
+        Args:
+            path: The snapshot file (a missing file restores nothing).
+
+        Returns:
+            int: The number of conversations restored.
+        """
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return 0
+        now = time.time()
+        restored = 0
+        with self._lock:
+            stored = dict(self._db.execute("SELECT sender_id, updated_at FROM conversations").fetchall())
+            for sender_id, updated_at, state in entries[-self.max_entries:]: # Least recently used first
+                if now - updated_at >= self.ttl or stored.get(sender_id, float("inf")) > updated_at:
+                    continue # Expired, deleted, or updated since the snapshot
+                self._remember(sender_id, updated_at, state)
+                restored += 1
+        logger.info(f"Restored {restored} conversations from {path}")
+        return restored
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the in-memory size and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "in_memory": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
+
+    def close(self):
+        """Closes the SQLite connection."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class IntentCache:
+    """
+    Caches the LLM intent analysis of messages, so repeated greetings, identical buyer queries
+    ("iphone price") and forwarded duplicates don't each cost an OpenAI round trip.
+
+    Entries are keyed by the hash of the normalized text (case and whitespace folded) plus whether
+    the message had media (and any other flag the prompt depends on). At most `max_entries` analyses
+    are kept (least recently used evicted first), each for `ttl` seconds.
+
+    Identical messages analyzed at the same time share one LLM call.
+    """
+    def __init__(self, max_entries: int = 5000, ttl: float = 3600.0):
+        """
+        Initializes the IntentCache.
+
+        Args:
+            max_entries: The maximum number of cached analyses.
+            ttl: How long (in seconds) an analysis is reused.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict() # key -> (expires_at, analysis)
+        self._in_flight: Dict[str, asyncio.Future] = {} # key -> analysis being computed
+        # Simple counters, exposed via stats()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0 # Misses that waited for an identical in-flight analysis
+
+    @staticmethod
+    def make_key(text: Optional[str], has_media: bool, *flags: Any) -> str:
+        """
+        Builds the cache key of a message.
+
+        Args:
+            text: The text or caption of the message.
+            has_media: Whether the message had media.
+            *flags: Anything else the prompt depends on.
+
+        Returns:
+            str: The key.
+        """
+        normalized = " ".join((text or "").casefold().split())
+        digest = hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+        return ":".join([digest, "m" if has_media else "t", *map(str, flags)])
+
+    async def get_or_analyze(self, key: str, analyze: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached analysis of the key, or awaits `analyze()` and caches its result.
+
+        Args:
+            key: The cache key (see `make_key`).
+            analyze: Runs the analysis (not called on a hit). Failures are not cached.
+
+        Returns:
+            The analysis.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        self.misses += 1
+        if key in self._in_flight:
+            self.coalesced += 1
+            return await asyncio.shield(self._in_flight[key]) # Don't cancel the shared analysis with this waiter
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            analysis = await analyze()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception() # Mark as retrieved, there may be no other waiter
+            raise
+        finally:
+            del self._in_flight[key]
+        future.set_result(analysis)
+        self._entries[key] = (time.monotonic() + self.ttl, analysis)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return analysis
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache size and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
@@ -9,6 +9,7 @@ import hashlib
 import hmac
 import logging # Add logging import
 import time # Add time import for sleep
+import asyncio
 
 # Configure logging *before* first use
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -58,7 +59,7 @@ if not META_APP_SECRET:
 
 # --- WhatsApp Client Setup (Using pywa) ---
 # Remove the old client import and instantiation
-from whatsapp import WhatsAppClient # Keep for media download for now
+from whatsapp_client import AsyncWhatsAppClient # Async media downloader (shared httpx.AsyncClient)
 
 app = FastAPI() # pywa needs the FastAPI app instance
 
@@ -71,7 +72,11 @@ wa = WhatsApp(
     verify_token=META_WA_VERIFY_TOKEN,
     app_secret=META_APP_SECRET, # Provide the app secret for signature validation
     callback_url=None, # Set via ngrok/deployment, pywa doesn't need it here if FastAPI handles routing
-    business_account_id=None # Optional: Add if needed later
+    business_account_id=None, # Optional: Add if needed later
+    # Acknowledge webhooks immediately and run the (slow) handlers in the background,
+    # so LLM/Meilisearch latency doesn't make Meta retry the delivery
+    background_workers=int(os.getenv("PYWA_BACKGROUND_WORKERS", "8")),
+    max_queued_updates=int(os.getenv("PYWA_MAX_QUEUED_UPDATES", "1000")),
 )
 
 # --- LLM Client Setup (Standard OpenAI) ---
@@ -95,9 +100,19 @@ class QueryAnalysis(BaseModel):
     currency: Optional[str] = Field(default=None, description="The currency code (e.g., UGX, USD) mentioned, if any.")
     # Add more fields as needed, e.g., description, quantity
 
+# Built once: rebuilding the structured-output runnable per message is wasted work
+structured_llm = llm.with_structured_output(QueryAnalysis)
+
+# Repeated messages (greetings, identical queries, forwards) reuse the previous analysis instead of calling OpenAI
+from intent_cache import IntentCache
+intent_cache = IntentCache(
+    max_entries=int(os.getenv("INTENT_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("INTENT_CACHE_TTL_SEC", "3600")),
+)
+
 # --- LangGraph & Meilisearch Setup ---
 from langgraph.graph import StateGraph, END
-import meilisearch
+from meilisearch_python_sdk import AsyncClient as MeiliAsyncClient # Async client, so graph nodes don't block the event loop
 import re # Import regex for price extraction
 
 # 1. Define the State (Updated for Ingestion)
@@ -109,6 +124,7 @@ class AgentState(TypedDict):
     incoming_media_mime_type: str | None # Added: e.g., 'image/jpeg'
     incoming_media_filename: str | None # Added: For documents
     incoming_media_path: str | None # Local path to downloaded media
+    incoming_media_download: Optional[asyncio.Task] # Prefetch task resolving to incoming_media_path (awaited when needed)
     
     # Analysis results
     intent: str | None
@@ -118,6 +134,8 @@ class AgentState(TypedDict):
     currency: str | None
     description: str | None # Added for ingestion
     product_to_ingest: Optional[Dict[str, Any]] # Added: Data structured for ingestion
+    pending_ingestion: Optional[Dict[str, Any]] # Draft product from this sender's previous messages (see ConversationStore)
+    draft_merged: bool # Whether product_to_ingest completes pending_ingestion (so the draft is deleted once enqueued)
     
     # Meilisearch related
     meili_filters: str | None
@@ -131,17 +149,53 @@ class AgentState(TypedDict):
 
 # 2. Meilisearch Client
 # Ensure Meilisearch container is running (docker run ...)
-meili_client = meilisearch.Client('http://localhost:7700')
+MEILI_URL = os.getenv("MEILI_URL", "http://localhost:7700")
+MEILI_API_KEY = os.getenv("MEILI_API_KEY") # Not needed in development mode
+meili_client = MeiliAsyncClient(MEILI_URL, api_key=MEILI_API_KEY)
 meili_index = meili_client.index('products')
 
+# Max number of graph runs (LLM + Meilisearch round trips) in flight at once, across all senders
+GRAPH_CONCURRENCY = int(os.getenv("GRAPH_CONCURRENCY", "16"))
+graph_semaphore = asyncio.Semaphore(GRAPH_CONCURRENCY)
+
+# Coalesce products from concurrent sellers into batched add_documents calls (one Meilisearch task per batch)
+from meili_ingest import IngestionBuffer
+ingestion_buffer = IngestionBuffer(
+    meili_index,
+    max_batch_size=int(os.getenv("MEILI_BATCH_SIZE", "100")),
+    max_delay=float(os.getenv("MEILI_BATCH_MAX_DELAY_MS", "50")) / 1000,
+)
+
+# One shared poll loop tracks all outstanding Meilisearch tasks (GET /tasks?uids=...)
+import httpx
+from meili_tasks import TaskWatcher, TaskTimeoutError
+meili_http = httpx.AsyncClient(
+    base_url=MEILI_URL,
+    headers={"Authorization": f"Bearer {MEILI_API_KEY}"} if MEILI_API_KEY else None,
+    timeout=10,
+)
+task_watcher = TaskWatcher(meili_http, timeout=float(os.getenv("MEILI_TASK_TIMEOUT", "30")))
+
+# Per-sender conversation state (e.g. a photo waiting for its price), kept across messages and restarts
+from conversation_store import ConversationStore
+conversation_store = ConversationStore(
+    os.getenv("CONVERSATION_DB_PATH", "conversations.db"),
+    max_entries=int(os.getenv("CONVERSATION_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("CONVERSATION_TTL_SEC", "1800")),
+)
+CONVERSATION_SNAPSHOT_PATH = os.getenv("CONVERSATION_SNAPSHOT_PATH", "conversations.snapshot.json")
+conversation_store.purge_expired()
+conversation_store.restore(CONVERSATION_SNAPSHOT_PATH) # Warm the cache with the conversations active before the restart
+
 # 3. Define Nodes
-def analyze_intent_node(state: AgentState):
+async def analyze_intent_node(state: AgentState):
     """Analyzes message text/media using LLM to extract intent and key entities."""
     logger.info("--- Running Analyze Intent Node ---")
     text_content = state.get('incoming_text') # Can be None
     message_type = state.get('incoming_message_type')
     media_path = state.get('incoming_media_path') # Get media path
     media_id = state.get('incoming_media_id') # Check if media ID exists
+    pending = state.get('pending_ingestion') # A product from earlier messages still waiting for details
 
     # --- Handle No Content --- # Updated Check
     # If there's no text AND no media ID (meaning no media was sent or couldn't be processed)
@@ -171,25 +225,36 @@ def analyze_intent_node(state: AgentState):
 
     # --- LLM Analysis (if text is available or forced intent needs details) ---
     try:
-        structured_llm = llm.with_structured_output(QueryAnalysis)
         prompt_guidance = (
             "The intent is likely either 'query_product' (asking about something) or 'ingest_product' (stating availability/price/details of something, possibly to sell). "
-            f"A media file ({message_type}) was {'present (ID: ' + media_id + ')' if media_id else 'not present'}. "
+            f"A media file was {'present' if media_id else 'not present'}. "
             f"If media was present, the intent is almost certainly 'ingest_product'. "
             "Extract item name, price (if stated), and currency (if stated) from the text. The full text can serve as a description if the intent is ingestion. "
             "If media was not present, determine intent primarily from the text (lean towards 'query_product' unless keywords like 'sell', 'stock', 'available', 'price' suggest ingestion). Extract location only if it's a query." 
         )
+        if pending and not media_id:
+            prompt_guidance += (
+                f" The user is in the middle of adding a product ('{pending.get('item_name') or 'unnamed'}') and was asked for its missing details; "
+                "a message stating a price or a name most likely completes it ('ingest_product')."
+            )
         prompt = (
             f"Analyze the following user message content. {prompt_guidance}"
             f"Text Content: '{text_content}'"
         )
-        analysis: QueryAnalysis = structured_llm.invoke(prompt)
+        # The prompt only depends on the text, the media flag and the pending product, so neither does the key
+        cache_key = intent_cache.make_key(text_content, bool(media_id), (pending.get('item_name') or '') if pending and not media_id else '-')
+        analysis: QueryAnalysis = await intent_cache.get_or_analyze(
+            cache_key, lambda: structured_llm.ainvoke(prompt) # Uses the async OpenAI client
+        )
         logger.info(f"LLM Analysis Result: {analysis}")
 
         # Override LLM intent if media was present
         if media_id:
             state['intent'] = 'ingest_product'
             logger.info("Ensuring intent is 'ingest_product' due to media presence.")
+        elif pending and analysis.intent not in ('query_product', 'greeting'):
+            state['intent'] = 'ingest_product' # e.g. "price is 50k" after a photo
+            logger.info(f"Continuing the pending ingestion (LLM intent: {analysis.intent}).")
         else:
             state['intent'] = analysis.intent
             logger.info(f"Setting intent based on LLM analysis (no media): {analysis.intent}")
@@ -224,17 +289,43 @@ def analyze_intent_node(state: AgentState):
     logger.info(f"Analyze Intent Node Completed. Intent: '{state['intent']}', Item: '{state['item_name']}'")
     return state
 
-def structure_ingestion_data_node(state: AgentState):
+async def structure_ingestion_data_node(state: AgentState):
     """Prepares structured data for adding to Meilisearch, including media path."""
     logger.info("--- Running Structure Ingestion Data Node --- ")
     
     # Retrieve data from state
     sender_id = state.get('sender_id')
-    item_name = state.get('item_name')
-    description = state.get('description')
-    price = state.get('price')
-    currency = state.get('currency', "UGX") # Default currency
+    media_id = state.get('incoming_media_id')
+    # A text message completes the sender's pending product; a new media starts a new one
+    pending = state.get('pending_ingestion') if not media_id else None
+    draft = pending or {}
+    item_name = state.get('item_name') or draft.get('item_name')
+    description = "\n".join(d for d in (draft.get('description'), state.get('description')) if d) or None
+    price = state.get('price') if state.get('price') is not None else draft.get('price')
+    currency = state.get('currency') or draft.get('currency') or "UGX" # Default currency
     media_path = state.get('incoming_media_path') # Get the media path
+    if not media_path and state.get('incoming_media_download') is not None:
+        # The download ran concurrently with the LLM analysis; only wait for whatever is left of it
+        media_path = state['incoming_media_path'] = await state['incoming_media_download']
+        if not media_path:
+            logger.error(f"Failed to download media for ID: {state.get('incoming_media_id')}")
+    media_path = media_path or draft.get('media_path')
+
+    # Missing details: keep the draft and ask for them (once), the next message of the sender completes it
+    if pending is None and (price is None or not (item_name or description)):
+        await asyncio.to_thread(conversation_store.put, sender_id, {
+            "item_name": item_name,
+            "description": description,
+            "price": price,
+            "currency": state.get('currency'),
+            "media_path": media_path,
+            "media_id": media_id,
+        })
+        missing = "price" if item_name or description else "name and price"
+        state['response'] = f"Got it! What's the {missing} of {repr(item_name) if item_name else 'this item'}?"
+        state['product_to_ingest'] = None
+        logger.info(f"Saved a pending ingestion for {sender_id}, waiting for the {missing}.")
+        return state
 
     # Basic validation
     if not item_name and not description:
@@ -242,6 +333,7 @@ def structure_ingestion_data_node(state: AgentState):
         # Set an error response, though this node ideally shouldn't be reached if intent analysis was poor.
         state['response'] = "Missing product name/description for ingestion."
         state['product_to_ingest'] = None # Ensure no data proceeds
+        await asyncio.to_thread(conversation_store.delete, sender_id) # Asked once already, start over
         return state # Or should we allow routing to END? Let's stop data flow here.
 
     # Use description as name if item_name wasn't extracted but description exists
@@ -269,9 +361,10 @@ def structure_ingestion_data_node(state: AgentState):
 
     logger.info(f"Structured product data for Meilisearch: {product_data}")
     state['product_to_ingest'] = product_data # Add to state for next node
+    state['draft_merged'] = pending is not None
     return state
 
-def add_product_to_meili_node(state: AgentState):
+async def add_product_to_meili_node(state: AgentState):
     """Adds the structured product data to Meilisearch and initiates polling."""
     logger.info("--- Running Add Product to Meili Node ---")
     product_data = state.get('product_to_ingest')
@@ -285,23 +378,15 @@ def add_product_to_meili_node(state: AgentState):
 
     try:
         logger.info(f"Adding document to Meilisearch index 'products': {product_data['id']}")
-        task_info = meili_index.add_documents([product_data])
-        logger.info(f"Meilisearch add_documents task info: {task_info}")
-
-        # Check if task_info is the new TaskInfo object or legacy dict
-        if hasattr(task_info, 'task_uid'):
-            task_id = task_info.task_uid
-        elif isinstance(task_info, dict) and 'taskUid' in task_info:
-             task_id = task_info['taskUid']
-        else:
-            logger.error(f"Could not extract task ID from Meilisearch response: {task_info}")
-            state['response'] = "Error: Failed to get task ID after submitting product."
-            return state
+        # Waits for the batch containing this product; the task is shared by the whole batch
+        task_id = await ingestion_buffer.add(product_data)
 
         state['meili_task_id'] = task_id
         state['meili_task_status'] = 'enqueued' # Initial status
         logger.info(f"Meilisearch Task ID {task_id} enqueued for product {product_data['id']}.")
-        # No immediate response here, polling node will handle confirmation
+        if state.get('draft_merged'):
+            await asyncio.to_thread(conversation_store.delete, state['sender_id']) # The draft is complete
+        # No immediate response here; handle_incoming_message waits for the task (outside graph_semaphore) and confirms
 
     except Exception as e:
         logger.exception(f"Error adding document to Meilisearch: {e}")
@@ -310,7 +395,7 @@ def add_product_to_meili_node(state: AgentState):
 
     return state
 
-def search_meilisearch_node(state: AgentState):
+async def search_meilisearch_node(state: AgentState):
     """Searches Meilisearch using extracted item name and filters."""
     logger.info("--- Running Search Meilisearch Node ---") # Use logger
     query = state.get('item_name') # Use extracted item name
@@ -325,13 +410,9 @@ def search_meilisearch_node(state: AgentState):
         return state
 
     try:
-        search_params = {
-            "filter": filters
-        } if filters else {}
-
         logger.info(f"Searching index 'products' for: '{query}' with filters: {filters}") # Use logger
-        search_result = meili_index.search(query, search_params)
-        hits = search_result.get('hits', [])
+        search_result = await meili_index.search(query, filter=filters)
+        hits = search_result.hits
         state['search_results'] = hits
         logger.info(f"Found {len(hits)} results.") # Use logger
 
@@ -352,6 +433,49 @@ def search_meilisearch_node(state: AgentState):
         state['response'] = "Sorry, there was an error searching."
     return state
 
+async def poll_meili_task_status_node(state: AgentState):
+    """Waits for the Meilisearch task via the shared task watcher (runs after the graph, outside graph_semaphore)."""
+    logger.info("--- Running Poll Meili Task Status Node ---")
+    task_id = state.get('meili_task_id')
+    product_data = state.get('product_to_ingest') or {}
+    product_name = product_data.get('name', 'the product')
+
+    if task_id is None:
+        # add_product_to_meili_node already set an error response
+        return state
+
+    try:
+        task = await task_watcher.wait(task_id)
+        state['meili_task_status'] = task.get('status')
+        logger.info(f"Meilisearch task {task_id} finished with status: {state['meili_task_status']}")
+        if state['meili_task_status'] == 'succeeded':
+            state['response'] = f"Thanks! '{product_name}' was added to the catalog."
+        else:
+            logger.error(f"Meilisearch task {task_id} did not succeed: {task.get('error')}")
+            state['response'] = f"Sorry, '{product_name}' could not be added to the catalog."
+    except TaskTimeoutError:
+        state['meili_task_status'] = 'processing'
+        state['response'] = f"'{product_name}' was received and will appear in the catalog shortly."
+    except Exception as e:
+        logger.exception(f"Error waiting for Meilisearch task {task_id}: {e}")
+        state['response'] = f"'{product_name}' was received, but I couldn't confirm it was added."
+
+    return state
+
+async def send_whatsapp_confirmation_node(state: AgentState):
+    """Sends the response back to the seller, using the pywa message object stored in state."""
+    logger.info("--- Running Send WhatsApp Confirmation Node ---")
+    msg = state.get('whatsapp_message_object')
+    response = state.get('response')
+    if msg is None or not response:
+        logger.warning("Nothing to send: missing message object or response.")
+        return state
+    try:
+        await msg.reply_text(text=response)
+    except Exception as e:
+        logger.exception(f"Failed to send confirmation to {state.get('sender_id')}: {e}")
+    return state
+
 # 4. Define Conditional Edge Function (Updated)
 def route_after_intent_analysis(state: AgentState):
     """Routes workflow based on classified intent."""
@@ -387,6 +511,19 @@ def route_after_intent_analysis(state: AgentState):
              state['response'] = "Sorry, I encountered an issue processing your request."
         return END
 
+def route_after_adding(state: AgentState):
+    """Replies with the error if the product wasn't enqueued; otherwise the task is awaited after the graph run."""
+    if state.get('meili_task_id') is None:
+        return "send_whatsapp_confirmation"
+    return END
+
+def route_after_structuring(state: AgentState):
+    """Adds the product if it's complete, otherwise just replies (e.g. asking for the price)."""
+    if state.get('product_to_ingest'):
+        return "add_product_to_meili"
+    logger.info("Decision: Product incomplete, replying to the seller.")
+    return "send_whatsapp_confirmation"
+
 # 5. Build the Graph (Updated with ingestion path)
 workflow = StateGraph(AgentState)
 
@@ -395,6 +532,7 @@ workflow.add_node("analyze_intent", analyze_intent_node)
 workflow.add_node("search_meili", search_meilisearch_node)
 workflow.add_node("structure_ingestion_data", structure_ingestion_data_node)
 workflow.add_node("add_product_to_meili", add_product_to_meili_node)
+workflow.add_node("send_whatsapp_confirmation", send_whatsapp_confirmation_node)
 
 # Define edges
 workflow.set_entry_point("analyze_intent")
@@ -414,8 +552,24 @@ workflow.add_conditional_edges(
 workflow.add_edge("search_meili", END)
 
 # Edges for the ingestion path
-workflow.add_edge("structure_ingestion_data", "add_product_to_meili")
-workflow.add_edge("add_product_to_meili", END)
+workflow.add_conditional_edges(
+    "structure_ingestion_data",
+    route_after_structuring,
+    {
+        "add_product_to_meili": "add_product_to_meili",
+        "send_whatsapp_confirmation": "send_whatsapp_confirmation",
+    }
+)
+# Waiting for the Meilisearch task (up to MEILI_TASK_TIMEOUT) happens after the run, so it doesn't hold a graph slot
+workflow.add_conditional_edges(
+    "add_product_to_meili",
+    route_after_adding,
+    {
+        "send_whatsapp_confirmation": "send_whatsapp_confirmation",
+        END: END,
+    }
+)
+workflow.add_edge("send_whatsapp_confirmation", END)
 
 # Compile the graph
 app_graph = workflow.compile()
@@ -427,6 +581,19 @@ app = FastAPI()
 async def root():
     return {"status": "Service is running", "pywa_status": "initialized"}
 
+@app.on_event("shutdown")
+async def close_meili_client():
+    await ingestion_buffer.aclose() # Send the products still waiting in the buffer
+    logger.info(f"Meilisearch ingestion stats: {ingestion_buffer.stats()}")
+    await task_watcher.aclose()
+    await meili_http.aclose()
+    await meili_client.aclose() # Release the pooled HTTP connections
+    await media_downloader.aclose()
+    conversation_store.snapshot(CONVERSATION_SNAPSHOT_PATH) # Restored on the next startup
+    logger.info(f"Conversation store stats: {conversation_store.stats()}")
+    logger.info(f"Intent cache stats: {intent_cache.stats()}")
+    conversation_store.close()
+
 # --- pywa Handlers --- #
 
 # Directory to store downloaded media
@@ -434,9 +601,23 @@ MEDIA_UPLOAD_DIR = "media_uploads"
 if not os.path.exists(MEDIA_UPLOAD_DIR):
     os.makedirs(MEDIA_UPLOAD_DIR)
 
-# Create instance of our existing WhatsAppClient for media downloads
+# Create instance of our async media client for media downloads (doesn't block the event loop)
 # (Could potentially be replaced by pywa's download methods if preferred)
-media_downloader = WhatsAppClient(bearer_token=META_WA_ACCESS_TOKEN)
+media_downloader = AsyncWhatsAppClient(
+    bearer_token=META_WA_ACCESS_TOKEN,
+    max_connections=int(os.getenv("MEDIA_MAX_CONNECTIONS", "20")),
+)
+
+# Downloads run on a pool shared by all senders, and start as soon as the update is parsed
+from media_prefetch import MediaPrefetcher
+media_prefetcher = MediaPrefetcher(media_downloader, max_concurrency=int(os.getenv("MEDIA_PREFETCH_CONCURRENCY", "8")))
+
+@wa.on_raw_update()
+async def prefetch_media_from_update(client: WhatsApp, update: dict):
+    """Starts the media downloads of a whole burst/album right away (raw updates aren't queued per sender)."""
+    started = media_prefetcher.prefetch_update(update)
+    if started:
+        logger.info(f"Prefetching {started} media file(s), {media_prefetcher.in_flight} download(s) in flight")
 
 @wa.on_message() # Handles text, media (image, video, audio, document) messages
 async def handle_incoming_message(client: WhatsApp, msg: pt.Message):
@@ -449,6 +630,7 @@ async def handle_incoming_message(client: WhatsApp, msg: pt.Message):
         incoming_text=None,
         incoming_media_id=None,
         incoming_media_path=None,
+        incoming_media_download=None,
         incoming_media_mime_type=None,
         incoming_media_filename=None,
         intent=None,
@@ -458,6 +640,8 @@ async def handle_incoming_message(client: WhatsApp, msg: pt.Message):
         currency=None,
         description=None,
         product_to_ingest=None,
+        pending_ingestion=await asyncio.to_thread(conversation_store.get, msg.from_user.wa_id),
+        draft_merged=False,
         meili_filters=None,
         search_results=None,
         response=None,
@@ -496,42 +680,27 @@ async def handle_incoming_message(client: WhatsApp, msg: pt.Message):
         logger.info(f"Media detected: ID={media_id}, Type={initial_state['incoming_message_type']}, Mime={initial_state['incoming_media_mime_type']}")
         
         # --- Download Media --- #
-        try:
-            # Use our existing download logic (or switch to pywa's if available/preferred)
-            # file_path = await media_to_download.download(path=MEDIA_UPLOAD_DIR) # Check if pywa has async download
-            
-            # Using existing client for download
-            file_path = media_downloader.download_media(
-                media_id=media_id,
-                filename_prefix=f"{msg.from_user.wa_id}_{msg.id}", # Unique prefix
-                save_dir=MEDIA_UPLOAD_DIR,
-                mime_type=initial_state['incoming_media_mime_type'], # Pass mime type
-                original_filename=initial_state['incoming_media_filename'] # Pass original filename for docs
-            )
-            
-            if file_path:
-                initial_state['incoming_media_path'] = file_path
-                logger.info(f"Media downloaded successfully to: {file_path}")
-            else:
-                logger.error(f"Failed to download media for ID: {media_id}")
-                # Optionally send an immediate error reply?
-                # await msg.reply_text("Sorry, I couldn't download the media you sent.") 
-                # Or let the graph handle it based on missing media_path
-
-        except Exception as e:
-            logger.exception(f"Error downloading media ID {media_id}: {e}")
-            # Proceed without media path, graph should handle it
+        # Usually already started by prefetch_media_from_update; either way, don't wait for it here,
+        # structure_ingestion_data_node awaits it after the LLM analysis
+        initial_state['incoming_media_download'] = media_prefetcher.prefetch(
+            media_id=media_id,
+            filename_prefix=f"{msg.from_user.wa_id}_{msg.id}", # Unique prefix
+            mime_type=initial_state['incoming_media_mime_type'], # Pass mime type
+            original_filename=initial_state['incoming_media_filename'] # Pass original filename for docs
+        )
 
     # --- Invoke LangGraph Workflow --- #
     try:
         logger.info(f"Invoking LangGraph for sender {initial_state['sender_id']}")
-        # The graph runs synchronously within this async handler for now
-        # Consider running graph in executor if it becomes blocking
-        # For pywa_async, graph execution should ideally be async
-        # Check LangGraph docs for async invocation
-        final_state = app_graph.invoke(initial_state)
+        # All nodes are async, so a slow LLM/Meilisearch call only suspends this sender's run
+        async with graph_semaphore:
+            final_state = await app_graph.ainvoke(initial_state)
+        if final_state.get('meili_task_id') is not None:
+            # Slow indexing only delays this seller's confirmation, not other senders' graph runs
+            final_state = await poll_meili_task_status_node(final_state)
+            await send_whatsapp_confirmation_node(final_state)
         logger.info(f"LangGraph execution finished. Final state response: {final_state.get('response')}")
-        # Reply is now handled within the graph's send_whatsapp_confirmation_node
+        # Replies are sent by send_whatsapp_confirmation_node (in the graph, or above after the Meilisearch task)
 
     except Exception as e:
         logger.exception(f"Error during LangGraph execution for sender {initial_state['sender_id']}: {e}")
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = ("image", "video", "audio", "document", "sticker")
+
+class MediaPrefetcher:
+    """
+    Starts media downloads as soon as an update is parsed, on a bounded pool shared by all senders,
+    so a burst of images from one seller downloads concurrently, overlapping with the LLM analysis,
+    instead of one after the other inside each handler.
+
+    `prefetch` is idempotent per media id: the raw-update hook and the message handler get the same
+    future, whichever comes first starts the download. Finished downloads are forgotten after
+    `keep_for` seconds.
+    """
+    def __init__(self, downloader, max_concurrency: int = 8, keep_for: float = 300.0):
+        """
+        Initializes the MediaPrefetcher.
+
+        Args:
+            downloader: The media client (with a `download_media_by_id(...)` method returning the path or None).
+            max_concurrency: The maximum number of downloads in flight, across all senders.
+            keep_for: How long (in seconds) to keep a finished download for late `prefetch` calls.
+        """
+        self.downloader = downloader
+        self.keep_for = keep_for
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._downloads: Dict[str, asyncio.Task] = {}
+
+    def prefetch(
+        self,
+        media_id: str,
+        filename_prefix: str,
+        mime_type: Optional[str] = None,
+        original_filename: Optional[str] = None,
+    ) -> asyncio.Task:
+        """
+        Starts downloading the media (if not started yet) and returns the task resolving to its local path (or None).
+
+        Args:
+            media_id: The ID of the media to download.
+            filename_prefix: A prefix to use for the saved filename (e.g., user_messageID).
+            mime_type: The MIME type of the media (e.g., 'image/jpeg').
+            original_filename: The original filename, if available (esp. for documents).
+        """
+        task = self._downloads.get(media_id)
+        if task is None:
+            task = asyncio.create_task(self._download(media_id, filename_prefix, mime_type, original_filename))
+            task.add_done_callback(lambda _: self._forget_later(media_id))
+            self._downloads[media_id] = task
+        return task
+
+    def prefetch_update(self, update: Dict[str, Any]) -> int:
+        """
+        Starts the downloads of all the media messages in a raw webhook update.
+
+        Args:
+            update: The raw update (as received by `on_raw_update` handlers).
+
+        Returns:
+            int: The number of media downloads started (or already running).
+        """
+        count = 0
+        for entry in update.get("entry", []):
+            for change in entry.get("changes", []):
+                for message in change.get("value", {}).get("messages", []):
+                    media = message.get(message.get("type"))
+                    if message.get("type") not in MEDIA_TYPES or not isinstance(media, dict) or "id" not in media:
+                        continue
+                    self.prefetch(
+                        media_id=media["id"],
+                        filename_prefix=f"{message['from']}_{message['id']}",
+                        mime_type=media.get("mime_type"),
+                        original_filename=media.get("filename"),
+                    )
+                    count += 1
+        return count
+
+    async def _download(self, media_id, filename_prefix, mime_type, original_filename) -> Optional[str]:
+        async with self._semaphore:
+            kwargs = dict(
+                media_id=media_id,
+                filename_prefix=filename_prefix,
+                mime_type=mime_type,
+                original_filename=original_filename,
+            )
+            try:
+                # Blocking downloaders run in a worker thread, so they don't stall the event loop
+                if asyncio.iscoroutinefunction(self.downloader.download_media_by_id):
+                    return await self.downloader.download_media_by_id(**kwargs)
+                return await asyncio.to_thread(self.downloader.download_media_by_id, **kwargs)
+            except Exception as e:
+                logger.exception(f"Error prefetching media ID {media_id}: {e}")
+                return None
+
+    def _forget_later(self, media_id: str):
+        asyncio.get_running_loop().call_later(self.keep_for, self._downloads.pop, media_id, None)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of downloads not finished yet."""
+        return sum(1 for task in self._downloads.values() if not task.done())
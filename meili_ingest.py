@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class IngestionBuffer:
+    """
+    Coalesces the documents added by many concurrent graph runs into batched
+    `add_documents` calls, so a burst of products becomes one Meilisearch task
+    (and one indexing pass) instead of one task per WhatsApp message.
+
+    A batch is sent as soon as it holds `max_batch_size` documents, or
+    `max_delay` seconds after its first document arrived, whichever comes first.
+    """
+    def __init__(self, index, max_batch_size: int = 100, max_delay: float = 0.05):
+        """
+        Initializes the IngestionBuffer.
+
+        Args:
+            index: The async Meilisearch index (meilisearch_python_sdk AsyncIndex) to add the documents to.
+            max_batch_size: Send the batch once it holds this many documents.
+            max_delay: Send the batch at most this many seconds after its first document was added.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.index = index
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: set[asyncio.Task] = set()
+        # Simple counters, exposed via stats()
+        self.batches_sent = 0
+        self.documents_sent = 0
+        self.batches_failed = 0
+        self.last_batch_latency_ms: Optional[float] = None
+
+    async def add(self, document: Dict[str, Any]) -> int:
+        """
+        Queues a document for the next batch and waits until the batch is accepted by Meilisearch.
+
+        Args:
+            document: The document to add.
+
+        Returns:
+            int: The uid of the Meilisearch task that contains the document (shared by the whole batch).
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((document, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        """Sends the pending documents as one batch (in the background)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._send(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        documents = [document for document, _ in batch]
+        started = time.perf_counter()
+        try:
+            task_info = await self.index.add_documents(documents)
+        except Exception as e:
+            self.batches_failed += 1
+            logger.error(f"Failed to add a batch of {len(documents)} documents to Meilisearch: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.batches_sent += 1
+        self.documents_sent += len(documents)
+        self.last_batch_latency_ms = latency_ms
+        logger.info(f"Meilisearch batch of {len(documents)} documents enqueued as task {task_info.task_uid} in {latency_ms:.1f}ms")
+        for _, future in batch:
+            if not future.done(): # The waiting graph run may have been cancelled
+                future.set_result(task_info.task_uid)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the ingestion counters (for logs/health endpoints)."""
+        return {
+            "batches_sent": self.batches_sent,
+            "documents_sent": self.documents_sent,
+            "batches_failed": self.batches_failed,
+            "avg_batch_size": self.documents_sent / self.batches_sent if self.batches_sent else 0,
+            "last_batch_latency_ms": self.last_batch_latency_ms,
+            "pending": len(self._pending),
+        }
+
+    async def aclose(self):
+        """Sends the remaining documents and waits for the batches in flight."""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("succeeded", "failed", "canceled")
+
+class TaskTimeoutError(Exception):
+    """Raised when a Meilisearch task did not finish in time."""
+
+class TaskWatcher:
+    """
+    Tracks the completion of Meilisearch tasks for all graph runs with one
+    shared poll loop, instead of one poll loop per seller.
+
+    Every poll fetches all the outstanding task uids with a single
+    `GET /tasks?uids=...` request. The poll interval starts at `min_interval`,
+    doubles (up to `max_interval`) while nothing finishes, and drops back to
+    `min_interval` as soon as a task finishes. The loop stops when no task is
+    being watched.
+    """
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        min_interval: float = 0.05,
+        max_interval: float = 1.0,
+        timeout: float = 30.0,
+        max_uids_per_request: int = 500,
+    ):
+        """
+        Initializes the TaskWatcher.
+
+        Args:
+            http_client: An httpx.AsyncClient with the Meilisearch URL as base_url (and the API key header, if any).
+            min_interval: The shortest time (in seconds) between two polls.
+            max_interval: The longest time (in seconds) between two polls.
+            timeout: How long (in seconds) to wait for a task before giving up on it.
+            max_uids_per_request: Split the outstanding uids into requests of at most this many uids.
+        """
+        self.http_client = http_client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.max_uids_per_request = max_uids_per_request
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._deadlines: Dict[int, float] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        self.polls = 0
+
+    async def wait(self, task_uid: int, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Waits until the task finished (succeeded, failed or canceled).
+
+        Args:
+            task_uid: The uid of the Meilisearch task (several runs may wait for the same uid, e.g. a batch).
+            timeout: Overrides the default timeout for this task.
+
+        Returns:
+            dict: The task object returned by Meilisearch (check its `status` and `error`).
+
+        Raises:
+            TaskTimeoutError: If the task did not finish in time.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        future = self._futures.get(task_uid)
+        if future is None:
+            future = self._futures[task_uid] = asyncio.get_running_loop().create_future()
+        self._deadlines[task_uid] = max(deadline, self._deadlines.get(task_uid, 0))
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._poll_loop())
+        # Shielded, so a cancelled run doesn't cancel the future shared with the other runs
+        return await asyncio.shield(future)
+
+    async def _poll_loop(self):
+        interval = self.min_interval
+        while self._futures:
+            await asyncio.sleep(interval)
+            try:
+                finished = await self._poll_once()
+            except Exception as e:
+                logger.warning(f"Failed to poll Meilisearch tasks: {e}")
+                finished = 0
+            self._expire()
+            interval = self.min_interval if finished else min(interval * 2, self.max_interval)
+
+    async def _poll_once(self) -> int:
+        """Fetches the status of all the watched tasks, resolving the finished ones. Returns how many finished."""
+        uids = list(self._futures)
+        finished = 0
+        for i in range(0, len(uids), self.max_uids_per_request):
+            chunk = uids[i:i + self.max_uids_per_request]
+            response = await self.http_client.get(
+                "/tasks", params={"uids": ",".join(map(str, chunk)), "limit": len(chunk)}
+            )
+            response.raise_for_status()
+            self.polls += 1
+            for task in response.json().get("results", []):
+                if task.get("status") in FINISHED_STATUSES:
+                    self._resolve(task["uid"], result=task)
+                    finished += 1
+        return finished
+
+    def _expire(self):
+        now = time.monotonic()
+        for uid in [uid for uid, deadline in self._deadlines.items() if deadline <= now]:
+            logger.warning(f"Gave up waiting for Meilisearch task {uid}")
+            self._resolve(uid, error=TaskTimeoutError(f"Meilisearch task {uid} did not finish in time"))
+
+    def _resolve(self, uid: int, result: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None):
+        future = self._futures.pop(uid, None)
+        self._deadlines.pop(uid, None)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    @property
+    def watching(self) -> List[int]:
+        """The uids of the tasks being watched."""
+        return list(self._futures)
+
+    async def aclose(self):
+        """Stops the poll loop and fails the tasks still being watched."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+        for uid in list(self._futures):
+            self._resolve(uid, error=TaskTimeoutError(f"Stopped watching Meilisearch task {uid}"))
@@ -1,7 +1,9 @@
 import logging
 from flask import current_app, jsonify
 import json
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 
 # from app.services.openai_service import generate_response
 import re
@@ -30,6 +32,27 @@ def generate_response(response):
     return response.upper()
 
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the process-wide pooled session, so replies reuse kept-alive
+    connections to graph.facebook.com instead of a new TCP+TLS handshake each.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = int(current_app.config.get("SEND_POOL_SIZE") or 10)
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
 def send_message(data):
     headers = {
         "Content-type": "application/json",
@@ -39,7 +62,7 @@ def send_message(data):
     url = f"https://graph.facebook.com/{current_app.config['VERSION']}/{current_app.config['PHONE_NUMBER_ID']}/messages"
 
     try:
-        response = requests.post(
+        response = get_session().post(
             url, data=data, headers=headers, timeout=10
         )  # 10 seconds timeout as an example
         response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
@@ -53,6 +76,7 @@ def send_message(data):
         return jsonify({"status": "error", "message": "Failed to send message"}), 500
     else:
         # Process the response as normal
+        logging.info(f"Latency: {response.elapsed.total_seconds() * 1000:.0f}ms")
         log_http_response(response)
         return response
 
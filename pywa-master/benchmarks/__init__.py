@@ -0,0 +1,9 @@
+"""
+Throughput benchmarks (not part of the test suite). Run them from the repository root, e.g.:
+
+    python -m benchmarks.handlers_index
+    python -m benchmarks.from_dict
+    python -m benchmarks.codecs
+    python -m benchmarks.webhook_routing
+    python -m benchmarks.callback_data
+"""
@@ -0,0 +1,32 @@
+import time
+from typing import Any, Callable, Iterable
+
+
+def per_item_cost(
+    func: Callable[[Any], Any], items: Iterable[Any], rounds: int = 20
+) -> float:
+    """The best (lowest) time per item, in seconds, of calling ``func`` on each item, over ``rounds`` rounds."""
+    items = list(items)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items)
+
+
+def print_table(headers: list[str], rows: list[list[Any]]) -> None:
+    """Print the results as an aligned table (floats with 2 decimals, ints with thousands separators)."""
+
+    def fmt(value: Any) -> str:
+        if isinstance(value, float):
+            return f"{value:,.2f}"
+        if isinstance(value, int):
+            return f"{value:,}"
+        return str(value)
+
+    cells = [headers, *([fmt(v) for v in row] for row in rows)]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for row in cells:
+        print(" | ".join(cell.rjust(width) for cell, width in zip(row, widths)))
@@ -0,0 +1,39 @@
+"""Callback data encode/decode throughput, compiled vs reflective: ``python -m benchmarks.callback_data``."""
+
+from tests.test_callback_data import (
+    _product_cls,
+    _products,
+    _reflective_from_str,
+    _reflective_to_str,
+)
+
+from ._timing import per_item_cost, print_table
+
+
+def main() -> None:
+    Product = _product_cls()
+    products = _products(Product)
+    strings = [product.to_str() for product in products]
+    rows = [
+        [
+            "compiled",
+            round(1 / per_item_cost(Product.to_str, products)),
+            round(1 / per_item_cost(Product.from_str, strings)),
+        ],
+        [
+            "reflective",
+            round(1 / per_item_cost(_reflective_to_str, products)),
+            round(
+                1
+                / per_item_cost(
+                    lambda s: _reflective_from_str(Product, s),
+                    strings,
+                )
+            ),
+        ],
+    ]
+    print_table(["codec", "encode (ops/s)", "decode (ops/s)"], rows)
+
+
+if __name__ == "__main__":
+    main()
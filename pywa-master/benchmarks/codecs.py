@@ -0,0 +1,27 @@
+"""Parse and serialize cost of the update fixtures per JSON codec: ``python -m benchmarks.codecs``."""
+
+import json
+
+from tests.test_codec import FIXTURES, _codecs
+
+from ._timing import per_item_cost, print_table
+
+
+def main() -> None:
+    updates = [update for updates in FIXTURES.values() for update in updates]
+    dicts = [json.loads(update) for update in updates]
+    print_table(
+        ["codec", "loads (us/update)", "dumps (us/update)"],
+        [
+            [
+                json_codec.name,
+                per_item_cost(json_codec.loads, updates) * 1e6,
+                per_item_cost(json_codec.dumps, dicts) * 1e6,
+            ]
+            for json_codec in _codecs()
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
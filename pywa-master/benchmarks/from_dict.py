@@ -0,0 +1,48 @@
+"""Parse cost of the update fixtures, generated vs reflective ``from_dict``: ``python -m benchmarks.from_dict``."""
+
+import time
+
+from pywa import utils
+from tests.test_updates import _build_update, _generic_from_dict, _update_fixtures
+
+from ._timing import print_table
+
+
+def parse_cost(fixtures: list) -> float:
+    start = time.perf_counter()
+    for fixture in fixtures:
+        _build_update(*fixture)
+    return (time.perf_counter() - start) / len(fixtures)
+
+
+def main() -> None:
+    fixtures = {}
+    for fixture in _update_fixtures():
+        fixtures.setdefault(fixture[0].__self__.__name__, []).append(fixture)
+
+    # alternate the implementations each round, so machine noise affects both alike
+    generated_from_dict = utils.FromDict.__dict__["from_dict"]
+    generated = dict.fromkeys(fixtures, float("inf"))
+    reflective = dict.fromkeys(fixtures, float("inf"))
+    try:
+        for _ in range(20):
+            utils.FromDict.from_dict = generated_from_dict
+            for name, updates in fixtures.items():
+                generated[name] = min(generated[name], parse_cost(updates))
+            utils.FromDict.from_dict = classmethod(_generic_from_dict)
+            for name, updates in fixtures.items():
+                reflective[name] = min(reflective[name], parse_cost(updates))
+    finally:
+        utils.FromDict.from_dict = generated_from_dict
+
+    print_table(
+        ["update", "reflective (updates/s)", "generated (updates/s)"],
+        [
+            [name, round(1 / reflective[name]), round(1 / generated[name])]
+            for name in fixtures
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
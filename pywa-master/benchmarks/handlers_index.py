@@ -0,0 +1,53 @@
+"""Per-update dispatch cost of the handlers index against a linear scan: ``python -m benchmarks.handlers_index``."""
+
+from pywa import filters, handlers
+from tests.test_handlers import _indexed_handlers_and_updates
+
+from ._timing import per_item_cost, print_table
+
+KINDS = [
+    filters.image,
+    filters.video,
+    filters.voice,
+    filters.static_sticker,
+    filters.current_location,
+    filters.reaction_added,
+]
+
+
+def main() -> None:
+    wa, handlers_and_updates = _indexed_handlers_and_updates()
+    updates = handlers_and_updates[handlers.MessageHandler][1]
+
+    def dispatch(candidates):
+        def run(update):
+            for handler in candidates(update):
+                if handler.handle(wa, update):
+                    break
+
+        return run
+
+    rows = []
+    for count in (10, 100, 500):
+        hs = [
+            handlers.MessageHandler(
+                lambda _, __: None,
+                filters.command(f"cmd{i}")
+                if i % 2
+                else KINDS[i // 2 % len(KINDS)] & filters.from_users(str(i)),
+            )
+            for i in range(count)
+        ]
+        index = handlers._HandlersIndex(hs)
+        rows.append(
+            [
+                count,
+                per_item_cost(dispatch(lambda _: hs), updates) * 1e6,
+                per_item_cost(dispatch(index.candidates), updates) * 1e6,
+            ]
+        )
+    print_table(["handlers", "linear (us/update)", "indexed (us/update)"], rows)
+
+
+if __name__ == "__main__":
+    main()
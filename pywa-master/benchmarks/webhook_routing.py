@@ -0,0 +1,32 @@
+"""Webhook cost per delivery with and without ``skip_unhandled_deliveries``: ``python -m benchmarks.webhook_routing``.
+
+- handled: message deliveries with a message handler (parsed twice with ``skip_unhandled_deliveries``).
+- mixed: every fixture with only a message handler (the unhandled deliveries are not decoded into dicts).
+"""
+
+from pywa import handlers
+from tests.test_webhook_routing import FIXTURES, _wa
+
+from ._timing import per_item_cost, print_table
+
+
+def main() -> None:
+    workloads = {
+        "handled": FIXTURES["message"],
+        "mixed": [update for updates in FIXTURES.values() for update in updates],
+    }
+    rows = []
+    for name, updates in workloads.items():
+        row = [name]
+        for skip in (False, True):
+            wa = _wa(skip_unhandled_deliveries=skip)
+            wa.add_handlers(handlers.MessageHandler(lambda _, __: None))
+            row.append(per_item_cost(wa.webhook_update_handler, updates) * 1e6)
+        rows.append(row)
+    print_table(
+        ["workload", "default (us/delivery)", "skip_unhandled (us/delivery)"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,45 @@
 """The internal API for the WhatsApp client."""
 
+import functools
 import logging
-from typing import Any, TYPE_CHECKING
+from typing import Any, Callable, TYPE_CHECKING
 
 import httpx
 
 import pywa
+from .codec import get_default_json_codec
 from .errors import WhatsAppError
+from .ratelimit import get_request_key
 
 if TYPE_CHECKING:
     from .client import WhatsApp
+    from .codec import JsonCodec
+    from .ratelimit import OutboundScheduler
 
 
 _logger = logging.getLogger(__name__)
 
 
+def encode_json(codec: "JsonCodec", kwargs: dict) -> dict:
+    """Encode the ``json`` payload of the request kwargs with the codec (instead of letting httpx use ``json.dumps``)."""
+    if (payload := kwargs.pop("json", None)) is not None:
+        kwargs["content"] = codec.dumps(payload)
+        kwargs["headers"] = {
+            **(kwargs.get("headers") or {}),
+            "Content-Type": "application/json",
+        }
+    return kwargs
+
+
+def decode_response(codec: "JsonCodec", res: httpx.Response) -> dict | list:
+    """Decode the response with the codec, raising :class:`WhatsAppError` if the request failed."""
+    if res.status_code >= 400:
+        raise WhatsAppError.from_dict(
+            error=codec.loads(res.content)["error"], response=res
+        )
+    return codec.loads(res.content)
+
+
 class WhatsAppCloudApi:
     """Internal methods for the WhatsApp client. Do not use this class directly."""
 
@@ -23,6 +48,8 @@ class WhatsAppCloudApi:
         token: str,
         session: httpx.Client,
         api_version: float,
+        scheduler: "OutboundScheduler | None" = None,
+        json_codec: "JsonCodec | None" = None,
     ):
         if session.headers.get("Authorization") is not None:
             raise ValueError(
@@ -36,6 +63,8 @@ class WhatsAppCloudApi:
             }
         )
         self._session = session
+        self._scheduler = scheduler
+        self._json_codec = json_codec or get_default_json_codec()
 
     def __str__(self) -> str:
         return f"WhatsAppCloudApi(session={self._session})"
@@ -58,10 +87,26 @@ class WhatsAppCloudApi:
         Raises:
             WhatsAppError: If the request failed.
         """
-        res = self._session.request(method=method, url=endpoint, **kwargs)
-        if res.status_code >= 400:
-            raise WhatsAppError.from_dict(error=res.json()["error"], response=res)
-        return res.json()
+        if self._scheduler is None:
+            return self._send_request(method=method, endpoint=endpoint, **kwargs)
+        phone_id, recipient, priority = get_request_key(
+            method=method, endpoint=endpoint, payload=kwargs.get("json")
+        )
+        return self._scheduler.run(
+            functools.partial(
+                self._send_request, method=method, endpoint=endpoint, **kwargs
+            ),
+            phone_id=phone_id,
+            recipient=recipient,
+            priority=priority,
+        )
+
+    def _send_request(self, method: str, endpoint: str, **kwargs) -> dict | list:
+        """Send the request right away (see :meth:`_make_request`)."""
+        res = self._session.request(
+            method=method, url=endpoint, **encode_json(self._json_codec, kwargs)
+        )
+        return decode_response(self._json_codec, res)
 
     def get_app_access_token(self, app_id: int, app_secret: str) -> dict[str, str]:
         """
@@ -400,6 +445,33 @@ class WhatsAppCloudApi:
         res.raise_for_status()
         return res.content, res.headers.get("Content-Type")
 
+    def stream_media(
+        self,
+        media_url: str,
+        write: Callable[[bytes], Any],
+        chunk_size: int,
+        **kwargs,
+    ) -> str | None:
+        """
+        Stream the bytes of a media file from WhatsApp servers, one chunk at a time, without buffering the whole file.
+
+        - Read more at `developers.facebook.com <https://developers.facebook.com/docs/whatsapp/cloud-api/reference/media#download-media>`_.
+
+        Args:
+            media_url: The URL of the media file (from ``get_media_url``).
+            write: A function to call with every chunk (e.g. ``file.write``).
+            chunk_size: The maximum size of each chunk (in bytes).
+            **kwargs: Additional arguments to pass to the request.
+
+        Returns:
+            The MIME type (if available).
+        """
+        with self._session.stream("GET", media_url, **kwargs) as res:
+            res.raise_for_status()
+            for chunk in res.iter_bytes(chunk_size):
+                write(chunk)
+            return res.headers.get("Content-Type")
+
     def delete_media(self, media_id: str) -> dict[str, bool]:
         """
         Delete a media file from WhatsApp servers.
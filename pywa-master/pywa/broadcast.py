@@ -0,0 +1,206 @@
+"""This module contains the broadcast used to send a template to many recipients."""
+
+from __future__ import annotations
+
+__all__ = ["Broadcast", "BroadcastResult"]
+
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import itertools
+import json
+import logging
+import os
+from typing import IO, TYPE_CHECKING, Iterable, Iterator
+
+from .ratelimit import OutboundScheduler, Priority
+
+if TYPE_CHECKING:
+    from .client import WhatsApp
+    from .types import Template
+    from .types.callback import CallbackData
+    from .types.sent_message import SentTemplate
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class BroadcastResult:
+    """
+    The result of sending the template to one of the recipients of a :class:`Broadcast`.
+
+    Attributes:
+        index: The position of the recipient in the recipients.
+        to: The recipient.
+        sent: The sent template (``None`` if the send failed).
+        error: The error the send failed with (``None`` if the template was sent).
+    """
+
+    index: int
+    to: str
+    sent: SentTemplate | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the template was sent."""
+        return self.error is None
+
+
+class Broadcast:
+    """
+    Send a template to many recipients, concurrently and under the rate limits.
+
+    - Returned by :meth:`~pywa.client.WhatsApp.broadcast_template`. Nothing is sent until you iterate over it.
+    - The recipients are read lazily (they can be a generator), and the results are yielded as the sends complete
+      (not in the order of the recipients).
+    - The sends go through the ``outbound_scheduler`` of the client (with the :attr:`~pywa.ratelimit.Priority.BULK`
+      priority, so replies are sent first), or through a default :class:`~pywa.ratelimit.OutboundScheduler` if the
+      client has none.
+    - With a ``checkpoint`` file, every result is appended to it as a JSON line as soon as it completes. Running the
+      same broadcast with the same file again skips the recipients that were already sent (by position and phone
+      number), so a crashed broadcast can be resumed. Failed recipients are tried again.
+
+    Attributes:
+        sent: The number of templates sent.
+        failed: The number of sends that failed.
+        skipped: The number of recipients skipped because the checkpoint shows they were already sent.
+    """
+
+    _scheduler_cls = OutboundScheduler
+
+    def __init__(
+        self,
+        wa: WhatsApp,
+        recipients: Iterable[str | int | tuple[str | int, Template]],
+        template: Template | None,
+        tracker: str | CallbackData | None,
+        sender: str,
+        workers: int,
+        checkpoint: str | os.PathLike | None,
+    ):
+        if workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+        self._wa = wa
+        self._recipients = recipients
+        self._template = template
+        self._tracker = tracker
+        self._sender = sender
+        self._workers = workers
+        self._checkpoint = checkpoint
+        # the client's scheduler already limits the sends (see WhatsAppCloudApi._make_request)
+        self._scheduler = self._scheduler_cls() if wa.api._scheduler is None else None
+        self._done: set[tuple[int, str]] = set()
+        self._started = False
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(sent={self.sent}, failed={self.failed}, skipped={self.skipped})"
+
+    def _start(self) -> None:
+        if self._started:
+            raise RuntimeError("A broadcast can be iterated only once.")
+        self._started = True
+        if self._checkpoint is None or not os.path.exists(self._checkpoint):
+            return
+        with open(self._checkpoint, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # the last line of a crashed broadcast may be cut
+                    continue
+                if entry.get("id") is not None:
+                    self._done.add((entry["index"], entry["to"]))
+
+    def _open_checkpoint(self) -> contextlib.AbstractContextManager[IO[str] | None]:
+        if self._checkpoint is None:
+            return contextlib.nullcontext()
+        return open(self._checkpoint, "a", encoding="utf-8")
+
+    def _messages(self) -> Iterator[tuple[int, str, Template]]:
+        for index, recipient in enumerate(self._recipients):
+            to, template = (
+                recipient
+                if isinstance(recipient, tuple)
+                else (recipient, self._template)
+            )
+            if template is None:
+                raise ValueError(
+                    f"No template to send to {to!r}, pass (recipient, template) pairs or a default template."
+                )
+            if (index, str(to)) in self._done:
+                self.skipped += 1
+                continue
+            yield index, str(to), template
+
+    def _record(self, checkpoint: IO[str] | None, result: BroadcastResult) -> None:
+        if result.ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+            _logger.warning(
+                "Failed to send the broadcast template to %s: %r",
+                result.to,
+                result.error,
+            )
+        if checkpoint is not None:
+            entry = {"index": result.index, "to": result.to}
+            if result.ok:
+                entry["id"] = result.sent.id
+            else:
+                entry["error"] = repr(result.error)
+            checkpoint.write(json.dumps(entry) + "\n")
+            checkpoint.flush()
+
+    def _send(self, index: int, to: str, template: Template) -> BroadcastResult:
+        send = functools.partial(
+            self._wa.send_template,
+            to=to,
+            template=template,
+            tracker=self._tracker,
+            sender=self._sender,
+        )
+        try:
+            if self._scheduler is None:
+                sent = send()
+            else:
+                sent = self._scheduler.run(
+                    send, phone_id=self._sender, recipient=to, priority=Priority.BULK
+                )
+        except Exception as e:
+            return BroadcastResult(index=index, to=to, error=e)
+        return BroadcastResult(index=index, to=to, sent=sent)
+
+    def __iter__(self) -> Iterator[BroadcastResult]:
+        self._start()
+        messages = self._messages()
+        pending = set[concurrent.futures.Future[BroadcastResult]]()
+        with (
+            self._open_checkpoint() as checkpoint,
+            concurrent.futures.ThreadPoolExecutor(
+                self._workers, thread_name_prefix="pywa-broadcast"
+            ) as pool,
+        ):
+            try:
+                # a few sends ahead of the workers, so they never wait for the recipients to be read
+                for message in itertools.islice(messages, self._workers * 2):
+                    pending.add(pool.submit(self._send, *message))
+                while pending:
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for message in itertools.islice(messages, len(done)):
+                        pending.add(pool.submit(self._send, *message))
+                    results = [future.result() for future in done]
+                    for result in results:
+                        self._record(checkpoint, result)
+                    yield from results
+            finally:
+                # stopped early: the sends in progress are completed and recorded, the others are dropped
+                for future in pending:
+                    if future.cancel():
+                        continue
+                    self._record(checkpoint, future.result())
@@ -0,0 +1,84 @@
+"""This module contains the cache used to avoid repeated API lookups (e.g. media URLs)."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from typing import Callable, Generic, Hashable, TypeVar
+
+_T = TypeVar("_T")
+
+
+class TTLCache(Generic[_T]):
+    """
+    A thread-safe cache whose entries expire after ``ttl`` seconds, with single-flight lookups.
+
+    - Used internally by the :class:`WhatsApp` client to cache :meth:`~pywa.client.WhatsApp.get_media_url`.
+    - Concurrent lookups of a missing key share one call to ``fetch``; the others wait for its result (or error).
+    - Errors are not cached.
+
+    Args:
+        ttl: How long (in seconds) to keep each entry (``0`` to disable the cache, lookups are still coalesced).
+    """
+
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._entries: dict[
+            Hashable, tuple[float, _T]
+        ] = {}  # key -> (expires at, value)
+        self._in_flight: dict[Hashable, concurrent.futures.Future[_T]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, fetch: Callable[[], _T]) -> _T:
+        """
+        Get the cached value of the key, or fetch it.
+
+        Args:
+            key: The key.
+            fetch: The function to call to get the value when it is not cached.
+
+        Returns:
+            The value.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    return entry[1]
+                del self._entries[key]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = concurrent.futures.Future()
+        if not owner:
+            return future.result()
+        try:
+            value = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if not future.done() and self._ttl > 0:
+                    self._entries[key] = (time.monotonic() + self._ttl, value)
+                    self._purge(now)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove the key from the cache (e.g. when the cached value turned out to be stale)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _purge(self, now: float) -> None:
+        # entries are added in order and share the same ttl, so the expired ones are at the front
+        for key, (expires_at, _) in list(self._entries.items()):
+            if expires_at > now:
+                break
+            del self._entries[key]
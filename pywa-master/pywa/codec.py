@@ -0,0 +1,148 @@
+"""This module contains the JSON codecs used for the webhook updates and for the Cloud API requests and responses."""
+
+from __future__ import annotations
+
+__all__ = [
+    "JsonCodec",
+    "StdlibJsonCodec",
+    "OrjsonCodec",
+    "MsgspecJsonCodec",
+    "get_default_json_codec",
+]
+
+import abc
+import json
+from typing import Any
+
+
+class JsonCodec(abc.ABC):
+    """
+    Base class for the JSON codecs.
+
+    - Every webhook update and every Cloud API request and response is decoded/encoded by the codec of the client, so
+      a fast codec lowers the per-update CPU cost.
+    - The default is :class:`OrjsonCodec` if ``orjson`` is installed, :class:`MsgspecJsonCodec` if ``msgspec`` is
+      installed, and :class:`StdlibJsonCodec` otherwise (see :func:`get_default_json_codec`).
+    - Implement this class to use another JSON library.
+
+    Example:
+
+        >>> from pywa import WhatsApp
+        >>> from pywa.codec import StdlibJsonCodec
+        >>> wa = WhatsApp(..., json_codec=StdlibJsonCodec())
+    """
+
+    name: str
+    """The name of the codec (for logging)."""
+
+    @abc.abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        """
+        Decode JSON.
+
+        Args:
+            data: The JSON document (UTF-8 bytes or str).
+
+        Returns:
+            The decoded object.
+
+        Raises:
+            ValueError: If the data is not valid JSON.
+        """
+        ...
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode an object as compact UTF-8 JSON.
+
+        Args:
+            obj: The object to encode (dicts, lists, strings, numbers, booleans and ``None``).
+
+        Returns:
+            The JSON document.
+        """
+        ...
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class StdlibJsonCodec(JsonCodec):
+    """The codec of the standard library :mod:`json` module (always available)."""
+
+    name = "json"
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    The codec of `orjson <https://github.com/ijl/orjson>`_ (``pip3 install orjson``).
+
+    - Non-string dict keys are encoded as strings, like the standard library does.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._loads(data)  # orjson.JSONDecodeError is a ValueError
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj, option=self._options)
+
+
+class MsgspecJsonCodec(JsonCodec):
+    """The codec of `msgspec <https://jcristharif.com/msgspec/>`_ (``pip3 install msgspec``)."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decode = msgspec.json.Decoder().decode
+        self._encode = msgspec.json.Encoder().encode
+        self._decode_error = msgspec.DecodeError
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return self._decode(data)
+        except self._decode_error as e:
+            raise ValueError(str(e)) from e
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encode(obj)
+
+
+_default_json_codec: JsonCodec | None = None
+
+
+def get_default_json_codec() -> JsonCodec:
+    """
+    Get the fastest JSON codec available (created once): :class:`OrjsonCodec`, :class:`MsgspecJsonCodec` or
+    :class:`StdlibJsonCodec`.
+    """
+    global _default_json_codec
+    if _default_json_codec is None:
+        for codec_cls in (OrjsonCodec, MsgspecJsonCodec):
+            try:
+                _default_json_codec = codec_cls()
+                break
+            except ImportError:
+                pass
+        else:
+            _default_json_codec = StdlibJsonCodec()
+    return _default_json_codec
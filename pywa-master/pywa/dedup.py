@@ -0,0 +1,184 @@
+"""This module contains the backends used to skip duplicate updates (e.g. when WhatsApp retries a delivery)."""
+
+from __future__ import annotations
+
+__all__ = [
+    "DedupBackend",
+    "MemoryDedupBackend",
+    "SQLiteDedupBackend",
+]
+
+import abc
+import collections
+import os
+import sqlite3
+import threading
+import time
+
+_DEFAULT_TTL_SEC = 24 * 60 * 60
+"""How long to remember an update. WhatsApp retries undelivered updates with decreasing frequency for up to 7 days."""
+
+_DEFAULT_MAX_KEYS = 100_000
+"""The maximum number of updates to remember in memory."""
+
+_SQLITE_PURGE_EVERY = 1_000
+"""Delete the expired keys from the SQLite database every this number of new keys."""
+
+
+class DedupBackend(abc.ABC):
+    """
+    Base class for the backends that remember which updates were already handled.
+
+    - The keys are the message ids, the status ids (with the status) or, for other updates, a hash of the delivery.
+    - Implement this class to share the seen updates between processes (e.g. several uvicorn workers) using an
+      external store (e.g. Redis ``SET key 1 NX EX ttl``).
+    - The methods are called from the webhook handler, so they should be fast. In ``pywa_async`` they run in a worker
+      thread (``asyncio.to_thread``), except for :class:`MemoryDedupBackend`, so blocking IO does not stall the event loop.
+
+    Example:
+
+        >>> from pywa import WhatsApp
+        >>> from pywa.dedup import SQLiteDedupBackend
+        >>> wa = WhatsApp(..., dedup_backend=SQLiteDedupBackend("/tmp/pywa-updates.db"))
+    """
+
+    @abc.abstractmethod
+    def add(self, key: str) -> bool:
+        """
+        Atomically remember the key.
+
+        Args:
+            key: The key of the update.
+
+        Returns:
+            Whether the key is new (``False`` if it was already seen and is not expired yet).
+        """
+        ...
+
+    def discard(self, key: str) -> None:
+        """
+        Forget the key, so the update is handled again if WhatsApp redelivers it.
+
+        - Called when constructing the update or one of its handlers failed.
+        - The default implementation does nothing (failed updates are not retried). Override it to allow retries.
+
+        Args:
+            key: The key of the update.
+        """
+
+
+class MemoryDedupBackend(DedupBackend):
+    """
+    Remember the seen updates in memory, with a TTL and an LRU bound on the number of keys.
+
+    - This is the default backend. It is not shared between processes.
+
+    Args:
+        ttl: How long (in seconds) to remember each key (default: 24 hours).
+        max_keys: The maximum number of keys to remember. The least recently seen keys are evicted first (default: 100,000).
+    """
+
+    def __init__(
+        self, ttl: float = _DEFAULT_TTL_SEC, max_keys: int = _DEFAULT_MAX_KEYS
+    ):
+        if max_keys < 1:
+            raise ValueError("`max_keys` must be at least 1.")
+        self._ttl = ttl
+        self._max_keys = max_keys
+        self._keys = collections.OrderedDict[str, float]()  # key -> expires at
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._keys.get(key)
+            if expires_at is not None and expires_at > now:
+                self._keys.move_to_end(key)
+                return False
+            self._keys[key] = now + self._ttl
+            self._keys.move_to_end(key)
+            # evict the least recently seen keys, and the expired keys at the front
+            while self._keys and (
+                len(self._keys) > self._max_keys
+                or next(iter(self._keys.values())) <= now
+            ):
+                self._keys.popitem(last=False)
+            return True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._keys.pop(key, None)
+
+
+class SQLiteDedupBackend(DedupBackend):
+    """
+    Remember the seen updates in a SQLite database, which can be shared by several processes on the same host.
+
+    - A stand-in for an external shared store (e.g. Redis) when running several workers (e.g. ``uvicorn --workers 4``).
+    - Expired keys are deleted from time to time.
+
+    Args:
+        path: The path to the database file (created if it does not exist).
+        ttl: How long (in seconds) to remember each key (default: 24 hours).
+        table: The name of the table to use (default: ``pywa_seen_updates``).
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        ttl: float = _DEFAULT_TTL_SEC,
+        table: str = "pywa_seen_updates",
+    ):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table!r}")
+        self._ttl = ttl
+        self._table = table
+        self._added = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+        )
+
+    def add(self, key: str) -> bool:
+        now = time.time()  # wall clock, shared between processes
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    f"DELETE FROM {self._table} WHERE key = ? AND expires_at <= ?",
+                    (key, now),
+                )
+                added = (
+                    self._conn.execute(
+                        f"INSERT OR IGNORE INTO {self._table} VALUES (?, ?)",
+                        (key, now + self._ttl),
+                    ).rowcount
+                    == 1
+                )
+                if added:
+                    self._added += 1
+                    if self._added % _SQLITE_PURGE_EVERY == 0:
+                        self._conn.execute(
+                            f"DELETE FROM {self._table} WHERE expires_at <= ?", (now,)
+                        )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        with self._lock:
+            self._conn.close()
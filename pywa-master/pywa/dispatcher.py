@@ -0,0 +1,158 @@
+"""This module contains the dispatcher used to handle incoming updates in the background."""
+
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+_logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class UpdatesDispatcher(Generic[_T]):
+    """
+    Handle items (updates) on a bounded pool of background threads, in order per key and in parallel across keys.
+
+    - Used internally by the :class:`WhatsApp` client when ``background_workers`` is set. The key of an update is its
+      ``listener_identifier`` (sender, recipient), so the updates of each user are handled one after the other.
+    - Items without a key (``None``) are handled independently of each other.
+    - A key is kept only while it has items waiting or in progress, so idle keys do not take any memory.
+    - When there is no room, :meth:`submit` blocks up to ``enqueue_timeout`` seconds (backpressure) and then gives up.
+
+    Args:
+        handler: The function to call with every submitted item.
+        workers: The number of worker threads.
+        max_queued: The maximum number of items waiting to be handled or in progress (``0`` for no limit).
+        max_queued_per_key: The maximum number of items waiting to be handled for each key (``0`` for no limit).
+        enqueue_timeout: How long (in seconds) to wait for room when the queue is full.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[_T], None],
+        workers: int,
+        max_queued: int,
+        max_queued_per_key: int,
+        enqueue_timeout: float,
+    ):
+        if workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+        self._handler = handler
+        self._max_queued = max(max_queued, 0)
+        self._max_queued_per_key = max(max_queued_per_key, 0)
+        self._enqueue_timeout = enqueue_timeout
+        self._keys: dict[Hashable, collections.deque[_T]] = {}  # active keys
+        self._ready = collections.deque[Hashable]()  # keys with items, not in progress
+        self._queued = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"pywa-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def pending(self) -> int:
+        """The number of items waiting to be handled or in progress."""
+        return self._queued
+
+    @property
+    def active_keys(self) -> int:
+        """The number of keys with items waiting to be handled or in progress."""
+        return len(self._keys)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the dispatcher stopped accepting new items."""
+        return self._closed
+
+    def _has_room(self, items: list[tuple[Hashable, _T]]) -> bool:
+        # a batch is always accepted when nothing is queued, so it can't be rejected forever
+        if (
+            self._max_queued
+            and self._queued
+            and self._queued + len(items) > self._max_queued
+        ):
+            return False
+        if self._max_queued_per_key:
+            for key, count in collections.Counter(k for k, _ in items).items():
+                if (queued := len(self._keys.get(key, ()))) and (
+                    queued + count > self._max_queued_per_key
+                ):
+                    return False
+        return True
+
+    def submit(self, items: Iterable[tuple[Hashable | None, _T]]) -> bool:
+        """
+        Submit a batch of ``(key, item)`` pairs to be handled in the background, all or nothing.
+
+        Returns:
+            Whether the items were queued (``False`` if the dispatcher is closed or there was no room in time).
+        """
+        items = [(object() if key is None else key, item) for key, item in items]
+        deadline = time.monotonic() + self._enqueue_timeout
+        with self._cond:
+            while not self._closed and not self._has_room(items):
+                if (remaining := deadline - time.monotonic()) <= 0:
+                    return False
+                self._cond.wait(remaining)
+            if self._closed:
+                return False
+            for key, item in items:
+                if (queue := self._keys.get(key)) is None:
+                    queue = self._keys[key] = collections.deque()
+                    self._ready.append(key)
+                queue.append(item)
+            self._queued += len(items)
+            self._cond.notify_all()
+        return True
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._ready and not self._closed:
+                    self._cond.wait()
+                if not self._ready:
+                    return  # closed and drained (keys in progress are continued by their workers)
+                key = self._ready.popleft()
+                item = self._keys[key].popleft()
+            try:
+                self._handler(item)
+            except Exception:
+                _logger.exception(
+                    "An error occurred while handling an update in the background"
+                )
+            finally:
+                with self._cond:
+                    self._queued -= 1
+                    if self._keys[key]:
+                        self._ready.append(key)  # behind the other keys, for fairness
+                    else:
+                        del self._keys[key]
+                    self._cond.notify_all()
+
+    def shutdown(self, timeout: float | None = None) -> bool:
+        """
+        Stop accepting new items and wait for the queued items to be handled.
+
+        Args:
+            timeout: The maximum time (in seconds) to wait for the workers (``None`` to wait until they are done).
+
+        Returns:
+            Whether all the workers finished in time.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in self._workers:
+            worker.join(
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+        return not any(w.is_alive() for w in self._workers)
@@ -99,6 +99,18 @@ _T = TypeVar("_T", bound=_BaseUpdate)
 class Filter:
     """Base filter class handling both sync and async."""
 
+    _requirements: dict[tuple[str, ...], frozenset] = {}
+    """
+    Cheap necessary conditions of the filter, as ``{discriminator: allowed values}`` (e.g. ``{("type",): {TEXT}}``).
+    Used to look up the candidate handlers of an update instead of checking the filters of every handler.
+    """
+
+    _pure: bool = False
+    """
+    Whether the result depends only on the update, so it is memoized per update (see :func:`_check_sync`).
+    Filters with state (e.g. counters or rate limits) are called every time they are checked.
+    """
+
     def check_sync(self, wa: _Wa, update: Any) -> bool:
         raise NotImplementedError
 
@@ -122,13 +134,22 @@ class AndFilter(Filter):
     def __init__(self, left: Filter, right: Filter):
         self.left = left
         self.right = right
+        self._pure = _is_pure(left) and _is_pure(right)
+        left_reqs, right_reqs = _requirements_of(left), _requirements_of(right)
+        self._requirements = {
+            **left_reqs,
+            **right_reqs,
+            **{k: left_reqs[k] & right_reqs[k] for k in left_reqs.keys() & right_reqs},
+        }
 
     def check_sync(self, wa: _Wa, update: _T) -> bool:
-        return self.left.check_sync(wa, update) and self.right.check_sync(wa, update)
+        return _check_sync(self.left, wa, update) and _check_sync(
+            self.right, wa, update
+        )
 
     async def check_async(self, wa: _Wa, update: _T) -> bool:
-        return await self.left.check_async(wa, update) and await self.right.check_async(
-            wa, update
+        return await _check_async(self.left, wa, update) and await _check_async(
+            self.right, wa, update
         )
 
     def has_async(self) -> bool:
@@ -139,13 +160,18 @@ class OrFilter(Filter):
     def __init__(self, left: Filter, right: Filter):
         self.left = left
         self.right = right
+        self._pure = _is_pure(left) and _is_pure(right)
+        left_reqs, right_reqs = _requirements_of(left), _requirements_of(right)
+        self._requirements = {
+            k: left_reqs[k] | right_reqs[k] for k in left_reqs.keys() & right_reqs
+        }
 
     def check_sync(self, wa: _Wa, update: _T) -> bool:
-        return self.left.check_sync(wa, update) or self.right.check_sync(wa, update)
+        return _check_sync(self.left, wa, update) or _check_sync(self.right, wa, update)
 
     async def check_async(self, wa: _Wa, update: _T) -> bool:
-        return await self.left.check_async(wa, update) or await self.right.check_async(
-            wa, update
+        return await _check_async(self.left, wa, update) or await _check_async(
+            self.right, wa, update
         )
 
     def has_async(self) -> bool:
@@ -155,21 +181,109 @@ class OrFilter(Filter):
 class NotFilter(Filter):
     def __init__(self, fil: Filter):
         self.filter = fil
+        self._pure = _is_pure(fil)
 
     def check_sync(self, wa: _Wa, update: _T) -> bool:
-        return not self.filter.check_sync(wa, update)
+        return not _check_sync(self.filter, wa, update)
 
     async def check_async(self, wa: _Wa, update: _T) -> bool:
-        return not await self.filter.check_async(wa, update)
+        return not await _check_async(self.filter, wa, update)
 
     def has_async(self) -> bool:
         return self.filter.has_async()
 
 
+def _check_sync(fil: Filter, wa: _Wa, update: Any) -> bool:
+    """
+    Check the filter, at most once per update.
+
+    The results of pure filters (see :attr:`Filter._pure`) are memoized on the update (``update._filters_results``),
+    so filters that are shared between handlers and listeners (e.g. ``filters.text``, ``filters.regex(...)``) are
+    evaluated once for each update.
+    """
+    if not _is_pure(fil) or (
+        (results := getattr(update, "_filters_results", None)) is None
+    ):
+        return fil.check_sync(wa, update)  # e.g. raw updates and flow requests
+    try:
+        return results[fil]
+    except KeyError:
+        result = results[fil] = fil.check_sync(wa, update)
+        return result
+    except TypeError:  # unhashable filter
+        return fil.check_sync(wa, update)
+
+
+async def _check_async(fil: Filter, wa: _Wa, update: Any) -> bool:
+    """Check the filter, at most once per update (see :func:`_check_sync`)."""
+    if not _is_pure(fil) or (
+        (results := getattr(update, "_filters_results", None)) is None
+    ):
+        return await fil.check_async(wa, update)
+    try:
+        return results[fil]
+    except KeyError:
+        result = results[fil] = await fil.check_async(wa, update)
+        return result
+    except TypeError:  # unhashable filter
+        return await fil.check_async(wa, update)
+
+
+def _memoized(update: Any, key: tuple, compute: Callable[[], Any]) -> Any:
+    """Compute a value (e.g. a normalized text) once per update. The key must be a tuple (to not collide with filters)."""
+    if (results := getattr(update, "_filters_results", None)) is None:
+        return compute()
+    try:
+        return results[key]
+    except KeyError:
+        value = results[key] = compute()
+        return value
+
+
+def _texts(update: Any, ignore_case: bool) -> tuple[str, ...]:
+    """The text fields of the update (see ``_txt_fields``), lower-cased if ``ignore_case``, computed once per update."""
+    return _memoized(
+        update,
+        ("_texts", ignore_case),
+        lambda: tuple(
+            txt.lower() if ignore_case else txt
+            for txt_field in getattr(update, "_txt_fields", None) or ()
+            if (txt := getattr(update, txt_field)) is not None
+        ),
+    )
+
+
+def _is_pure(fil: Filter) -> bool:
+    """Whether the filter can be memoized (also for filters that do not inherit from :class:`Filter`)."""
+    return getattr(fil, "_pure", False)
+
+
+def _requirements_of(fil: Filter) -> dict[tuple[str, ...], frozenset]:
+    """The requirements of a filter (also for filters that do not inherit from :class:`Filter`)."""
+    return getattr(fil, "_requirements", None) or {}
+
+
+def _require(fil: Filter, **requirements: Iterable[Any]) -> Filter:
+    """Declare the requirements of a filter (see :attr:`Filter._requirements`)."""
+    fil._requirements = {(k,): frozenset(v) for k, v in requirements.items()}
+    return fil
+
+
 def new(
-    func: Callable[[_Wa, _T], bool | Awaitable[bool]], name: str | None = None
+    func: Callable[[_Wa, _T], bool | Awaitable[bool]],
+    name: str | None = None,
+    pure: bool = False,
 ) -> Filter:
-    """Factory function to create a filter from a function (sync or async)."""
+    """
+    Factory function to create a filter from a function (sync or async).
+
+    Args:
+        func: The function to check the update with.
+        name: The name of the filter class (default: the name of the function).
+        pure: Whether the result depends only on the update (default: ``False``). The result of a pure filter is
+         memoized per update and shared by all the handlers and listeners, while other filters (e.g. counters or
+         rate limits) are called every time they are checked.
+    """
 
     is_async = utils.is_async_callable(func)
 
@@ -191,14 +305,12 @@ def new(
             "check_sync": check_sync,
             "check_async": check_async,
             "has_async": has_async,
+            "_pure": pure,
         },
     )()
 
 
-forwarded = new(
-    lambda _, m: m.forwarded,
-    name="forwarded",
-)
+forwarded = new(lambda _, m: m.forwarded, name="forwarded", pure=True)
 """
 Filter for forwarded messages.
 
@@ -206,7 +318,7 @@ Filter for forwarded messages.
 """
 
 forwarded_many_times = new(
-    lambda _, m: m.forwarded_many_times, name="forwarded_many_times"
+    lambda _, m: m.forwarded_many_times, name="forwarded_many_times", pure=True
 )
 """
 Filter for messages that have been forwarded many times.
@@ -214,7 +326,7 @@ Filter for messages that have been forwarded many times.
 >>> filters.forwarded_many_times
 """
 
-reply = new(lambda _, m: m.reply_to_message is not None, name="reply")
+reply = new(lambda _, m: m.reply_to_message is not None, name="reply", pure=True)
 """
 Filter for messages that reply to another message.
 
@@ -228,7 +340,7 @@ def update_id(id_: str) -> Filter:
 
     >>> update_id("wamid.HBKHUIyNTM4NjAfiefhwojfMTNFQ0Q2MERGRjVDMUHUIGGA=")
     """
-    return new(lambda _, u: u.id == id_, name="update_id")
+    return new(lambda _, u: u.id == id_, name="update_id", pure=True)
 
 
 def replays_to(*msg_ids: str) -> Filter:
@@ -239,7 +351,8 @@ def replays_to(*msg_ids: str) -> Filter:
     """
     return new(
         lambda _, m: m.reply_to_message is not None
-        and m.reply_to_message.message_id in msg_ids
+        and m.reply_to_message.message_id in msg_ids,
+        pure=True,
     )
 
 
@@ -249,6 +362,7 @@ has_referred_product = new(
         and m.reply_to_message.referred_product is not None
     ),
     name="has_referred_product",
+    pure=True,
 )
 """
 Filter for messages that user sends to ask about a product
@@ -278,12 +392,14 @@ def sent_to(*, display_phone_number: str = None, phone_number_id: str = None) ->
             else m.metadata.phone_number_id == phone_number_id
         ),
         name="sent_to",
+        pure=True,
     )
 
 
 sent_to_me = new(
     lambda wa, m: sent_to(phone_number_id=wa.phone_id).check_sync(wa, m),
     name="sent_to_me",
+    pure=True,
 )
 """
 Filter for updates that are sent to the client phone number.
@@ -304,7 +420,7 @@ def from_users(
     """
     only_nums_pattern = re.compile(r"\D")
     numbers = tuple(re.sub(only_nums_pattern, "", n) for n in numbers)
-    return new(lambda _, m: m.from_user.wa_id in numbers, name="from_users")
+    return new(lambda _, m: m.from_user.wa_id in numbers, name="from_users", pure=True)
 
 
 def from_countries(
@@ -321,7 +437,11 @@ def from_countries(
     >>> from_countries("972", "1") # Israel and USA
     """
     codes = tuple(str(p) for p in prefixes)
-    return new(lambda _, m: m.from_user.wa_id.startswith(codes), name="from_countries")
+    return new(
+        lambda _, m: m.from_user.wa_id.startswith(codes),
+        name="from_countries",
+        pure=True,
+    )
 
 
 def matches(*strings: str, ignore_case: bool = False) -> Filter:
@@ -341,16 +461,13 @@ def matches(*strings: str, ignore_case: bool = False) -> Filter:
         *strings: The strings to match.
         ignore_case: Whether to ignore case when matching.
     """
-    strings = tuple(m.lower() for m in strings) if ignore_case else strings
+    strings = (
+        frozenset(m.lower() for m in strings) if ignore_case else frozenset(strings)
+    )
     return new(
-        lambda _, m: any(
-            (txt.lower() if ignore_case else txt) in strings
-            for txt_field in m._txt_fields
-            if (txt := getattr(m, txt_field)) is not None
-        )
-        if getattr(m, "_txt_fields", None)
-        else False,
+        lambda _, m: any(txt in strings for txt in _texts(m, ignore_case)),
         name="matches",
+        pure=True,
     )
 
 
@@ -373,14 +490,9 @@ def startswith(*prefixes: str, ignore_case: bool = False) -> Filter:
     """
     prefixes = tuple(m.lower() for m in prefixes) if ignore_case else prefixes
     return new(
-        lambda _, u: any(
-            (txt.lower() if ignore_case else txt).startswith(prefixes)
-            for txt_field in u._txt_fields
-            if (txt := getattr(u, txt_field)) is not None
-        )
-        if getattr(u, "_txt_fields", None)
-        else False,
+        lambda _, u: any(txt.startswith(prefixes) for txt in _texts(u, ignore_case)),
         name="startswith",
+        pure=True,
     )
 
 
@@ -403,14 +515,9 @@ def endswith(*suffixes: str, ignore_case: bool = False) -> Filter:
     """
     suffixes = tuple(m.lower() for m in suffixes) if ignore_case else suffixes
     return new(
-        lambda _, u: any(
-            (txt.lower() if ignore_case else txt).endswith(suffixes)
-            for txt_field in u._txt_fields
-            if (txt := getattr(u, txt_field)) is not None
-        )
-        if getattr(u, "_txt_fields", None)
-        else False,
+        lambda _, u: any(txt.endswith(suffixes) for txt in _texts(u, ignore_case)),
         name="endswith",
+        pure=True,
     )
 
 
@@ -434,14 +541,10 @@ def contains(*words: str, ignore_case: bool = False) -> Filter:
     words = tuple(m.lower() for m in words) if ignore_case else words
     return new(
         lambda _, u: any(
-            word in (txt.lower() if ignore_case else txt)
-            for word in words
-            for txt_field in u._txt_fields
-            if (txt := getattr(u, txt_field)) is not None
-        )
-        if getattr(u, "_txt_fields", None)
-        else False,
+            word in txt for word in words for txt in _texts(u, ignore_case)
+        ),
         name="contains",
+        pure=True,
     )
 
 
@@ -465,20 +568,17 @@ def regex(*patterns: str | re.Pattern, flags: int = 0) -> Filter:
     patterns = tuple(
         p if isinstance(p, re.Pattern) else re.compile(p, flags) for p in patterns
     )
+    matchers = tuple(p.match for p in patterns)
     return new(
         lambda _, u: any(
-            re.match(p, txt)
-            for p in patterns
-            for txt_field in u._txt_fields
-            if (txt := getattr(u, txt_field)) is not None
-        )
-        if getattr(u, "_txt_fields", None)
-        else False,
+            match(txt) for match in matchers for txt in _texts(u, ignore_case=False)
+        ),
         name="regex",
+        pure=True,
     )
 
 
-message = new(lambda _, m: isinstance(m, _Msg), name="message")
+message = new(lambda _, m: isinstance(m, _Msg), name="message", pure=True)
 """Filter for all messages."""
 
 
@@ -490,10 +590,7 @@ def mimetypes(*mmtps: str) -> Filter:
 
     >>> mimetypes("application/pdf", "image/png")
     """
-    return new(
-        lambda _, m: m.media.mime_type in mmtps,
-        name="mimetypes",
-    )
+    return new(lambda _, m: m.media.mime_type in mmtps, name="mimetypes", pure=True)
 
 
 def extensions(*exts: str) -> Filter:
@@ -502,18 +599,20 @@ def extensions(*exts: str) -> Filter:
 
     >>> extensions(".pdf", ".png")
     """
-    return new(
-        lambda _, m: m.media.extension in exts,
-        name="extensions",
-    )
+    return new(lambda _, m: m.media.extension in exts, name="extensions", pure=True)
 
 
-media = new(lambda _, m: m.has_media, name="media")
+media = new(lambda _, m: m.has_media, name="media", pure=True)
 """Filter for media messages (images, videos, documents, audio, stickers)."""
 
-is_command = new(
-    lambda _, m: m.type == _Mt.TEXT and m.text.startswith(("/", "!")),
-    name="is_command",
+is_command = _require(
+    new(
+        lambda _, m: m.type == _Mt.TEXT and m.text.startswith(("/", "!")),
+        name="is_command",
+        pure=True,
+    ),
+    type={_Mt.TEXT},
+    text_head="/!",
 )
 """
 Filter for text messages that are commands (start with ``/`` or ``!``).
@@ -539,64 +638,114 @@ def command(
         ignore_case: Whether to ignore case when matching (default: ``False``).
     """
     cmds = tuple(c.lower() for c in cmds) if ignore_case else cmds
-    return new(
-        lambda _, m: m.type == _Mt.TEXT
-        and (
-            m.text[0] in prefixes
-            and (m.text[1:].lower() if ignore_case else m.text[1:]).startswith(cmds)
+    prefixes = frozenset(prefixes)
+    return _require(
+        new(
+            lambda _, m: m.type == _Mt.TEXT
+            and m.text[:1] in prefixes
+            and _memoized(
+                m,
+                ("_command", ignore_case),
+                lambda: m.text[1:].lower() if ignore_case else m.text[1:],
+            ).startswith(cmds),
+            name="command",
+            pure=True,
         ),
-        name="command",
+        type={_Mt.TEXT},
+        text_head=prefixes,
     )
 
 
-text = new(lambda _, m: m.type == _Mt.TEXT, name="text")
+text = _require(
+    new(lambda _, m: m.type == _Mt.TEXT, name="text", pure=True),
+    type={_Mt.TEXT},
+)
 """Filter for text messages."""
 
 has_caption = new(
-    lambda _, m: m.caption is not None,
-    name="media_has_caption",
+    lambda _, m: m.caption is not None, name="media_has_caption", pure=True
 )
 """Filter for media messages that have a caption."""
 
-image = new(lambda _, m: m.type == _Mt.IMAGE, name="image")
+image = _require(
+    new(lambda _, m: m.type == _Mt.IMAGE, name="image", pure=True),
+    type={_Mt.IMAGE},
+)
 """Filter for image messages."""
 
-video = new(lambda _, m: m.type == _Mt.VIDEO, name="video")
+video = _require(
+    new(lambda _, m: m.type == _Mt.VIDEO, name="video", pure=True),
+    type={_Mt.VIDEO},
+)
 """Filter for video messages."""
 
-document = new(lambda _, m: m.type == _Mt.DOCUMENT, name="document")
+document = _require(
+    new(lambda _, m: m.type == _Mt.DOCUMENT, name="document", pure=True),
+    type={_Mt.DOCUMENT},
+)
 """Filter for document messages."""
 
-audio = new(lambda _, m: m.type == _Mt.AUDIO, name="audio")
+audio = _require(
+    new(lambda _, m: m.type == _Mt.AUDIO, name="audio", pure=True),
+    type={_Mt.AUDIO},
+)
 """Filter for audio messages (both voice notes and audio files)."""
 
-audio_only = new(
-    lambda _, m: m.type == _Mt.AUDIO and not m.audio.voice, name="audio_only"
+audio_only = _require(
+    new(
+        lambda _, m: m.type == _Mt.AUDIO and not m.audio.voice,
+        name="audio_only",
+        pure=True,
+    ),
+    type={_Mt.AUDIO},
 )
 """Filter for audio messages that are not voice notes."""
 
-voice = new(lambda _, m: m.type == _Mt.AUDIO and m.audio.voice, name="voice")
+voice = _require(
+    new(lambda _, m: m.type == _Mt.AUDIO and m.audio.voice, name="voice", pure=True),
+    type={_Mt.AUDIO},
+)
 """Filter for audio messages that are voice notes."""
 
-sticker = new(lambda _, m: m.type == _Mt.STICKER, name="sticker")
+sticker = _require(
+    new(lambda _, m: m.type == _Mt.STICKER, name="sticker", pure=True),
+    type={_Mt.STICKER},
+)
 """Filter for sticker messages (both static and animated)."""
 
-animated_sticker = new(
-    lambda _, m: m.type == _Mt.STICKER and m.sticker.animated, name="animated_sticker"
+animated_sticker = _require(
+    new(
+        lambda _, m: m.type == _Mt.STICKER and m.sticker.animated,
+        name="animated_sticker",
+        pure=True,
+    ),
+    type={_Mt.STICKER},
 )
 """Filter for animated sticker messages."""
 
-static_sticker = new(
-    lambda _, m: m.type == _Mt.STICKER and not m.sticker.animated, name="static_sticker"
+static_sticker = _require(
+    new(
+        lambda _, m: m.type == _Mt.STICKER and not m.sticker.animated,
+        name="static_sticker",
+        pure=True,
+    ),
+    type={_Mt.STICKER},
 )
 """Filter for static sticker messages."""
 
-location = new(lambda _, m: m.type == _Mt.LOCATION, name="location")
+location = _require(
+    new(lambda _, m: m.type == _Mt.LOCATION, name="location", pure=True),
+    type={_Mt.LOCATION},
+)
 """Filter for location messages."""
 
-current_location = new(
-    lambda _, m: m.type == _Mt.LOCATION and m.location.current_location,
-    name="current_location",
+current_location = _require(
+    new(
+        lambda _, m: m.type == _Mt.LOCATION and m.location.current_location,
+        name="current_location",
+        pure=True,
+    ),
+    type={_Mt.LOCATION},
 )
 """Filter for location messages that are current locations."""
 
@@ -613,27 +762,42 @@ def location_in_radius(lat: float, lon: float, radius: float | int) -> Filter:
         radius: Radius in kilometers.
     """
 
-    return new(
-        lambda _, m: m.type == _Mt.LOCATION
-        and m.location.in_radius(lat=lat, lon=lon, radius=radius),
-        name="location_in_radius",
+    return _require(
+        new(
+            lambda _, m: m.type == _Mt.LOCATION
+            and m.location.in_radius(lat=lat, lon=lon, radius=radius),
+            name="location_in_radius",
+            pure=True,
+        ),
+        type={_Mt.LOCATION},
     )
 
 
-reaction = new(lambda _, m: m.type == _Mt.REACTION, name="reaction")
+reaction = _require(
+    new(lambda _, m: m.type == _Mt.REACTION, name="reaction", pure=True),
+    type={_Mt.REACTION},
+)
 """Filter for reaction messages (both added and removed)."""
 
 
-reaction_added = new(
-    lambda _, m: m.type == _Mt.REACTION and m.reaction.emoji is not None,
-    name="reaction_added",
+reaction_added = _require(
+    new(
+        lambda _, m: m.type == _Mt.REACTION and m.reaction.emoji is not None,
+        name="reaction_added",
+        pure=True,
+    ),
+    type={_Mt.REACTION},
 )
 """Filter for reaction messages that were added to a message."""
 
 
-reaction_removed = new(
-    lambda _, m: m.type == _Mt.REACTION and m.reaction.emoji is None,
-    name="reaction_removed",
+reaction_removed = _require(
+    new(
+        lambda _, m: m.type == _Mt.REACTION and m.reaction.emoji is None,
+        name="reaction_removed",
+        pure=True,
+    ),
+    type={_Mt.REACTION},
 )
 """Filter for reaction messages that were removed from a message."""
 
@@ -644,57 +808,92 @@ def reaction_emojis(*emojis: str) -> Filter:
 
     >>> reaction_emojis("👍","👎")
     """
-    return new(
-        lambda _, m: m.type == _Mt.REACTION and m.reaction.emoji in emojis,
-        name="reaction_emojis",
+    return _require(
+        new(
+            lambda _, m: m.type == _Mt.REACTION and m.reaction.emoji in emojis,
+            name="reaction_emojis",
+            pure=True,
+        ),
+        type={_Mt.REACTION},
     )
 
 
-contacts = new(lambda _, m: m.type == _Mt.CONTACTS, name="contacts")
+contacts = _require(
+    new(lambda _, m: m.type == _Mt.CONTACTS, name="contacts", pure=True),
+    type={_Mt.CONTACTS},
+)
 """Filter for contacts messages."""
 
 
-contacts_has_wa = new(
-    lambda _, m: m.type == _Mt.CONTACTS
-    and (
-        any(
-            (
-                p.wa_id
-                for p in (phone for contact in m.contacts for phone in contact.phones)
+contacts_has_wa = _require(
+    new(
+        lambda _, m: m.type == _Mt.CONTACTS
+        and (
+            any(
+                (
+                    p.wa_id
+                    for p in (
+                        phone for contact in m.contacts for phone in contact.phones
+                    )
+                )
             )
-        )
+        ),
+        name="contacts_any_has_wa",
+        pure=True,
     ),
-    name="contacts_any_has_wa",
+    type={_Mt.CONTACTS},
 )
 """Filter for contacts messages that have a WhatsApp account."""
 
 
-order = new(lambda _, m: m.type == _Mt.ORDER, name="order")
+order = _require(
+    new(lambda _, m: m.type == _Mt.ORDER, name="order", pure=True),
+    type={_Mt.ORDER},
+)
 """Filter for order messages."""
 
 
-unsupported = new(lambda _, m: m.type == _Mt.UNSUPPORTED, name="unsupported")
+unsupported = _require(
+    new(lambda _, m: m.type == _Mt.UNSUPPORTED, name="unsupported", pure=True),
+    type={_Mt.UNSUPPORTED},
+)
 """Filter for all unsupported messages."""
 
 
-callback_button = new(lambda _, c: isinstance(c, _Clb), name="callback_button")
+callback_button = new(
+    lambda _, c: isinstance(c, _Clb), name="callback_button", pure=True
+)
 """Filter for callback buttons."""
 
-callback_selection = new(lambda _, c: isinstance(c, _Cls), name="callback_selection")
+callback_selection = new(
+    lambda _, c: isinstance(c, _Cls), name="callback_selection", pure=True
+)
 """Filter for callback selections."""
 
-message_status = new(lambda _, s: isinstance(s, _Ms), name="message_status")
+message_status = new(lambda _, s: isinstance(s, _Ms), name="message_status", pure=True)
 
-sent = new(lambda _, s: s.status == _Mst.SENT, name="status_sent")
+sent = _require(
+    new(lambda _, s: s.status == _Mst.SENT, name="status_sent", pure=True),
+    status={_Mst.SENT},
+)
 """Filter for messages that have been sent."""
 
-delivered = new(lambda _, s: s.status == _Mst.DELIVERED, name="status_delivered")
+delivered = _require(
+    new(lambda _, s: s.status == _Mst.DELIVERED, name="status_delivered", pure=True),
+    status={_Mst.DELIVERED},
+)
 """Filter for messages that have been delivered."""
 
-read = new(lambda _, s: s.status == _Mst.READ, name="status_read")
+read = _require(
+    new(lambda _, s: s.status == _Mst.READ, name="status_read", pure=True),
+    status={_Mst.READ},
+)
 """Filter for messages that have been read."""
 
-failed = new(lambda _, s: s.status == _Mst.FAILED, name="status_failed")
+failed = _require(
+    new(lambda _, s: s.status == _Mst.FAILED, name="status_failed", pure=True),
+    status={_Mst.FAILED},
+)
 """Filter for status updates of messages that have failed to send."""
 
 
@@ -714,24 +913,32 @@ def failed_with(
     exceptions = tuple(
         e for e in errors if e not in error_codes and issubclass(e, WhatsAppError)
     )
-    return new(
-        lambda _, s: s.status == _Mst.FAILED
-        and (
-            any((isinstance(s.error, e) for e in exceptions))
-            or s.error.error_code in error_codes
+    return _require(
+        new(
+            lambda _, s: s.status == _Mst.FAILED
+            and (
+                any((isinstance(s.error, e) for e in exceptions))
+                or s.error.error_code in error_codes
+            ),
+            name="status_failed_with",
+            pure=True,
         ),
-        name="status_failed_with",
+        status={_Mst.FAILED},
     )
 
 
-with_tracker = new(lambda _, s: s.tracker is not None, name="with_tracker")
+with_tracker = new(lambda _, s: s.tracker is not None, name="with_tracker", pure=True)
 """Filter for status updates that have a tracker."""
 
-template_status = new(lambda _, s: isinstance(s, _Ts), name="template_status")
+template_status = new(
+    lambda _, s: isinstance(s, _Ts), name="template_status", pure=True
+)
 """Filters for template status updates."""
 
-flow_completion = new(lambda _, f: isinstance(f, _Fc), name="flow_completion")
+flow_completion = new(
+    lambda _, f: isinstance(f, _Fc), name="flow_completion", pure=True
+)
 """Filter for flow completion updates."""
 
-chat_opened = new(lambda _, c: isinstance(c, _Co), name="chat_opened")
+chat_opened = new(lambda _, c: isinstance(c, _Co), name="chat_opened", pure=True)
 """Filter for chat opened updates."""
@@ -55,10 +55,26 @@ import dataclasses
 import functools
 import logging
 import warnings
-from typing import TYPE_CHECKING, Any, Callable, cast, TypeAlias, Awaitable, TypedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    cast,
+    TypeAlias,
+    Awaitable,
+    TypedDict,
+    Iterable,
+    Iterator,
+)
 
 from . import utils
-from .filters import Filter, new as new_filter
+from .filters import (
+    Filter,
+    new as new_filter,
+    _check_sync,
+    _check_async,
+    _requirements_of,
+)
 from .types import (
     CallbackButton,
     CallbackSelection,
@@ -158,7 +174,7 @@ class Handler(abc.ABC):
         self._is_async_callback = utils.is_async_callable(callback)
 
     def check(self, wa: WhatsApp, update: BaseUpdate | dict) -> bool:
-        return self._filters is None or self._filters.check_sync(wa, update)
+        return self._filters is None or _check_sync(self._filters, wa, update)
 
     def handle(self, wa: WhatsApp, update: BaseUpdate | dict) -> bool:
         if not self.check(wa, update):
@@ -167,7 +183,7 @@ class Handler(abc.ABC):
         return True
 
     async def acheck(self, wa: WhatsApp, update: BaseUpdate | dict) -> bool:
-        return self._filters is None or await self._filters.check_async(wa, update)
+        return self._filters is None or await _check_async(self._filters, wa, update)
 
     async def ahandle(self, wa: WhatsApp, update: BaseUpdate | dict) -> bool:
         if not await self.acheck(wa, update):
@@ -177,6 +193,10 @@ class Handler(abc.ABC):
         )
         return True
 
+    def _requirements(self) -> dict[tuple[str, ...], frozenset]:
+        """The cheap necessary conditions of the handler (see :class:`_HandlersIndex`)."""
+        return _requirements_of(self._filters) if self._filters is not None else {}
+
     @staticmethod
     @functools.cache
     def _fields_to_subclasses() -> dict[str, type[Handler]]:
@@ -206,6 +226,81 @@ class Handler(abc.ABC):
         return self.__repr__()
 
 
+def _text_head(update: Any) -> str | None:
+    return txt[:1] if isinstance(txt := getattr(update, "text", None), str) else None
+
+
+def _callback_id(update: Any, data_field: str, sep: str) -> str | None:
+    data = getattr(update, data_field, None)
+    return data.partition(sep)[0] if isinstance(data, str) and sep in data else None
+
+
+_DISCRIMINATORS: dict[str, Callable[..., Any]] = {
+    "type": lambda update: getattr(update, "type", None),
+    "status": lambda update: getattr(update, "status", None),
+    "text_head": _text_head,
+    "callback_id": _callback_id,
+}
+"""Functions that extract the cheap discriminators from an update (by the first item of the requirement key)."""
+
+
+class _HandlersIndex:
+    """
+    The handlers of a single update type, indexed by the cheap discriminators their filters require.
+
+    - Built when the handlers are added or removed (see :meth:`WhatsApp.add_handlers`).
+    - Each discriminator maps its values to a bitmask of the handlers that accept them, so :meth:`candidates` only
+      yields the handlers that may match the update (in their priority order). The filters are still checked.
+    """
+
+    __slots__ = ("_handlers", "_all", "_tables")
+
+    def __init__(self, handlers: Iterable[Handler]):
+        self._handlers = tuple(handlers)
+        self._all = (1 << len(self._handlers)) - 1
+        requirements = [
+            h._requirements() if isinstance(h, Handler) else {} for h in self._handlers
+        ]
+        tables = []
+        for key in dict.fromkeys(k for reqs in requirements for k in reqs):
+            if key[0] not in _DISCRIMINATORS:
+                continue
+            by_value, unconstrained = collections.defaultdict(int), 0
+            for i, reqs in enumerate(requirements):
+                if key in reqs:
+                    for value in reqs[key]:
+                        by_value[value] |= 1 << i
+                else:
+                    unconstrained |= 1 << i
+            tables.append(
+                (_DISCRIMINATORS[key[0]], key[1:], dict(by_value), unconstrained)
+            )
+        self._tables = tuple(tables)
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def candidates(self, update: BaseUpdate | dict) -> Iterator[Handler]:
+        """Yield the handlers that may handle the update, by their priority."""
+        if not self._tables:
+            yield from self._handlers
+            return
+        mask = self._all
+        for discriminator, args, by_value, unconstrained in self._tables:
+            try:
+                value = discriminator(update, *args)
+                mask &= by_value.get(value, 0) | unconstrained
+            except Exception:  # e.g. unhashable value, let the filters decide
+                continue
+            if not mask:
+                return
+        handlers = self._handlers
+        while mask:
+            lowest = mask & -mask
+            yield handlers[lowest.bit_length() - 1]
+            mask ^= lowest
+
+
 class MessageHandler(Handler):
     """
     Handler for incoming :class:`pywa.types.Message`.
@@ -269,6 +364,18 @@ class _FactoryHandler(Handler):
             )
         return update
 
+    def _requirements(self) -> dict[tuple[str, ...], frozenset]:
+        requirements = super()._requirements()
+        if self._factory:
+            callback_id = str(self._factory.__callback_id__)
+            sep = self._factory.__callback_data_sep__
+            if sep not in callback_id:
+                requirements = {
+                    **requirements,
+                    ("callback_id", self._data_field, sep): frozenset({callback_id}),
+                }
+        return requirements
+
     def handle(self, wa: WhatsApp, update: _FactorySupported) -> bool:
         update = self._process_update(update)
         if update is None:
@@ -4,10 +4,15 @@ __all__ = [
     "ListenerTimeout",
     "ListenerCanceled",
     "ListenerStopped",
+    "TooManyListeners",
 ]
 
+import itertools
+import logging
+import math
 import threading
-from typing import TYPE_CHECKING, TypeAlias
+import time
+from typing import TYPE_CHECKING, Any, Callable, TypeAlias
 
 from pywa import utils, _helpers as helpers
 from .types import (
@@ -18,12 +23,14 @@ from .types import (
     ChatOpened,
     FlowCompletion,
 )
-from .filters import Filter
+from .filters import Filter, _check_sync
 from .types.base_update import BaseUserUpdate
 
 if TYPE_CHECKING:
     from .client import WhatsApp
 
+_logger = logging.getLogger(__name__)
+
 _SuppoertedUserUpdate: TypeAlias = (
     Message
     | CallbackButton
@@ -103,8 +110,120 @@ class ListenerStopped(Exception):
         self.reason = reason
 
 
+class TooManyListeners(Exception):
+    """
+    There are already ``max_listeners`` listeners waiting (see :class:`~pywa.client.WhatsApp`)
+
+    Attributes:
+        max_listeners: The maximum number of listeners
+    """
+
+    def __init__(self, max_listeners: int):
+        self.max_listeners = max_listeners
+
+
+class _TimerWheel:
+    """
+    Call callbacks after a delay, for any number of pending timeouts, from a single thread.
+
+    - Each timeout is hashed by its expiry tick into one of ``slots`` buckets, so scheduling and canceling are
+      ``O(1)``. The thread wakes once per ``tick`` (only while there are timeouts) and expires the due ones.
+    - The callbacks run in the thread of the wheel, so they must be quick.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512):
+        self._tick = tick
+        self._slots: list[dict[int, tuple[int, Callable[[], Any]]]] = [
+            {} for _ in range(slots)
+        ]  # tick % slots -> {timer id: (expiry tick, callback)}
+        self._ids = itertools.count()
+        self._count = 0
+        self._epoch = time.monotonic()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _current_tick(self) -> int:
+        return int((time.monotonic() - self._epoch) / self._tick)
+
+    def schedule(self, delay: float, callback: Callable[[], Any]) -> tuple[int, int]:
+        """Call ``callback`` in ``delay`` seconds (rounded up to the tick). Returns a handle to :meth:`cancel` it."""
+        with self._cond:
+            expires = self._current_tick() + max(math.ceil(delay / self._tick), 1)
+            slot, timer_id = expires % len(self._slots), next(self._ids)
+            self._slots[slot][timer_id] = (expires, callback)
+            self._count += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="pywa-listeners-timer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return slot, timer_id
+
+    def cancel(self, handle: tuple[int, int]) -> None:
+        """Cancel a timeout (if it did not expire yet)."""
+        slot, timer_id = handle
+        with self._cond:
+            if self._slots[slot].pop(timer_id, None) is not None:
+                self._count -= 1
+
+    def _run(self) -> None:
+        expired_until = self._current_tick()
+        while True:
+            with self._cond:
+                while not self._count:
+                    self._cond.wait()
+                now = self._current_tick()
+                due = []
+                # every slot is visited at most once, even after a long idle period
+                for tick in range(
+                    max(expired_until + 1, now - len(self._slots) + 1), now + 1
+                ):
+                    slot = self._slots[tick % len(self._slots)]
+                    for timer_id in [i for i, (exp, _) in slot.items() if exp <= now]:
+                        due.append(slot.pop(timer_id)[1])
+                self._count -= len(due)
+                expired_until = now
+            for callback in due:
+                try:
+                    callback()
+                except Exception:
+                    _logger.exception("A listener timeout callback failed")
+            time.sleep(max(self._epoch + (now + 1) * self._tick - time.monotonic(), 0))
+
+
+_timer_wheel = _TimerWheel()
+
+
 class Listener:
+    """
+    A pending listener, resolved with the update that passed its filters, or with an exception.
+
+    - Returned by :meth:`~pywa.client.WhatsApp.add_listener`. A pending listener takes well under a kilobyte, and no thread.
+
+    Attributes:
+        result: The update that passed the filters (once resolved).
+        exception: The :class:`ListenerTimeout`, :class:`ListenerCanceled` or :class:`ListenerStopped` exception (once
+         resolved).
+    """
+
+    __slots__ = (
+        "filters",
+        "cancelers",
+        "result",
+        "exception",
+        "_done",
+        "_callbacks",
+        "_timer",
+        "_timeout",
+        "_owner",
+    )
     _listener_canceled = ListenerCanceled
+    # shared by all the listeners, held only to resolve them or to add a callback
+    _lock = threading.Lock()
 
     def __init__(
         self,
@@ -113,32 +232,66 @@ class Listener:
     ):
         self.filters = filters
         self.cancelers = cancelers
-        self.event: threading.Event = threading.Event()
         self.result: _SuppoertedUserUpdate | None = None
         self.exception: Exception | None = None
+        self._done = False
+        self._callbacks: list[Callable[[Listener], Any]] | None = None
+        self._timer: tuple[int, int] | None = None
+        self._timeout: int | None = None
+        # the client and the identifier to remove the listener from when it is resolved
+        self._owner: tuple[WhatsApp, tuple[str, str]] | None = None
+
+    def _resolve(
+        self, result: _SuppoertedUserUpdate | None, exception: Exception | None
+    ) -> None:
+        with self._lock:
+            if self._done:
+                return
+            self.result, self.exception, self._done = result, exception, True
+            callbacks, self._callbacks = self._callbacks or (), None
+        if self._owner is not None:
+            # first, so the callbacks can already listen to the user again
+            wa, identifier = self._owner
+            wa._discard_listener(identifier, self)
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                _logger.exception("A listener callback failed")
 
     def set_result(self, result: BaseUserUpdate) -> None:
-        self.result = result
-        self.event.set()
+        self._resolve(result, None)
 
     def set_exception(self, exception: Exception) -> None:
-        self.exception = exception
-        self.event.set()
+        self._resolve(None, exception)
 
     def cancel(self, update: BaseUserUpdate | None = None) -> None:
         self.set_exception(self._listener_canceled(update))
 
+    def _time_out(self) -> None:
+        self.set_exception(ListenerTimeout(self._timeout))
+
     def stop(self, reason: str | None = None) -> None:
         self.set_exception(ListenerStopped(reason))
 
     def is_set(self) -> bool:
-        return self.event.is_set()
+        return self._done
+
+    def add_done_callback(self, fn: Callable[[Listener], Any]) -> None:
+        """Call ``fn(listener)`` when the listener is resolved (right away if it already is)."""
+        with self._lock:
+            if not self._done:
+                if self._callbacks is None:
+                    self._callbacks = []
+                self._callbacks.append(fn)
+                return
+        fn(self)
 
     def apply_filters(self, wa: WhatsApp, update: _SuppoertedUserUpdate) -> bool:
-        return self.filters is None or self.filters.check_sync(wa, update)
+        return self.filters is None or _check_sync(self.filters, wa, update)
 
     def apply_cancelers(self, wa: WhatsApp, update: _SuppoertedUserUpdate) -> bool:
-        return self.cancelers and self.cancelers.check_sync(wa, update)
+        return self.cancelers and _check_sync(self.cancelers, wa, update)
 
 
 class _Listeners:
@@ -199,24 +352,96 @@ class _Listeners:
             ListenerCanceled: If the listener was canceled by a filter
             ListenerStopped: If the listener was stopped manually
         """
+        listener = self.add_listener(
+            to=to,
+            filters=filters,
+            cancelers=cancelers,
+            timeout=timeout,
+            sent_to_phone_id=sent_to_phone_id,
+        )
+        done = threading.Event()
+        listener.add_done_callback(lambda _: done.set())
+        try:
+            done.wait()
+        finally:
+            if not listener.is_set():  # interrupted
+                listener.stop()
+        if listener.exception:
+            raise listener.exception
+        return listener.result
+
+    def add_listener(
+        self: WhatsApp,
+        to: str | int,
+        filters: Filter = None,
+        cancelers: Filter = None,
+        timeout: int | None = None,
+        sent_to_phone_id: str | int | None = None,
+        callback: Callable[[Listener], Any] | None = None,
+    ) -> Listener:
+        """
+        Listen to a user update without blocking: the listener is resolved later, by the update or by its timeout.
+
+        - Unlike :meth:`listen`, no thread waits for the update, so you can have thousands of pending listeners (up to
+          ``max_listeners``, see :class:`WhatsApp`). The timeouts of all the listeners are expired by a single thread.
+        - ``callback`` (the continuation) is called with the resolved listener, in the thread that handled the update,
+          or in the timer thread when the listener timed out (so it should be quick, or hand the work off).
+
+        Example:
+
+            .. code-block:: python
+
+                    def on_name(listener: Listener):
+                        if listener.exception:  # ListenerTimeout / ListenerCanceled / ListenerStopped
+                            wa.send_message("123456", "Let's try again later")
+                        else:
+                            wa.send_message("123456", f"Hello {listener.result.text}!")
+
+                    wa.send_message("123456", "What's your name?")
+                    wa.add_listener(
+                        to="123456",
+                        filters=filters.message & filters.text,
+                        timeout=60,
+                        callback=on_name,
+                    )
+
+        Args:
+            to: The user to listen to
+            filters: The filters to apply to the update, resolve the listener with the update if the filters pass
+            cancelers: The filters to cancel the listening, resolve the listener with ListenerCanceled if the update matches
+            timeout: The time to wait for the update, resolve the listener with ListenerTimeout if the time passes
+            sent_to_phone_id: The phone id to listen for
+            callback: A function to call with the listener when it is resolved (optional, you can also use
+             :meth:`Listener.add_done_callback`)
+
+        Returns:
+            The pending listener
+
+        Raises:
+            TooManyListeners: If there are already ``max_listeners`` pending listeners
+        """
         recipient = helpers.resolve_phone_id_param(
             self, sent_to_phone_id, "sent_to_phone_id"
         )
         identifier = utils.listener_identifier(sender=to, recipient=recipient)
+        if (
+            self._max_listeners
+            and len(self._listeners) >= self._max_listeners
+            and identifier not in self._listeners
+        ):
+            raise TooManyListeners(self._max_listeners)
         listener = Listener(
             filters=filters,
             cancelers=cancelers,
         )
+        listener._owner = (self, identifier)
+        if callback is not None:
+            listener.add_done_callback(callback)
+        if timeout is not None:
+            listener._timeout = timeout
+            listener._timer = _timer_wheel.schedule(timeout, listener._time_out)
         self._listeners[identifier] = listener
-        try:
-            if not listener.event.wait(timeout):
-                raise ListenerTimeout(timeout)
-            if listener.result:
-                return listener.result
-            if listener.exception:
-                raise listener.exception
-        finally:
-            self._remove_listener(from_user=to, phone_id=recipient)
+        return listener
 
     def stop_listening(
         self: WhatsApp,
@@ -238,14 +463,14 @@ class _Listeners:
         """
 
         recipient = helpers.resolve_phone_id_param(self, phone_id, "phone_id")
+        identifier = utils.listener_identifier(sender=to, recipient=recipient)
         try:
-            listener = self._listeners[
-                utils.listener_identifier(sender=to, recipient=recipient)
-            ]
+            listener = self._listeners[identifier]
         except KeyError:
             raise ValueError("Listener does not exist")
         listener.stop(reason)
-        self._remove_listener(from_user=to, phone_id=recipient)
+        if self._listeners.get(identifier) is listener:  # not listening again already
+            self._remove_listener(from_user=to, phone_id=recipient)
 
     def _remove_listener(
         self: WhatsApp, from_user: str | int, phone_id: str | int | None = None
@@ -257,3 +482,13 @@ class _Listeners:
             ]
         except KeyError:
             pass
+
+    def _discard_listener(
+        self: WhatsApp, identifier: tuple[str, str], listener: Listener
+    ) -> None:
+        if listener._timer is not None:
+            _timer_wheel.cancel(listener._timer)
+        if (
+            self._listeners.get(identifier) is listener
+        ):  # not replaced by a newer listener
+            self._listeners.pop(identifier, None)
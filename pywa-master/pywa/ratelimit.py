@@ -0,0 +1,332 @@
+"""This module contains the scheduler used to keep outgoing requests under the WhatsApp Cloud API rate limits."""
+
+from __future__ import annotations
+
+__all__ = ["OutboundScheduler", "Priority", "TokenBucket"]
+
+import collections
+import enum
+import heapq
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from .errors import (
+    RateLimitHit,
+    SpamRateLimitHit,
+    ToManyAPICalls,
+    TooManyMessages,
+    WhatsAppError,
+)
+
+_logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_RETRY_ON = (ToManyAPICalls, RateLimitHit, SpamRateLimitHit, TooManyMessages)
+_MESSAGES_ENDPOINT = re.compile(r"^/(?P<phone_id>[^/]+)/messages$")
+_PAIRS_PURGE_INTERVAL_SEC = 60
+
+
+class Priority(enum.IntEnum):
+    """
+    The priority of an outgoing request, when several requests wait for the same phone number.
+
+    Attributes:
+        REPLY: Messages to users in an active conversation (everything but templates). Sent first.
+        BULK: Template messages (e.g. marketing broadcasts). Sent when there are no replies waiting.
+    """
+
+    REPLY = 0
+    BULK = 1
+
+
+class TokenBucket:
+    """
+    A token bucket: ``rate`` tokens are added every second, up to ``capacity`` (the allowed burst).
+
+    - Not thread-safe, the :class:`OutboundScheduler` guards its buckets.
+
+    Args:
+        rate: The number of tokens added every second.
+        capacity: The maximum number of tokens (the bucket starts full).
+        now: The current :func:`time.monotonic` time.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """How long (in seconds) until a token is available (``0`` if there is one now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        """Take a token (call only when :meth:`delay` is ``0``)."""
+        self.tokens -= 1
+
+    def drain(self, now: float, seconds: float) -> None:
+        """Empty the bucket so that the next token is available only in ``seconds`` (or later)."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def is_full(self, now: float) -> bool:
+        """Whether the bucket is full (so it can be dropped and created again later)."""
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+def get_request_key(
+    method: str, endpoint: str, payload: Any
+) -> tuple[str | None, str | None, Priority]:
+    """
+    Get the ``(phone_id, recipient, priority)`` to schedule an API request with.
+
+    - Messages are limited per phone id and per (phone id, recipient) pair, templates get the :attr:`Priority.BULK`
+      priority.
+    - Other requests (``phone_id`` is ``None``) are not limited, they are only retried when throttled.
+    """
+    if method != "POST" or not (match := _MESSAGES_ENDPOINT.match(endpoint)):
+        return None, None, Priority.REPLY
+    payload = payload if isinstance(payload, dict) else {}
+    return (
+        match["phone_id"],
+        payload.get("to"),
+        Priority.BULK if payload.get("type") == "template" else Priority.REPLY,
+    )
+
+
+class OutboundScheduler:
+    """
+    Schedule the outgoing API requests under the WhatsApp Cloud API rate limits.
+
+    - Pass it to the :class:`WhatsApp` client with ``outbound_scheduler=...``. It can be shared by several clients.
+    - Messages are limited by a token bucket per phone id (the
+      `throughput <https://developers.facebook.com/docs/whatsapp/cloud-api/overview#throughput>`_) and a token bucket
+      per phone id and recipient (the
+      `pair rate limit <https://developers.facebook.com/docs/whatsapp/cloud-api/overview#pair-rate-limits>`_).
+    - When a phone number is throttled, replies are sent before templates (see :class:`Priority`), and requests of the
+      same priority are sent in the order they arrived.
+    - Requests that fail with a throttling error (:class:`~pywa.errors.ToManyAPICalls`,
+      :class:`~pywa.errors.RateLimitHit`, :class:`~pywa.errors.SpamRateLimitHit` or
+      :class:`~pywa.errors.TooManyMessages`) are retried up to ``max_retries`` times, with exponential backoff and
+      jitter. Until then, the other messages of the same phone number (or pair) wait too.
+    - :attr:`queue_depth`, :attr:`throttle_events` and :attr:`retries` can be exported to your metrics.
+
+    Example:
+
+        >>> from pywa import WhatsApp
+        >>> from pywa.ratelimit import OutboundScheduler
+        >>> wa = WhatsApp(..., outbound_scheduler=OutboundScheduler(messages_per_second=80))
+
+    Args:
+        messages_per_second: The messages each phone id may send per second (default: ``80``).
+        burst: The messages each phone id may send at once (default: ``messages_per_second``).
+        pair_messages_per_second: The messages each phone id may send per second to the same recipient (default: one
+         every 6 seconds).
+        pair_burst: The messages each phone id may send at once to the same recipient (default: ``45``).
+        max_retries: How many times to retry a throttled request (default: ``5``, ``0`` to never retry).
+        backoff: The backoff (in seconds) before the first retry, doubled for every retry (default: ``1``).
+        max_backoff: The maximum backoff (in seconds) between retries (default: ``30``).
+    """
+
+    def __init__(
+        self,
+        messages_per_second: float = 80,
+        burst: int | None = None,
+        pair_messages_per_second: float = 1 / 6,
+        pair_burst: int = 45,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        if messages_per_second <= 0 or pair_messages_per_second <= 0:
+            raise ValueError("The rates must be positive.")
+        self._rate = messages_per_second
+        self._burst = max(burst or messages_per_second, 1)
+        self._pair_rate = pair_messages_per_second
+        self._pair_burst = max(pair_burst, 1)
+        self._max_retries = max(max_retries, 0)
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._phones: dict[str, TokenBucket] = {}
+        self._pairs: dict[tuple[str, str], TokenBucket] = {}
+        self._waiting: dict[
+            str, list[tuple[int, int]]
+        ] = {}  # phone id -> heap of (priority, seq)
+        self._seq = itertools.count()
+        self._queue_depth = 0
+        self._throttle_events = collections.Counter[int]()
+        self._retries = 0
+        self._pairs_purged_at = time.monotonic()
+        self._cond = threading.Condition()
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of requests waiting for their turn to be sent."""
+        return self._queue_depth
+
+    @property
+    def throttle_events(self) -> dict[int, int]:
+        """How many times the API responded with each throttling error code."""
+        return dict(self._throttle_events)
+
+    @property
+    def retries(self) -> int:
+        """How many throttled requests were retried."""
+        return self._retries
+
+    def _get_bucket(
+        self, buckets: dict, key: Any, rate: float, capacity: float, now: float
+    ) -> TokenBucket:
+        if (bucket := buckets.get(key)) is None:
+            bucket = buckets[key] = TokenBucket(rate=rate, capacity=capacity, now=now)
+        return bucket
+
+    def _purge_pairs(self, now: float) -> None:
+        # a full bucket is the same as a new one, so idle pairs do not take any memory
+        if now - self._pairs_purged_at < _PAIRS_PURGE_INTERVAL_SEC:
+            return
+        self._pairs_purged_at = now
+        for pair in [p for p, b in self._pairs.items() if b.is_full(now)]:
+            del self._pairs[pair]
+
+    def _dequeue(self, phone_id: str, entry: tuple[int, int]) -> None:
+        queue = self._waiting[phone_id]
+        if queue[0] == entry:
+            heapq.heappop(queue)
+        else:  # gave up waiting (e.g. interrupted)
+            queue.remove(entry)
+            heapq.heapify(queue)
+        if not queue:
+            del self._waiting[phone_id]
+
+    def _on_throttled(
+        self,
+        error: WhatsAppError,
+        phone_id: str | None,
+        recipient: str | None,
+        attempt: int,
+    ) -> float | None:
+        """Count the throttling error and hold the phone id (or pair) back. Returns the backoff, ``None`` to give up."""
+        self._throttle_events[error.error_code] += 1
+        if attempt >= self._max_retries:
+            return None
+        self._retries += 1
+        cap = min(self._max_backoff, self._backoff * 2**attempt)
+        backoff = cap / 2 + random.uniform(0, cap / 2)
+        if phone_id is not None:
+            now = time.monotonic()
+            if isinstance(error, TooManyMessages) and recipient is not None:
+                self._get_bucket(
+                    self._pairs,
+                    (phone_id, recipient),
+                    self._pair_rate,
+                    self._pair_burst,
+                    now,
+                ).drain(now, backoff)
+            else:
+                self._get_bucket(
+                    self._phones, phone_id, self._rate, self._burst, now
+                ).drain(now, backoff)
+        _logger.warning(
+            "Throttled by the WhatsApp Cloud API (%s), retrying in %.2f seconds (attempt %d/%d)",
+            error.error_code,
+            backoff,
+            attempt + 1,
+            self._max_retries,
+        )
+        return backoff
+
+    def acquire(
+        self,
+        phone_id: str,
+        recipient: str | None = None,
+        priority: Priority = Priority.REPLY,
+    ) -> None:
+        """
+        Block until a message can be sent from the phone id (to the recipient, if given).
+
+        Args:
+            phone_id: The phone id to send the message from.
+            recipient: The recipient of the message (``None`` to skip the pair limit).
+            priority: The priority of the message.
+        """
+        with self._cond:
+            self._queue_depth += 1
+            try:
+                if recipient is not None:
+                    pair = self._get_bucket(
+                        self._pairs,
+                        (phone_id, recipient),
+                        self._pair_rate,
+                        self._pair_burst,
+                        time.monotonic(),
+                    )
+                    while (delay := pair.delay(time.monotonic())) > 0:
+                        self._cond.wait(delay)
+                    pair.take()
+                phone = self._get_bucket(
+                    self._phones, phone_id, self._rate, self._burst, time.monotonic()
+                )
+                entry = (priority, next(self._seq))
+                heapq.heappush(self._waiting.setdefault(phone_id, []), entry)
+                try:
+                    while True:
+                        if self._waiting[phone_id][0] != entry:
+                            self._cond.wait()  # until the requests before it are sent
+                        elif (delay := phone.delay(time.monotonic())) > 0:
+                            self._cond.wait(delay)
+                        else:
+                            break
+                    phone.take()
+                finally:
+                    self._dequeue(phone_id, entry)
+                    self._cond.notify_all()
+                self._purge_pairs(time.monotonic())
+            finally:
+                self._queue_depth -= 1
+
+    def run(
+        self,
+        func: Callable[[], _T],
+        phone_id: str | None = None,
+        recipient: str | None = None,
+        priority: Priority = Priority.REPLY,
+    ) -> _T:
+        """
+        Call ``func`` when the rate limits allow it, and call it again if it raises a throttling error.
+
+        Args:
+            func: The function that sends the request.
+            phone_id: The phone id the request is sent from (``None`` to send it right away, and only retry it).
+            recipient: The recipient of the message (``None`` to skip the pair limit).
+            priority: The priority of the message.
+
+        Returns:
+            The result of ``func``.
+        """
+        for attempt in itertools.count():
+            if phone_id is not None:
+                self.acquire(phone_id=phone_id, recipient=recipient, priority=priority)
+            try:
+                return func()
+            except _RETRY_ON as e:
+                with self._cond:
+                    backoff = self._on_throttled(e, phone_id, recipient, attempt)
+                if backoff is None:
+                    raise
+                time.sleep(backoff)
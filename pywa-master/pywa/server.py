@@ -1,12 +1,18 @@
 """This module contains the Server class, which is used to set up a webhook for receiving incoming updates."""
 
-import json
+import atexit
+import collections
+import dataclasses
+import hashlib
 import logging
 import threading
 from typing import TYPE_CHECKING, Callable, cast
 
 from . import utils, handlers, errors
+from .dedup import DedupBackend, MemoryDedupBackend
+from .dispatcher import UpdatesDispatcher
 from .handlers import (
+    _HandlersIndex,
     Handler,
     ChatOpenedHandler,
     TemplateStatusHandler,
@@ -41,6 +47,7 @@ from .utils import FastAPI, Flask
 
 if TYPE_CHECKING:
     from .client import WhatsApp
+    from . import webhook_routing
 
 
 _MESSAGE_TYPES: dict[MessageType, type[Handler]] = {
@@ -56,6 +63,192 @@ _INTERACTIVE_TYPES: dict[str, type[Handler]] = {
 
 _logger = logging.getLogger(__name__)
 
+_DEFAULT_ENQUEUE_TIMEOUT_SEC = 5
+"""How long to wait for a free slot in the background queue before rejecting an update."""
+
+
+@dataclasses.dataclass(slots=True)
+class WebhookStats:
+    """
+    Counters about the deliveries received by the webhook.
+
+    - Access it with ``wa.webhook_stats``.
+
+    Attributes:
+        deliveries: The number of deliveries (POST requests) that were dispatched to the handlers.
+        updates: The number of updates that were dispatched (a delivery may contain several updates).
+        updates_per_delivery: A histogram of the number of updates in each delivery (``{updates: deliveries}``).
+        rejected_deliveries: The number of deliveries that were rejected because the background queue was full.
+        duplicate_updates: The number of updates that were skipped because they were already handled (dedup hits).
+        unique_updates: The number of updates that were checked and not seen before (dedup misses).
+        unhandled_deliveries: The number of deliveries that were acknowledged without being decoded because no handler
+         or listener wanted them (only with ``skip_unhandled_deliveries``).
+    """
+
+    deliveries: int = 0
+    updates: int = 0
+    updates_per_delivery: collections.Counter[int] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+    rejected_deliveries: int = 0
+    duplicate_updates: int = 0
+    unique_updates: int = 0
+    unhandled_deliveries: int = 0
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_delivery(self, updates: int) -> None:
+        """Record a delivery that was split into ``updates`` updates."""
+        with self._lock:
+            self.deliveries += 1
+            self.updates += updates
+            self.updates_per_delivery[updates] += 1
+
+    def record_rejected(self) -> None:
+        """Record a delivery that was rejected."""
+        with self._lock:
+            self.rejected_deliveries += 1
+
+    def record_unhandled(self) -> None:
+        """Record a delivery that no handler or listener wanted."""
+        with self._lock:
+            self.unhandled_deliveries += 1
+
+    def record_dedup(self, duplicate: bool) -> None:
+        """Record the result of a duplicate updates check."""
+        with self._lock:
+            if duplicate:
+                self.duplicate_updates += 1
+            else:
+                self.unique_updates += 1
+
+    @property
+    def avg_updates_per_delivery(self) -> float:
+        """The average number of updates in each delivery."""
+        return self.updates / self.deliveries if self.deliveries else 0.0
+
+
+def _split_update(update: dict) -> list[dict]:
+    """
+    Split a webhook delivery into updates with a single entry, change and message/status.
+
+    Meta may batch several entries, changes, messages or statuses into one delivery, while the update constructors
+    only read the first of each. Every split update keeps the shape of the original delivery, and only the contacts
+    of the message sender are kept next to each message.
+    """
+    try:
+        entries = update["entry"]
+        if len(entries) == 1 and len(changes := entries[0]["changes"]) == 1:
+            value = changes[0]["value"]
+            if (
+                len(value.get("messages", ())) < 2
+                and len(value.get("statuses", ())) < 2
+            ):
+                return [update]  # fast path, nothing to split
+    except (KeyError, TypeError, IndexError, AttributeError):
+        return [update]  # let the handlers resolver report the invalid update
+
+    def rebuild(entry: dict, change: dict, value: dict) -> dict:
+        return {**update, "entry": [{**entry, "changes": [{**change, "value": value}]}]}
+
+    updates = []
+    try:
+        for entry in entries:
+            for change in entry["changes"]:
+                value = change.get("value")
+                if not isinstance(value, dict) or not (
+                    "messages" in value or "statuses" in value
+                ):
+                    updates.append(
+                        {**update, "entry": [{**entry, "changes": [change]}]}
+                    )
+                    continue
+                base_value = {
+                    k: v for k, v in value.items() if k not in ("messages", "statuses")
+                }
+                contacts = value.get("contacts")
+                for msg in value.get("messages", ()):
+                    msg_value = {**base_value, "messages": [msg]}
+                    if contacts:
+                        msg_value["contacts"] = [
+                            c for c in contacts if c.get("wa_id") == msg.get("from")
+                        ] or contacts
+                    updates.append(rebuild(entry, change, msg_value))
+                for status in value.get("statuses", ()):
+                    updates.append(
+                        rebuild(entry, change, {**base_value, "statuses": [status]})
+                    )
+    except (KeyError, TypeError, AttributeError):
+        return [update]
+    return updates or [update]
+
+
+def _dedup_key(
+    update: dict, index: int | None, delivery_hash: str | None
+) -> str | None:
+    """
+    The key to detect a redelivery of a single (already split) update, or of the whole delivery (``index=None``).
+
+    Messages are identified by their id and statuses by their id and status (a message is sent, delivered and read).
+    Other updates are identified by the hash of the delivery and their position in it.
+    """
+    if index is None:
+        return f"delivery:{delivery_hash}" if delivery_hash else None
+    try:
+        value = update["entry"][0]["changes"][0]["value"]
+        if messages := value.get("messages"):
+            return f"msg:{messages[0]['id']}"
+        if statuses := value.get("statuses"):
+            return f"status:{statuses[0]['id']}:{statuses[0]['status']}"
+    except (KeyError, TypeError, IndexError, AttributeError):
+        pass
+    return f"delivery:{delivery_hash}:{index}" if delivery_hash else None
+
+
+def _routed_message_handler(msg: "webhook_routing.Message") -> type[Handler]:
+    """The handler type of a routed message (like :meth:`Server._get_handler` does for the dict)."""
+    if msg.type == MessageType.INTERACTIVE:
+        if msg.interactive is None:  # value with errors
+            return MessageHandler
+        if (handler := _INTERACTIVE_TYPES.get(msg.interactive.type)) is not None:
+            return handler
+    return _MESSAGE_TYPES.get(msg.type, MessageHandler)
+
+
+def _listener_key(update: dict) -> tuple[str, str] | None:
+    """The ``listener_identifier`` (sender, recipient) of a single (already split) update, if it is a user update."""
+    try:
+        value = update["entry"][0]["changes"][0]["value"]
+        if messages := value.get("messages"):
+            sender = messages[0]["from"]
+        elif statuses := value.get("statuses"):
+            sender = statuses[0]["recipient_id"]
+        else:
+            return None
+        return utils.listener_identifier(
+            sender=sender, recipient=value["metadata"]["phone_number_id"]
+        )
+    except (KeyError, TypeError, IndexError, AttributeError):
+        return None
+
+
+def _background_items(
+    update: dict, update_hash: str | None
+) -> list[tuple[tuple[str, str] | None, tuple[dict, int | None, str | None]]]:
+    """
+    Split the delivery into ``(key, (update, index, update_hash))`` items for the :class:`UpdatesDispatcher`.
+
+    The updates of each user are keyed by their ``listener_identifier`` so they are handled in order, and the raw
+    update (``index=None``) comes last, without a key.
+    """
+    items = [
+        (_listener_key(single_update), (single_update, i, update_hash))
+        for i, single_update in enumerate(_split_update(update))
+    ]
+    items.append((None, (update, None, update_hash)))
+    return items
+
 
 class Server:
     """This class is used internally by the :class:`WhatsApp` client to set up a webhook for receiving incoming
@@ -74,6 +267,8 @@ class Server:
     }
     """A dictionary that maps handler types to their respective update constructors."""
 
+    _dispatcher_cls = UpdatesDispatcher
+
     def __init__(
         self: "WhatsApp",
         server: Flask | FastAPI | None,
@@ -92,6 +287,11 @@ class Server:
         continue_handling: bool,
         skip_duplicate_updates: bool,
         validate_updates: bool,
+        skip_unhandled_deliveries: bool = False,
+        background_workers: int | None = None,
+        max_queued_updates: int = 0,
+        max_queued_updates_per_user: int = 0,
+        dedup_backend: DedupBackend | None = None,
     ):
         self._server = server
         self._verify_token = verify_token
@@ -104,10 +304,24 @@ class Server:
         self._flows_response_encryptor = flows_response_encryptor
         self._validate_updates = validate_updates
         self._continue_handling = continue_handling
-        self._skip_duplicate_updates = skip_duplicate_updates
-        self._updates_in_process = set[
-            str | int
-        ]()  # TODO use threading.Lock | asyncio.Lock
+        self._dedup_backend = (
+            (dedup_backend or MemoryDedupBackend()) if skip_duplicate_updates else None
+        )
+        self._webhook_stats = WebhookStats()
+        self._decode_routing: Callable[[bytes], "webhook_routing.Delivery"] | None = (
+            None
+        )
+        if skip_unhandled_deliveries:
+            if not utils.is_installed("msgspec"):
+                raise ValueError(
+                    "When using `skip_unhandled_deliveries`, the `msgspec` package must be installed.\n>> Install it with "
+                    "`pip3 install msgspec`."
+                )
+            from . import webhook_routing
+
+            self._decode_routing = webhook_routing.decode_delivery
+        self._handlers_indexes: dict[type[Handler], _HandlersIndex] = {}
+        self._dispatcher: UpdatesDispatcher | None = None
 
         if server is utils.MISSING:
             return
@@ -127,6 +341,16 @@ class Server:
 
         self._register_routes()
 
+        if background_workers:
+            self._dispatcher = self._dispatcher_cls(
+                handler=self._handle_update_in_background,
+                workers=background_workers,
+                max_queued=max_queued_updates,
+                max_queued_per_key=max_queued_updates_per_user,
+                enqueue_timeout=_DEFAULT_ENQUEUE_TIMEOUT_SEC,
+            )
+            self._register_shutdown()
+
         if callback_url is not None:
             if callback_url_scope == utils.CallbackURLScope.APP and (
                 app_id is None or app_secret is None
@@ -160,6 +384,11 @@ class Server:
                 delay=webhook_challenge_delay,
             )
 
+    @property
+    def webhook_stats(self) -> WebhookStats:
+        """Counters about the deliveries received by the webhook (see :class:`WebhookStats`)."""
+        return self._webhook_stats
+
     def webhook_challenge_handler(self, vt: str, ch: str) -> tuple[str, int]:
         """
         Handle the verification challenge from the webhook manually.
@@ -207,8 +436,61 @@ class Server:
         )
         if res:
             return res, status
-        self._call_handlers(update_dict)
-        return self._after_handling_update(update_hash)
+        if self._dispatcher is not None:
+            items = _background_items(update_dict, update_hash)
+            return self._reject_if_not_queued(
+                self._dispatcher.submit(items), updates=len(items) - 1
+            )
+        self._call_handlers(update_dict, update_hash)
+        return "ok", 200
+
+    @property
+    def pending_updates(self) -> int:
+        """The number of updates waiting to be handled in the background (see ``background_workers``)."""
+        return self._dispatcher.pending if self._dispatcher is not None else 0
+
+    def shutdown(self, timeout: float | None = None) -> bool:
+        """
+        Stop accepting updates and wait for the updates that are handled in the background.
+
+        - Only relevant when ``background_workers`` is set (called automatically on exit and on FastAPI shutdown).
+        - Updates that arrive after the shutdown are rejected with ``503`` so WhatsApp will retry them later.
+
+        Args:
+            timeout: The maximum time (in seconds) to wait (``None`` to wait until all the updates are handled).
+
+        Returns:
+            Whether all the pending updates were handled.
+        """
+        if self._dispatcher is None:
+            return True
+        return self._dispatcher.shutdown(timeout=timeout)
+
+    def _register_shutdown(self: "WhatsApp") -> None:
+        atexit.register(self.shutdown)
+        if self._server_type == utils.ServerType.FASTAPI:
+            self._server.router.on_shutdown.append(self.shutdown)
+
+    def _handle_update_in_background(
+        self: "WhatsApp", item: tuple[dict, int | None, str | None]
+    ) -> None:
+        update, index, update_hash = item
+        if index is None:
+            self._call_raw_update_handler(update, update_hash)
+        else:
+            self._call_update_handlers(update, index, update_hash)
+
+    def _reject_if_not_queued(self, queued: bool, updates: int) -> tuple[str, int]:
+        if queued:
+            self._webhook_stats.record_delivery(updates)
+            return "ok", 200
+        self._webhook_stats.record_rejected()
+        _logger.warning(
+            "Webhook ('%s') rejected an update: %s",
+            self._webhook_endpoint,
+            "shutting down" if self._dispatcher.closed else "too many pending updates",
+        )
+        return "Error, service unavailable", 503
 
     def _check_and_prepare_update(
         self, update: bytes, hmac_header: str = None
@@ -230,8 +512,24 @@ class Server:
                     self._webhook_endpoint,
                 )
                 return "Error, invalid signature", 401, None, None
+        if self._decode_routing is not None:
+            try:
+                delivery = self._decode_routing(update)
+            except (TypeError, ValueError) as e:
+                # Not rejected: WhatsApp would retry a delivery that the dict path may handle fine
+                _logger.warning(
+                    "Webhook ('%s') received an update that does not match the routing schema, "
+                    "handling it as usual (%s): %s",
+                    self._webhook_endpoint,
+                    e,
+                    update,
+                )
+            else:
+                if not self._is_delivery_wanted(delivery):
+                    self._webhook_stats.record_unhandled()
+                    return "ok", 200, None, None
         try:
-            update_dict: dict = json.loads(update)
+            update_dict: dict = self._json_codec.loads(update)
         except (TypeError, ValueError):
             _logger.debug(
                 "Webhook ('%s') received non-JSON data: %s",
@@ -240,26 +538,57 @@ class Server:
             )
             return "Error, invalid update", 400, None, None
 
-        update_hash = hmac_header or hash(update)
         _logger.debug(
             "Webhook ('%s') received an update: %s",
             self._webhook_endpoint,
             update_dict,
         )
-        if self._skip_duplicate_updates:
-            if update_hash in self._updates_in_process:
-                return "ok", 200, None, None
-            self._updates_in_process.add(update_hash)
+        update_hash = None
+        if self._dedup_backend is not None:  # stable between processes, unlike hash()
+            update_hash = (
+                hmac_header
+                or hashlib.sha256(
+                    update if isinstance(update, bytes) else str(update).encode()
+                ).hexdigest()
+            )
 
         return None, None, update_dict, update_hash
 
-    def _after_handling_update(self, update_hash: str) -> tuple[str, int]:
-        if self._skip_duplicate_updates:
-            try:
-                self._updates_in_process.remove(update_hash)
-            except KeyError:
-                pass
-        return "ok", 200
+    def _is_duplicate_update(
+        self, update: dict, index: int | None, update_hash: str | None
+    ) -> bool:
+        """Check (and remember) whether the update (or the delivery, when ``index=None``) was already handled."""
+        if self._dedup_backend is None or (
+            (key := _dedup_key(update, index, update_hash)) is None
+        ):
+            return False
+        try:
+            duplicate = not self._dedup_backend.add(key)
+        except Exception:
+            _logger.exception("Failed to check for a duplicate update: %s", key)
+            return False
+        if index is not None:
+            self._webhook_stats.record_dedup(duplicate)
+        if duplicate:
+            _logger.debug(
+                "Webhook ('%s') skipped a duplicate update: %s",
+                self._webhook_endpoint,
+                key,
+            )
+        return duplicate
+
+    def _forget_update(
+        self, update: dict, index: int | None, update_hash: str | None
+    ) -> None:
+        """Forget an update that failed, so it is handled again if WhatsApp redelivers it."""
+        if self._dedup_backend is None or (
+            (key := _dedup_key(update, index, update_hash)) is None
+        ):
+            return
+        try:
+            self._dedup_backend.discard(key)
+        except Exception:
+            _logger.exception("Failed to forget a failed update: %s", key)
 
     def _register_routes(self: "WhatsApp") -> None:
         match self._server_type:
@@ -335,49 +664,73 @@ class Server:
                     f"The `server` must be one of {utils.ServerType.protocols_names()} or None for a custom server"
                 )
 
-    def _call_handlers(self: "WhatsApp", update: dict) -> None:
-        """Call the handlers for the given update."""
+    def _call_handlers(
+        self: "WhatsApp", update: dict, update_hash: str | None = None
+    ) -> None:
+        """Split the delivery and call the handlers for each of its updates."""
         try:
-            try:
-                handler_type = self._get_handler(update)
-            except (KeyError, ValueError, TypeError, IndexError):
-                (_logger.error if self._validate_updates else _logger.debug)(
-                    "Webhook ('%s') received unexpected update%s: %s",
-                    self._webhook_endpoint,
-                    " (Enable `validate_updates` to ignore updates with invalid data)"
-                    if not self._validate_updates
-                    else "",
-                    update,
-                )
-                handler_type = None
-
-            if handler_type is None:
-                return
-            try:
-                constructed_update = self._handlers_to_update_constractor[handler_type](
-                    self, update
-                )
-                if constructed_update:
-                    if handler_type._is_user_update and self._process_listener(
-                        cast(BaseUserUpdate, constructed_update)
-                    ):
-                        return
-                    self._invoke_callbacks(handler_type, constructed_update)
-            except Exception:
-                _logger.exception("Failed to construct update: %s", update)
+            updates = _split_update(update)
+            self._webhook_stats.record_delivery(len(updates))
+            for i, single_update in enumerate(updates):
+                self._call_update_handlers(single_update, i, update_hash)
         finally:
-            # Always call raw update handler last
-            self._call_raw_update_handler(update)
+            # Always call raw update handler last (once per delivery)
+            self._call_raw_update_handler(update, update_hash)
+
+    def _call_update_handlers(
+        self: "WhatsApp",
+        update: dict,
+        index: int = 0,
+        update_hash: str | None = None,
+    ) -> None:
+        """Call the handlers for a single (already split) update, unless it was already handled."""
+        if self._is_duplicate_update(update, index, update_hash):
+            return
+        try:
+            handler_type = self._get_handler(update)
+        except (KeyError, ValueError, TypeError, IndexError):
+            (_logger.error if self._validate_updates else _logger.debug)(
+                "Webhook ('%s') received unexpected update%s: %s",
+                self._webhook_endpoint,
+                " (Enable `validate_updates` to ignore updates with invalid data)"
+                if not self._validate_updates
+                else "",
+                update,
+            )
+            handler_type = None
 
-    def _call_raw_update_handler(self: "WhatsApp", update: dict) -> None:
-        """Invoke the raw update handler."""
-        self._invoke_callbacks(RawUpdateHandler, update)
+        if handler_type is None:
+            return
+        try:
+            constructed_update = self._handlers_to_update_constractor[handler_type](
+                self, update
+            )
+            if constructed_update:
+                if handler_type._is_user_update and self._process_listener(
+                    cast(BaseUserUpdate, constructed_update)
+                ):
+                    return
+                if not self._invoke_callbacks(handler_type, constructed_update):
+                    self._forget_update(update, index, update_hash)
+        except Exception:
+            _logger.exception("Failed to construct update: %s", update)
+            self._forget_update(update, index, update_hash)
+
+    def _call_raw_update_handler(
+        self: "WhatsApp", update: dict, update_hash: str | None = None
+    ) -> None:
+        """Invoke the raw update handler, unless the delivery was already handled."""
+        if self._is_duplicate_update(update, None, update_hash):
+            return
+        if not self._invoke_callbacks(RawUpdateHandler, update):
+            self._forget_update(update, None, update_hash)
 
     def _invoke_callbacks(
         self: "WhatsApp", handler_type: type[Handler], update: BaseUpdate | dict
-    ) -> None:
-        """Process and call registered handlers for the update."""
-        for handler in self._handlers[handler_type]:
+    ) -> bool:
+        """Process and call registered handlers for the update. Returns ``False`` if a handler raised an exception."""
+        ok = True
+        for handler in self._get_handlers_index(handler_type).candidates(update):
             try:
                 handled = handler.handle(self, update)
             except StopHandling:
@@ -385,13 +738,26 @@ class Server:
             except ContinueHandling:
                 continue
             except Exception:
-                handled = True
+                handled, ok = True, False
                 _logger.exception(
                     "An error occurred while '%s' was handling an update",
                     handler._callback.__name__,
                 )
             if handled and not self._continue_handling:
                 break
+        return ok
+
+    def _get_handlers_index(
+        self: "WhatsApp", handler_type: type[Handler]
+    ) -> _HandlersIndex:
+        """Get the index of the handlers of the given type (built on first use after the handlers are changed)."""
+        try:
+            return self._handlers_indexes[handler_type]
+        except KeyError:
+            index = self._handlers_indexes[handler_type] = _HandlersIndex(
+                self._handlers[handler_type]
+            )
+            return index
 
     def _process_listener(self: "WhatsApp", update: BaseUserUpdate) -> bool:
         """Process and answer a listener if present."""
@@ -411,6 +777,47 @@ class Server:
 
         return not self._continue_handling
 
+    def _is_delivery_wanted(
+        self: "WhatsApp", delivery: "webhook_routing.Delivery"
+    ) -> bool:
+        """Whether a handler or a listener wants any update of the (routed) delivery, following :meth:`_get_handler`."""
+        if self._handlers.get(RawUpdateHandler):
+            return True
+        for entry in delivery.entry:
+            for change in entry.changes:
+                if change.field != "messages":
+                    # noinspection PyProtectedMember
+                    if self._handlers.get(
+                        Handler._fields_to_subclasses().get(change.field)
+                    ):
+                        return True
+                    continue
+                value = change.value
+                if value.metadata is None:
+                    return True  # let the regular path report it
+                recipient = value.metadata.phone_number_id
+                if self.filter_updates and recipient != self.phone_id:
+                    continue
+                if not value.messages and not value.statuses:
+                    return True  # unknown message type, let the regular path report it
+                for msg in value.messages:
+                    if self._handlers.get(_routed_message_handler(msg)) or (
+                        utils.listener_identifier(sender=msg.from_, recipient=recipient)
+                        in self._listeners
+                    ):
+                        return True
+                if value.statuses and self._handlers.get(MessageStatusHandler):
+                    return True
+                for status in value.statuses:
+                    if (
+                        utils.listener_identifier(
+                            sender=status.recipient_id, recipient=recipient
+                        )
+                        in self._listeners
+                    ):
+                        return True
+        return False
+
     def _get_handler(self: "WhatsApp", update: dict) -> type[Handler] | None:
         """Get the handler for the given update."""
         field = update["entry"][0]["changes"][0]["field"]
@@ -2,7 +2,7 @@
 This package contains all the types used in the library.
 """
 
-from .base_update import StopHandling, ContinueHandling
+from .base_update import StopHandling, ContinueHandling, MalformedUpdateError
 from .callback import (
     Button,
     ButtonUrl,
@@ -65,4 +65,9 @@ from .flows import (
     FlowMetricGranularity,
 )
 from .chat_opened import ChatOpened
-from ..listeners import ListenerCanceled, ListenerTimeout, ListenerStopped
+from ..listeners import (
+    ListenerCanceled,
+    ListenerTimeout,
+    ListenerStopped,
+    TooManyListeners,
+)
@@ -6,12 +6,15 @@ from __future__ import annotations
 __all__ = [
     "StopHandling",
     "ContinueHandling",
+    "MalformedUpdateError",
 ]
 
 import abc
+import logging
 import pathlib
 import dataclasses
 import datetime
+from types import MappingProxyType
 from typing import TYPE_CHECKING, BinaryIO, Iterable
 
 from pywa import utils
@@ -31,6 +34,8 @@ if TYPE_CHECKING:
     )
     from .template import Template
 
+_logger = logging.getLogger(__name__)
+
 
 class StopHandling(Exception):
     """
@@ -82,6 +87,25 @@ class ContinueHandling(Exception):
     pass
 
 
+class MalformedUpdateError(ValueError):
+    """
+    Raised when a field of an update cannot be decoded because the payload of the update is malformed.
+
+    - The fields of incoming messages are decoded from ``update.raw`` on first access, so this is raised from the
+      filter or the handler that accessed the field (and logged once per update).
+    - It is not an :class:`AttributeError`, so ``getattr(update, name, default)`` and ``hasattr`` do not hide it.
+
+    Attributes:
+        field: The name of the field.
+    """
+
+    def __init__(self, update_type: str, field: str, error: Exception):
+        super().__init__(
+            f"Failed to decode the field {field!r} of {update_type!r} from the update: {error!r}"
+        )
+        self.field = field
+
+
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
 class BaseUpdate(abc.ABC):
     """Base class for all update types."""
@@ -91,6 +115,16 @@ class BaseUpdate(abc.ABC):
     timestamp: datetime.datetime
     raw: dict = dataclasses.field(repr=False, hash=False, compare=False)
     shared_data: dict = dataclasses.field(hash=False, default_factory=dict)
+    _filters_results: dict = dataclasses.field(
+        init=False, repr=False, hash=False, compare=False, default_factory=dict
+    )  # memoized filters results (and normalized texts) for this update, see filters._check_sync
+
+    _lazy_fields = MappingProxyType({})
+    """
+    A mapping of the fields that are decoded from ``raw`` on first access (see :meth:`_from_raw`) to their decoders.
+    A decoder returns a dict of the fields it decoded, so fields that come from the same part of the payload are
+    decoded together.
+    """
 
     @classmethod
     @abc.abstractmethod
@@ -98,6 +132,55 @@ class BaseUpdate(abc.ABC):
         """Create an update object from a raw update dict."""
         ...
 
+    @classmethod
+    def _from_raw(cls, client: WhatsApp, update: dict, **fields):
+        """
+        Create an update object without decoding its ``_lazy_fields``.
+
+        - The update keeps a reference to ``update`` (nothing is copied), and each lazy field is decoded from it the
+          first time it is accessed and then stored in its slot, so updates that are filtered out early only pay for
+          the ``fields`` given here.
+        - If the payload is malformed, accessing a lazy field logs the error once and raises
+          :class:`MalformedUpdateError` (naming the field, with the original error as the cause).
+        """
+        self = object.__new__(cls)
+        object.__setattr__(self, "_client", client)
+        object.__setattr__(self, "raw", update)
+        object.__setattr__(self, "shared_data", {})
+        object.__setattr__(self, "_filters_results", {})
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+        return self
+
+    def __getattr__(self, name: str):
+        # Only called when the attribute is missing, i.e. for a lazy field that was not decoded yet
+        try:
+            decoder = type(self)._lazy_fields[name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            ) from None
+        failure_key = ("_decode_error", decoder)
+        if (error := self._filters_results.get(failure_key)) is not None:
+            raise MalformedUpdateError(type(self).__name__, name, error) from error
+        try:
+            fields = decoder(self)
+        except (
+            Exception
+        ) as e:  # malformed payload, don't decode it again on the next access
+            self._filters_results[failure_key] = e
+            _logger.error(
+                "Failed to construct update (field %r of %r): %s",
+                name,
+                type(self).__name__,
+                self.raw,
+                exc_info=True,
+            )
+            raise MalformedUpdateError(type(self).__name__, name, e) from e
+        for field, value in fields.items():
+            object.__setattr__(self, field, value)
+        return fields[name]
+
     def __hash__(self):
         """Return the hash of the update ID."""
         return hash(self.id)
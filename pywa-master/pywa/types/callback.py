@@ -15,10 +15,12 @@ __all__ = [
 import dataclasses
 import datetime
 import enum
+import operator
 import types
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Generic,
     Iterable,
     TypeVar,
@@ -39,6 +41,107 @@ if TYPE_CHECKING:
     from .template import Template
 
 
+def _field_encoder(field_type: type, null: str, true: str) -> Callable[[Any], str]:
+    """Build the encoder of a callback data field (``None`` is always encoded as ``null``)."""
+    if issubclass(field_type, bool):
+
+        def encode(value: Any) -> str:
+            return null if value is None else true if value else ""
+
+    elif issubclass(field_type, enum.Enum):
+
+        def encode(value: Any) -> str:
+            if value is None:
+                return null
+            return value.value if isinstance(value, enum.Enum) else str(value)
+
+    else:
+
+        def encode(value: Any) -> str:
+            return null if value is None else str(value)
+
+    return encode
+
+
+def _field_decoder(
+    field_type: type, optional: bool, null: str, true: str
+) -> Callable[[str], Any]:
+    """Build the decoder of a callback data field (raises :class:`ValueError` or :class:`TypeError` on invalid data)."""
+    if issubclass(field_type, bool):
+
+        def convert(value: str) -> bool:
+            if value == true:
+                return True
+            if value == "":
+                return False
+            raise ValueError(f"Invalid boolean value: {value}")
+
+    else:
+        convert = field_type  # str, int, float or the enum (by value)
+
+    if not optional:
+        return convert
+
+    def decode(value: str) -> Any:
+        return None if value == null else convert(value)
+
+    return decode
+
+
+class _CallbackCodec:
+    """The encoder and decoder of a callback data class, built once when the class is created."""
+
+    __slots__ = (
+        "prefix",
+        "data_sep",
+        "callback_sep",
+        "get_values",
+        "encoders",
+        "decoders",
+        "parts",
+    )
+
+    def __init__(
+        self,
+        callback_id: int | str,
+        data_sep: str,
+        callback_sep: str,
+        fields: list[tuple[str, type, bool]],
+        null: str,
+        true: str,
+    ):
+        self.prefix = f"{callback_id}{data_sep}"
+        self.data_sep = data_sep
+        self.callback_sep = callback_sep
+        names = [name for name, _, _ in fields]
+        getter = operator.attrgetter(*names)
+        # attrgetter with a single name returns the value itself, not a tuple
+        self.get_values = getter if len(names) > 1 else lambda obj: (getter(obj),)
+        self.encoders = tuple(_field_encoder(t, null, true) for _, t, _ in fields)
+        self.decoders = tuple(
+            _field_decoder(t, optional, null, true) for _, t, optional in fields
+        )
+        self.parts = len(fields) + 1  # the callback id and the fields
+
+    def encode(self, obj: "CallbackData") -> str:
+        data = self.data_sep.join(
+            [
+                encode(value)
+                for encode, value in zip(self.encoders, self.get_values(obj))
+            ]
+        )
+        if self.callback_sep in data:
+            CallbackData._not_contains(data, self.callback_sep)
+        return self.prefix + data
+
+    def decode(self, cls: type["CallbackData"], data: str) -> "CallbackData":
+        values = data.split(self.data_sep)
+        if len(values) != self.parts:
+            raise ValueError(f"Expected {self.parts - 1} fields, got {len(values) - 1}")
+        # noinspection PyArgumentList
+        return cls(*[decode(value) for decode, value in zip(self.decoders, values[1:])])
+
+
 class CallbackData:
     """
     Base class for all callback data classes. Subclass this class to create a type-safe callback data class.
@@ -54,6 +157,9 @@ class CallbackData:
         (e.g ``Optional[int]`` or ``Union[int, None]``). the Union length must be 2 at most, and one of the types must
         be ``None``. All fields can be with default values.
 
+        The encoder and the decoder of each subclass are built once, when the class is created, so the separators must
+        be overridden before that.
+
         The characters ``¶`` and ``~`` cannot be used when sending callbacks, because they are used as separators.
         You can change the separators by overriding ``__callback_data_sep__`` (``~`` for individual objects) and
         ``CallbackData.__callback_sep__`` (``¶`` in the base class level, affects all child classes).
@@ -108,6 +214,8 @@ class CallbackData:
         float,
     )
     """The allowed types in the callback data."""
+    __callback_codec__: _CallbackCodec | None = None
+    """The encoder and decoder of the callback data class (built for each subclass). Do not override this."""
 
     def __init_subclass__(cls, *args, **kwargs):
         """Validate the callback data class and set a unique ID for it."""
@@ -135,7 +243,9 @@ class CallbackData:
                 f"Callback data class `{cls.__name__}` must have at least one field."
             )
         unsupported_fields = set[tuple[str, type]]()
+        fields = list[tuple[str, type, bool]]()
         for field_name, field_type in cls.__annotations__.items():
+            optional = False
             if get_origin(field_type) in (types.UnionType, Union):
                 if len(union_args := get_args(field_type)) > 2:
                     raise TypeError(
@@ -147,12 +257,14 @@ class CallbackData:
                         f"(e.g. int | None)"
                     )
                 field_type = next((a for a in union_args if a is not types.NoneType))
+                optional = True
             if issubclass(field_type, enum.Enum) and not issubclass(field_type, str):
                 raise TypeError(
                     f"Field `{field_name}` in `{cls.__name__}` must be an Enum that inherits from str."
                 )
             if not issubclass(cast(type, field_type), cls.__allowed_types__):
                 unsupported_fields.add((field_name, cast(type, field_type)))
+            fields.append((field_name, cast(type, field_type), optional))
         if unsupported_fields:
             raise TypeError(
                 f"Unsupported types {unsupported_fields} in callback data. Use one of {cls.__allowed_types__}."
@@ -162,6 +274,15 @@ class CallbackData:
             cls.__callback_id__ = CallbackData.__callback_id__
             CallbackData.__callback_id__ += 1
 
+        cls.__callback_codec__ = _CallbackCodec(
+            callback_id=cls.__callback_id__,
+            data_sep=cls.__callback_data_sep__,
+            callback_sep=cls.__callback_sep__,
+            fields=fields,
+            null=cls.__callback_null__,
+            true=cls.__callback_bool_true__,
+        )
+
     @classmethod
     def from_str(
         cls,
@@ -171,31 +292,7 @@ class CallbackData:
         Internal function to convert a callback string to a callback object.
         """
         try:
-            positional_args = []
-            for annotation, value in zip(
-                cls.__annotations__.values(),
-                data.split(cls.__callback_data_sep__)[1:],
-                strict=True,
-            ):
-                if get_origin(annotation) in (types.UnionType, Union):
-                    if value == cls.__callback_null__:
-                        positional_args.append(None)
-                        continue
-                    annotation = next(
-                        a for a in get_args(annotation) if a is not types.NoneType
-                    )
-                if isinstance(annotation, bool):
-                    if value == cls.__callback_bool_true__:
-                        positional_args.append(True)
-                        continue
-                    elif value == "":
-                        positional_args.append(False)
-                        continue
-                    raise ValueError
-                positional_args.append(annotation(value))
-
-            # noinspection PyArgumentList
-            return cls(*positional_args)
+            return cls.__callback_codec__.decode(cls, data)
         except (ValueError, TypeError) as e:
             raise ValueError(f"Invalid callback data for {cls.__name__}: {data}") from e
 
@@ -215,19 +312,7 @@ class CallbackData:
         """
         Internal function to convert a callback object to a callback string.
         """
-        values = [
-            str(self.__callback_id__),
-        ]
-        for field_name, field_type in self.__annotations__.items():
-            value = getattr(self, field_name)
-            if value is None:
-                value = self.__callback_null__
-            if isinstance(value, bool):
-                value = self.__callback_bool_true__ if value else ""
-            if isinstance(value, enum.Enum):
-                value = value.value
-            values.append(self._not_contains(value, self.__callback_sep__))
-        return self.__callback_data_sep__.join(values)
+        return self.__callback_codec__.encode(self)
 
 
 _CallbackDataT = TypeVar(
@@ -154,7 +154,9 @@ class FlowCompletion(BaseUserUpdate):
     @classmethod
     def from_update(cls, client: WhatsApp, update: dict) -> FlowCompletion:
         msg = (value := update["entry"][0]["changes"][0]["value"])["messages"][0]
-        response: dict = json.loads(msg["interactive"]["nfm_reply"]["response_json"])
+        response: dict = client._json_codec.loads(
+            msg["interactive"]["nfm_reply"]["response_json"]
+        )
         try:
             flow_token = response.pop("flow_token")
         except KeyError:
@@ -17,12 +17,19 @@ import dataclasses
 import mimetypes
 from typing import TYPE_CHECKING
 
+import httpx
+
 from .. import utils
 
 if TYPE_CHECKING:
     from ..client import WhatsApp
 
 
+def _is_stale_media_url(e: httpx.HTTPStatusError) -> bool:
+    """Whether the CDN rejected the media URL because it expired (so it should be looked up again)."""
+    return e.response.status_code in (401, 404)
+
+
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
 class BaseMedia(abc.ABC, utils.FromDict):
     """Base class for all media types."""
@@ -60,6 +67,7 @@ class BaseMedia(abc.ABC, utils.FromDict):
         """
         Download a media file from WhatsApp servers.
             - Same as :func:`~pywa.client.WhatsApp.download_media` with ``media_url=media.get_media_url()``
+            - The file is streamed to disk and verified against the ``sha256`` of the media.
 
         >>> message.image.download()
 
@@ -72,13 +80,20 @@ class BaseMedia(abc.ABC, utils.FromDict):
         Returns:
             The path of the saved file if ``in_memory`` is False, the file as bytes otherwise.
         """
-        return self._client.download_media(
-            url=self.get_media_url(),
-            path=path,
-            filename=filename,
-            in_memory=in_memory,
-            **kwargs,
-        )
+        for retry in (False, True):
+            try:
+                return self._client.download_media(
+                    url=self.get_media_url(),
+                    path=path,
+                    filename=filename,
+                    in_memory=in_memory,
+                    sha256=self.sha256,
+                    **kwargs,
+                )
+            except httpx.HTTPStatusError as e:
+                if retry or not _is_stale_media_url(e):
+                    raise
+                self._client._media_urls.invalidate(self.id)
 
     @classmethod
     def from_flow_completion(cls, client: WhatsApp, media: dict[str, str]) -> BaseMedia:
@@ -230,10 +245,19 @@ class MediaUrlResponse(utils.FromDict):
         Returns:
             The path of the saved file if ``in_memory`` is False, the file as bytes otherwise.
         """
-        return self._client.download_media(
-            url=self.url,
-            path=filepath,
-            filename=filename,
-            in_memory=in_memory,
-            **kwargs,
-        )
+        try:
+            return self._client.download_media(
+                url=self.url,
+                path=filepath,
+                filename=filename,
+                in_memory=in_memory,
+                sha256=self.sha256,
+                **kwargs,
+            )
+        except httpx.HTTPStatusError as e:
+            if not _is_stale_media_url(e):
+                raise
+            self._client._media_urls.invalidate(self.id)
+            return self._client.get_media_url(media_id=self.id).download(
+                filepath=filepath, filename=filename, in_memory=in_memory, **kwargs
+            )
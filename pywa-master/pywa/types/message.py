@@ -33,6 +33,49 @@ if TYPE_CHECKING:
     from .sent_message import SentMessage
 
 
+def _value(msg: Message) -> dict:
+    return msg.raw["entry"][0]["changes"][0]["value"]
+
+
+def _decode_sender(msg: Message) -> dict:
+    value = _value(msg)
+    try:
+        usr = User.from_dict(value["contacts"][0])
+    except KeyError:
+        usr = User(
+            wa_id=value["messages"][0]["from"], name=None
+        )  # some messages don't have contacts
+    return {"metadata": Metadata.from_dict(value["metadata"]), "from_user": usr}
+
+
+def _decode_details(msg: Message) -> dict:
+    value = _value(msg)
+    data = value["messages"][0]
+    context = data.get("context", {})
+    error = value.get("errors", data.get("errors", (None,)))[0]
+    return {
+        "timestamp": datetime.datetime.fromtimestamp(int(data["timestamp"])),
+        "forwarded": context.get("forwarded", False)
+        or context.get("frequently_forwarded", False),
+        "forwarded_many_times": context.get("frequently_forwarded", False),
+        "reply_to_message": ReplyToMessage.from_dict(context),
+        "error": WhatsAppError.from_dict(error=error) if error is not None else None,
+    }
+
+
+def _decode_content(msg: Message) -> dict:
+    data = _value(msg)["messages"][0]
+    msg_type = data["type"]
+    fields = dict.fromkeys(msg._fields_to_objects_constructors)
+    if (constructor := msg._fields_to_objects_constructors.get(msg_type)) is not None:
+        # noinspection PyArgumentList
+        fields[msg_type] = constructor(data[msg_type], _client=msg._client)
+    fields["caption"] = (
+        data.get(msg_type, {}).get("caption") if msg_type in msg._media_fields else None
+    )
+    return fields
+
+
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
 class Message(BaseUserUpdate):
     """
@@ -107,6 +150,26 @@ class Message(BaseUserUpdate):
         )
     )
     """A mapping of message types to their respective constructors."""
+    _lazy_fields = MappingProxyType(
+        {
+            # the sender and the recipient are needed to route almost every message (listeners, per-user queues)
+            **dict.fromkeys(("metadata", "from_user"), _decode_sender),
+            **dict.fromkeys(
+                (*_fields_to_objects_constructors, "caption"), _decode_content
+            ),
+            **dict.fromkeys(
+                (
+                    "timestamp",
+                    "forwarded",
+                    "forwarded_many_times",
+                    "reply_to_message",
+                    "error",
+                ),
+                _decode_details,
+            ),
+        }
+    )
+    """The fields that are decoded from ``raw`` on first access (only ``id`` and ``type`` are decoded upfront)."""
 
     @property
     def message_id_to_reply(self) -> str:
@@ -134,40 +197,9 @@ class Message(BaseUserUpdate):
 
     @classmethod
     def from_update(cls, client: WhatsApp, update: dict) -> Message:
-        msg = (value := update["entry"][0]["changes"][0]["value"])["messages"][0]
-        error = value.get("errors", msg.get("errors", (None,)))[0]
-        msg_type = msg["type"]
-        context = msg.get("context", {})
-        constructor = cls._fields_to_objects_constructors.get(msg_type)
-        # noinspection PyArgumentList
-        msg_content = (
-            {msg_type: constructor(msg[msg_type], _client=client)}
-            if constructor is not None
-            else {}
-        )
-        try:
-            usr = User.from_dict(value["contacts"][0])
-        except KeyError:
-            usr = User(
-                wa_id=msg["from"], name=None
-            )  # some messages don't have contacts
-        return cls(
-            _client=client,
-            raw=update,
-            id=msg["id"],
-            type=MessageType(msg_type),
-            **msg_content,
-            from_user=usr,
-            timestamp=datetime.datetime.fromtimestamp(int(msg["timestamp"])),
-            metadata=Metadata.from_dict(value["metadata"]),
-            forwarded=context.get("forwarded", False)
-            or context.get("frequently_forwarded", False),
-            forwarded_many_times=context.get("frequently_forwarded", False),
-            reply_to_message=ReplyToMessage.from_dict(context),
-            caption=msg.get(msg_type, {}).get("caption")
-            if msg_type in cls._media_fields
-            else None,
-            error=WhatsAppError.from_dict(error=error) if error is not None else None,
+        msg = update["entry"][0]["changes"][0]["value"]["messages"][0]
+        return cls._from_raw(
+            client, update, id=msg["id"], type=MessageType(msg["type"])
         )
 
     @property
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import functools
-import json
 import base64
 import hashlib
 import hmac
@@ -15,6 +14,8 @@ from typing import Any, Callable, Protocol, TypeAlias
 
 import httpx
 
+from .codec import get_default_json_codec
+
 _logger = logging.getLogger(__name__)
 
 
@@ -155,20 +156,47 @@ class StrEnum(str, enum.Enum):
         return f"{self.__class__.__name__}.{self.name}"
 
 
+def _make_from_dict(cls: type) -> Callable[[dict, dict], Any]:
+    """
+    Generate the constructor of a :class:`FromDict` subclass, that picks the fields of the class out of the dict (and
+    the kwargs, which take precedence).
+
+    - The field names are only known once the dataclass decorator ran, so this is called on the first ``from_dict``
+      of each class (and not in ``__init_subclass__``).
+    - The generated code checks each field with a constant key lookup, instead of matching every key of the dict
+      against all the fields.
+    """
+    lines = [
+        "def from_dict(data, kwargs):",
+        "    if kwargs:",
+        "        data = data | kwargs",
+        "    kw = {}",
+        *(
+            f"    if {f.name!r} in data:\n        kw[{f.name!r}] = data[{f.name!r}]"
+            for f in dataclasses.fields(cls)
+            if f.init
+        ),
+        "    return cls(**kw)",
+    ]
+    namespace = {"cls": cls}
+    exec("\n".join(lines), namespace)
+    return namespace["from_dict"]
+
+
+_from_dict_constructors: dict[type, Callable[[dict, dict], Any]] = {}
+
+
 @dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
 class FromDict:
     """Allows to ignore extra fields when creating a dataclass from a dict."""
 
-    # noinspection PyArgumentList
     @classmethod
     def from_dict(cls, data: dict, **kwargs):
-        return cls(
-            **{
-                k: v
-                for k, v in (data | kwargs).items()
-                if k in (f.name for f in dataclasses.fields(cls))
-            }
-        )
+        try:
+            constructor = _from_dict_constructors[cls]
+        except KeyError:
+            constructor = _from_dict_constructors[cls] = _make_from_dict(cls)
+        return constructor(data, kwargs)
 
 
 FlowRequestDecryptor: TypeAlias = Callable[
@@ -252,7 +280,7 @@ def default_flow_request_decryptor(
     decrypted_data_bytes = (
         decryptor.update(encrypted_flow_data_body) + decryptor.finalize()
     )
-    decrypted_data = json.loads(decrypted_data_bytes.decode("utf-8"))
+    decrypted_data = get_default_json_codec().loads(decrypted_data_bytes)
     return decrypted_data, aes_key, iv
 
 
@@ -307,7 +335,7 @@ def default_flow_response_encryptor(response: dict, aes_key: bytes, iv: bytes) -
 
     encryptor = Cipher(algorithms.AES(aes_key), modes.GCM(flipped_iv)).encryptor()
     return base64.b64encode(
-        encryptor.update(json.dumps(response).encode("utf-8"))
+        encryptor.update(get_default_json_codec().dumps(response))
         + encryptor.finalize()
         + encryptor.tag
     ).decode("utf-8")
@@ -451,3 +479,10 @@ def is_async_callable(obj: Any) -> bool:
     return asyncio.iscoroutinefunction(obj) or (
         callable(obj) and asyncio.iscoroutinefunction(obj.__call__)
     )
+
+
+def sha256_matches(digest: bytes, expected: str) -> bool:
+    """Check if a sha256 digest matches the expected hash (hex, as in ``get_media_url``, or base64, as in the webhook)."""
+    return hmac.compare_digest(digest.hex(), expected.lower()) or hmac.compare_digest(
+        base64.b64encode(digest).decode(), expected
+    )
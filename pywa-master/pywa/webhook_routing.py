@@ -0,0 +1,90 @@
+"""
+This module contains the routing pre-scan of the webhook deliveries, used when the client is created with
+``skip_unhandled_deliveries=True`` (requires `msgspec <https://jcristharif.com/msgspec/>`_: ``pip3 install msgspec``).
+
+The structs are not passed to the handlers: they only declare what is needed to tell whether a handler or a listener
+wants a delivery (the field, the recipient phone id, the sender and the message type), and msgspec skips the rest of the
+payload without allocating it. Unhandled deliveries are acknowledged without building any dict, while the handled ones
+are then decoded into dicts and constructed as usual (so they are parsed twice).
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "Delivery",
+    "Entry",
+    "Change",
+    "Value",
+    "Metadata",
+    "Message",
+    "Status",
+    "Interactive",
+    "decode_delivery",
+]
+
+import msgspec
+
+
+class _Struct(msgspec.Struct, kw_only=True, frozen=True, gc=False):
+    """Base class of the structs (unknown fields are ignored, so new fields added by Meta don't break decoding)."""
+
+
+class Metadata(_Struct):
+    phone_number_id: str
+
+
+class Interactive(_Struct):
+    type: str
+
+
+class Message(_Struct):
+    from_: str = msgspec.field(name="from")
+    type: str
+    interactive: Interactive | None = None  # missing when the message has errors
+
+
+class Status(_Struct):
+    recipient_id: str
+
+
+class Value(_Struct):
+    """The value of a change (only the ``messages`` field has metadata, messages and statuses)."""
+
+    metadata: Metadata | None = None
+    messages: tuple[Message, ...] = ()
+    statuses: tuple[Status, ...] = ()
+
+
+class Change(_Struct):
+    field: str
+    value: Value
+
+
+class Entry(_Struct):
+    changes: tuple[Change, ...]
+
+
+class Delivery(_Struct):
+    entry: tuple[Entry, ...]
+
+
+_decoder = msgspec.json.Decoder(Delivery)
+
+
+def decode_delivery(data: bytes | str) -> Delivery:
+    """
+    Pre-scan the routing fields of a webhook delivery.
+
+    Args:
+        data: The raw body of the delivery.
+
+    Returns:
+        The routing fields of the delivery.
+
+    Raises:
+        ValueError: If the data is not valid JSON or does not match the schema.
+    """
+    try:
+        return _decoder.decode(data)
+    except msgspec.DecodeError as e:  # includes msgspec.ValidationError
+        raise ValueError(str(e)) from e
@@ -2,11 +2,18 @@
 
 from pywa.api import *  # noqa MUST BE IMPORTED FIRST
 
-from typing import Any, TYPE_CHECKING
+import functools
+from typing import Any, Callable, TYPE_CHECKING
 
 import httpx
 
+from pywa.api import decode_response, encode_json
 from .errors import WhatsAppError
+from .ratelimit import get_request_key
+
+if TYPE_CHECKING:
+    from .codec import JsonCodec
+    from .ratelimit import OutboundScheduler
 
 
 class WhatsAppCloudApiAsync(WhatsAppCloudApi):
@@ -19,11 +26,15 @@ class WhatsAppCloudApiAsync(WhatsAppCloudApi):
         token: str,
         session: httpx.AsyncClient,
         api_version: float,
+        scheduler: "OutboundScheduler | None" = None,
+        json_codec: "JsonCodec | None" = None,
     ):
         super().__init__(
             token=token,
             session=session,  # noqa
             api_version=api_version,
+            scheduler=scheduler,
+            json_codec=json_codec,
         )
 
     def __str__(self):
@@ -44,10 +55,26 @@ class WhatsAppCloudApiAsync(WhatsAppCloudApi):
         Raises:
             WhatsAppError: If the request failed.
         """
-        res = await self._session.request(method=method, url=endpoint, **kwargs)
-        if res.status_code >= 400:
-            raise WhatsAppError.from_dict(error=res.json()["error"], response=res)
-        return res.json()
+        if self._scheduler is None:
+            return await self._send_request(method=method, endpoint=endpoint, **kwargs)
+        phone_id, recipient, priority = get_request_key(
+            method=method, endpoint=endpoint, payload=kwargs.get("json")
+        )
+        return await self._scheduler.run(
+            functools.partial(
+                self._send_request, method=method, endpoint=endpoint, **kwargs
+            ),
+            phone_id=phone_id,
+            recipient=recipient,
+            priority=priority,
+        )
+
+    async def _send_request(self, method: str, endpoint: str, **kwargs) -> dict | list:
+        """Send the request right away (see :meth:`_make_request`)."""
+        res = await self._session.request(
+            method=method, url=endpoint, **encode_json(self._json_codec, kwargs)
+        )
+        return decode_response(self._json_codec, res)
 
     async def get_app_access_token(
         self, app_id: int, app_secret: str
@@ -390,6 +417,33 @@ class WhatsAppCloudApiAsync(WhatsAppCloudApi):
         res.raise_for_status()
         return res.content, res.headers.get("Content-Type")
 
+    async def stream_media(
+        self,
+        media_url: str,
+        write: Callable[[bytes], Any],
+        chunk_size: int,
+        **kwargs,
+    ) -> str | None:
+        """
+        Stream the bytes of a media file from WhatsApp servers, one chunk at a time, without buffering the whole file.
+
+        - Read more at `developers.facebook.com <https://developers.facebook.com/docs/whatsapp/cloud-api/reference/media#download-media>`_.
+
+        Args:
+            media_url: The URL of the media file (from ``get_media_url``).
+            write: A function to call with every chunk (e.g. ``file.write``).
+            chunk_size: The maximum size of each chunk (in bytes).
+            **kwargs: Additional arguments to pass to the request.
+
+        Returns:
+            The MIME type (if available).
+        """
+        async with self._session.stream("GET", media_url, **kwargs) as res:
+            res.raise_for_status()
+            async for chunk in res.aiter_bytes(chunk_size):
+                write(chunk)
+            return res.headers.get("Content-Type")
+
     async def delete_media(self, media_id: str) -> dict[str, bool]:
         """
         Delete a media file from WhatsApp servers.
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pywa.broadcast import *  # noqa MUST BE IMPORTED FIRST
+from pywa.broadcast import Broadcast as _Broadcast
+
+import asyncio
+import functools
+import itertools
+from typing import TYPE_CHECKING, AsyncIterator
+
+from .ratelimit import OutboundScheduler, Priority
+
+if TYPE_CHECKING:
+    from .types import Template
+
+
+class Broadcast(_Broadcast):
+    """
+    Send a template to many recipients, concurrently and under the rate limits.
+
+    - Returned by :meth:`~pywa_async.client.WhatsApp.broadcast_template`. Nothing is sent until you iterate over it
+      with ``async for``.
+    - Same as :class:`pywa.broadcast.Broadcast`, but the sends run as tasks in the event loop (up to ``workers`` at
+      once) instead of in a thread pool.
+
+    Attributes:
+        sent: The number of templates sent.
+        failed: The number of sends that failed.
+        skipped: The number of recipients skipped because the checkpoint shows they were already sent.
+    """
+
+    _scheduler_cls = OutboundScheduler
+    __iter__ = None  # use `async for`
+
+    async def _send(self, index: int, to: str, template: Template) -> BroadcastResult:
+        send = functools.partial(
+            self._wa.send_template,
+            to=to,
+            template=template,
+            tracker=self._tracker,
+            sender=self._sender,
+        )
+        try:
+            if self._scheduler is None:
+                sent = await send()
+            else:
+                sent = await self._scheduler.run(
+                    send, phone_id=self._sender, recipient=to, priority=Priority.BULK
+                )
+        except Exception as e:
+            return BroadcastResult(index=index, to=to, error=e)
+        return BroadcastResult(index=index, to=to, sent=sent)
+
+    async def __aiter__(self) -> AsyncIterator[BroadcastResult]:
+        self._start()
+        messages = self._messages()
+        pending = set[asyncio.Task[BroadcastResult]]()
+        with self._open_checkpoint() as checkpoint:
+            try:
+                for message in itertools.islice(messages, self._workers):
+                    pending.add(asyncio.create_task(self._send(*message)))
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for message in itertools.islice(messages, len(done)):
+                        pending.add(asyncio.create_task(self._send(*message)))
+                    results = [task.result() for task in done]
+                    for result in results:
+                        self._record(checkpoint, result)
+                    for result in results:
+                        yield result
+            finally:
+                # stopped early: the sends in progress are completed and recorded
+                if pending:
+                    done, _ = await asyncio.wait(pending)
+                    for task in done:
+                        if not task.cancelled():
+                            self._record(checkpoint, task.result())
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from pywa.cache import *  # noqa MUST BE IMPORTED FIRST
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+_T = TypeVar("_T")
+
+
+class TTLCache(Generic[_T]):
+    """
+    A cache whose entries expire after ``ttl`` seconds, with single-flight lookups.
+
+    - Used internally by the async :class:`WhatsApp` client to cache :meth:`~pywa_async.client.WhatsApp.get_media_url`.
+    - Concurrent lookups of a missing key share one call to ``fetch``; the others await its result (or error).
+    - Errors are not cached.
+
+    Args:
+        ttl: How long (in seconds) to keep each entry (``0`` to disable the cache, lookups are still coalesced).
+    """
+
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._entries: dict[
+            Hashable, tuple[float, _T]
+        ] = {}  # key -> (expires at, value)
+        self._in_flight: dict[Hashable, asyncio.Future[_T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[_T]]) -> _T:
+        """
+        Get the cached value of the key, or fetch it.
+
+        Args:
+            key: The key.
+            fetch: The coroutine function to call to get the value when it is not cached.
+
+        Returns:
+            The value.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                return entry[1]
+            del self._entries[key]
+        if (future := self._in_flight.get(key)) is not None:
+            # shielded, so a cancelled waiter doesn't cancel the lookup of the others
+            return await asyncio.shield(future)
+        future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fetch()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark as retrieved, in case nobody else is waiting
+            raise
+        finally:
+            del self._in_flight[key]
+        if self._ttl > 0:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._purge(now)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove the key from the cache (e.g. when the cached value turned out to be stale)."""
+        self._entries.pop(key, None)
+
+    _purge = TTLCache._purge
@@ -9,11 +9,13 @@ __all__ = ["WhatsApp"]
 import dataclasses
 import datetime
 import hashlib
+import io
 import json
 import logging
 import mimetypes
 import os
 import pathlib
+import tempfile
 import warnings
 from types import ModuleType
 from typing import BinaryIO, Iterable, Literal
@@ -23,11 +25,22 @@ import httpx
 from pywa.client import (
     WhatsApp as _WhatsApp,
     _DEFAULT_VERIFY_DELAY_SEC,
+    _DEFAULT_MAX_QUEUED_UPDATES,
+    _DEFAULT_MAX_QUEUED_UPDATES_PER_USER,
+    _DEFAULT_MAX_LISTENERS,
+    _MEDIA_CHUNK_SIZE,
+    _DEFAULT_MEDIA_URL_TTL_SEC,
+    _DEFAULT_BROADCAST_WORKERS,
 )  # noqa MUST BE IMPORTED FIRST
 from pywa_async import _helpers as helpers
 from . import utils
 from .api import WhatsAppCloudApiAsync
+from .broadcast import Broadcast
+from .cache import TTLCache
 from .listeners import _AsyncListeners
+from .codec import JsonCodec
+from .dedup import DedupBackend
+from .ratelimit import OutboundScheduler
 from .server import Server
 from .types import (
     BusinessProfile,
@@ -74,6 +87,7 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
     _api_cls = WhatsAppCloudApiAsync
     _flow_req_cls = FlowRequest
     _httpx_client = httpx.AsyncClient
+    _media_url_cache_cls = TTLCache
     _async_allowed = True
     api: WhatsAppCloudApiAsync  # IDE type hinting
 
@@ -83,6 +97,9 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
         token: str = None,
         *,
         session: httpx.AsyncClient | None = None,
+        media_url_ttl: float = _DEFAULT_MEDIA_URL_TTL_SEC,
+        outbound_scheduler: OutboundScheduler | None = None,
+        json_codec: JsonCodec | None = None,
         server: Flask | FastAPI | None = utils.MISSING,
         webhook_endpoint: str = "/",
         verify_token: str | None = None,
@@ -90,6 +107,12 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
         continue_handling: bool = False,
         skip_duplicate_updates: bool = True,
         validate_updates: bool = True,
+        skip_unhandled_deliveries: bool = False,
+        background_workers: int | None = None,
+        max_queued_updates: int = _DEFAULT_MAX_QUEUED_UPDATES,
+        max_queued_updates_per_user: int = _DEFAULT_MAX_QUEUED_UPDATES_PER_USER,
+        max_listeners: int = _DEFAULT_MAX_LISTENERS,
+        dedup_backend: DedupBackend | None = None,
         business_account_id: str | int | None = None,
         callback_url: str | None = None,
         callback_url_scope: utils.CallbackURLScope = utils.CallbackURLScope.APP,
@@ -147,6 +170,14 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
             api_version: The API version of the WhatsApp Cloud API (default to the latest version).
             session: The session to use for api requests (default: new ``httpx.AsyncClient``, For cases where you want to
              use a custom session, e.g. for proxy support. Do not use the same session across multiple WhatsApp clients!).
+            media_url_ttl: How long (in seconds) to cache the results of :meth:`get_media_url` (default: ``270``, a bit less
+             than the 5 minutes the URLs are valid for, ``0`` to disable). Concurrent lookups of the same media are
+             coalesced, and a cached URL that the CDN rejects (``401``/``404``) is looked up again when downloading.
+            outbound_scheduler: Send the API requests through a :class:`pywa_async.ratelimit.OutboundScheduler` (default: ``None``, send
+             them right away). It keeps the messages under the throughput and pair rate limits, sends replies before
+             templates and retries the requests that were throttled.
+            json_codec: The JSON codec to decode the webhook updates and the API responses and to encode the API requests
+             with (default: ``orjson`` or ``msgspec`` if installed, the standard library otherwise. See :mod:`pywa.codec`).
             server: The Flask or FastAPI app instance to use for the webhook. required when you want to handle incoming
              updates. pass `None` to insert the updates with the :meth:`webhook_update_handler`.
             callback_url: The server URL to register (without endpoint. optional).
@@ -175,8 +206,28 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
             flows_request_decryptor: The global flows requests decryptor implementation to use to decrypt Flows requests.
             flows_response_encryptor: The global flows response encryptor implementation to use to encrypt Flows responses.
             continue_handling: Whether to continue handling updates after a handler or listener has been found (default: ``False``).
-            skip_duplicate_updates: Whether to skip duplicate updates (default: ``True``).
+            skip_duplicate_updates: Whether to skip duplicate updates (default: ``True``). Updates are identified by their
+             message/status id, so redeliveries of updates that were already handled are skipped too.
             validate_updates: Whether to validate updates payloads (default: ``True``, ``app_secret`` required).
+            skip_unhandled_deliveries: Whether to acknowledge deliveries that no handler or listener wants (e.g. statuses
+             without a status handler) without decoding them into dicts (default: ``False``, ``msgspec`` required). Each
+             delivery is first pre-scanned for its routing fields only (see :mod:`pywa.webhook_routing`), so the
+             deliveries that are handled cost a few microseconds more; enable it only when most deliveries are unhandled.
+            background_workers: The number of tasks to handle updates with in the background (default: ``None``, handle
+             each update before acknowledging it). When set, updates are validated, queued and acknowledged immediately,
+             so slow handlers do not cause WhatsApp to retry the delivery. Call :meth:`shutdown` to drain the queue.
+            max_queued_updates: The maximum number of updates waiting to be handled in the background (default: ``1000``,
+             ``0`` for no limit). When the queue is full, the webhook waits a few seconds for a free slot and then responds
+             with ``503`` so WhatsApp will retry the delivery later.
+            max_queued_updates_per_user: The maximum number of updates from the same user waiting to be handled in the
+             background (default: ``100``, ``0`` for no limit). The updates of each user are handled in the order they
+             were received, while the updates of different users are handled concurrently.
+            max_listeners: The maximum number of pending listeners (default: ``10,000``, ``0`` for no limit). Listening to
+             more users raises :class:`~pywa.listeners.TooManyListeners`. See :meth:`add_listener` to listen without
+             blocking a thread.
+            dedup_backend: Where to remember the handled updates when ``skip_duplicate_updates`` is set (default: in memory,
+             for 24 hours, up to 100,000 updates). Use :class:`pywa.dedup.SQLiteDedupBackend` or implement
+             :class:`pywa.dedup.DedupBackend` to share it between several processes.
             handlers_modules: Modules to load handlers from.
         """
         super().__init__(
@@ -184,6 +235,9 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
             token=token,
             api_version=api_version,
             session=session,
+            media_url_ttl=media_url_ttl,
+            outbound_scheduler=outbound_scheduler,
+            json_codec=json_codec,
             server=server,
             webhook_endpoint=webhook_endpoint,
             verify_token=verify_token,
@@ -202,6 +256,12 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
             continue_handling=continue_handling,
             skip_duplicate_updates=skip_duplicate_updates,
             validate_updates=validate_updates,
+            skip_unhandled_deliveries=skip_unhandled_deliveries,
+            background_workers=background_workers,
+            max_queued_updates=max_queued_updates,
+            max_queued_updates_per_user=max_queued_updates_per_user,
+            max_listeners=max_listeners,
+            dedup_backend=dedup_backend,
             handlers_modules=handlers_modules,
         )
 
@@ -1303,6 +1363,7 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
         """
         Get the URL of a media.
             - The URL is valid for 5 minutes.
+            - The result is cached for ``media_url_ttl`` seconds (see :class:`WhatsApp`).
             - The media can be downloaded directly from the message using the :py:func:`~pywa.types.Message.download_media` method.
 
         Example:
@@ -1316,15 +1377,19 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
         Returns:
             A MediaResponse object with the media URL.
         """
-        res = await self.api.get_media_url(media_id=media_id)
-        return MediaUrlResponse(
-            _client=self,
-            id=res["id"],
-            url=res["url"],
-            mime_type=res["mime_type"],
-            sha256=res["sha256"],
-            file_size=res["file_size"],
-        )
+
+        async def fetch() -> MediaUrlResponse:
+            res = await self.api.get_media_url(media_id=media_id)
+            return MediaUrlResponse(
+                _client=self,
+                id=res["id"],
+                url=res["url"],
+                mime_type=res["mime_type"],
+                sha256=res["sha256"],
+                file_size=res["file_size"],
+            )
+
+        return await self._media_urls.get(media_id, fetch)
 
     async def download_media(
         self,
@@ -1332,11 +1397,16 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
         path: str | None = None,
         filename: str | None = None,
         in_memory: bool = False,
+        sha256: str | None = None,
+        chunk_size: int = _MEDIA_CHUNK_SIZE,
         **kwargs,
     ) -> str | bytes:
         """
         Download a media file from WhatsApp servers.
 
+        - The file is streamed to disk in chunks (up to ``chunk_size`` bytes in memory), and moved to its final path only
+          after it was fully downloaded (and verified).
+
         Example:
 
             >>> wa = WhatsApp(...)
@@ -1351,25 +1421,90 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
             path: The path where to save the file (if not provided, the current working directory will be used).
             filename: The name of the file (if not provided, it will be guessed from the URL + extension).
             in_memory: Whether to return the file as bytes instead of saving it to disk (default: False).
-            **kwargs: Additional arguments to pass to :py:func:`httpx.get`.
+            sha256: The expected SHA256 hash of the file (hex or base64, e.g. from
+             :py:func:`~pywa.client.WhatsApp.get_media_url`). Optional.
+            chunk_size: The maximum size (in bytes) of each chunk read from the network (default: 64 KiB).
+            **kwargs: Additional arguments to pass to :py:func:`httpx.stream`.
 
         Returns:
             The path of the saved file if ``in_memory`` is False, the file as bytes otherwise.
+
+        Raises:
+            ValueError: If the hash of the downloaded file does not match ``sha256``.
         """
-        content, mimetype = await self.api.get_media_bytes(media_url=url, **kwargs)
         if in_memory:
-            return content
+            buffer = io.BytesIO()
+            await self.stream_media(
+                url=url, file=buffer, sha256=sha256, chunk_size=chunk_size, **kwargs
+            )
+            return buffer.getvalue()
         if path is None:
             path = os.getcwd()
-        if filename is None:
-            filename = hashlib.sha256(url.encode()).hexdigest() + (
-                mimetypes.guess_extension(mimetype) or ".bin"
-            )
-        path = os.path.join(path, filename)
-        with open(path, "wb") as f:
-            f.write(content)
+        fd, tmp_path = tempfile.mkstemp(dir=path, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                mimetype = await self.stream_media(
+                    url=url, file=f, sha256=sha256, chunk_size=chunk_size, **kwargs
+                )
+            if filename is None:
+                filename = hashlib.sha256(url.encode()).hexdigest() + (
+                    mimetypes.guess_extension(mimetype or "") or ".bin"
+                )
+            path = os.path.join(path, filename)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
         return path
 
+    async def stream_media(
+        self,
+        url: str,
+        file: BinaryIO,
+        sha256: str | None = None,
+        chunk_size: int = _MEDIA_CHUNK_SIZE,
+        **kwargs,
+    ) -> str | None:
+        """
+        Download a media file from WhatsApp servers into a writable file object, one chunk at a time.
+
+        - Only one chunk (up to ``chunk_size`` bytes) is held in memory, regardless of the size of the file.
+        - The hash is computed incrementally, so verifying it does not need another pass over the file.
+        - The chunks are written before the hash is verified; on failure, discard what was written.
+
+        Example:
+
+            >>> wa = WhatsApp(...)
+            >>> media = wa.get_media_url(media_id='wamid.XXX=')
+            >>> with open('video.mp4', 'wb') as f:
+            ...     wa.stream_media(url=media.url, file=f, sha256=media.sha256)
+
+        Args:
+            url: The URL of the media file (from :py:func:`~pywa.client.WhatsApp.get_media_url`).
+            file: A writable binary file object (e.g. an open file, a socket file or a ``BytesIO``).
+            sha256: The expected SHA256 hash of the file (hex or base64). Optional.
+            chunk_size: The maximum size (in bytes) of each chunk read from the network (default: 64 KiB).
+            **kwargs: Additional arguments to pass to :py:func:`httpx.stream`.
+
+        Returns:
+            The MIME type of the file (if available).
+
+        Raises:
+            ValueError: If the hash of the downloaded file does not match ``sha256``.
+        """
+        hasher = hashlib.sha256()
+
+        def write(chunk: bytes) -> None:
+            hasher.update(chunk)
+            file.write(chunk)
+
+        mimetype = await self.api.stream_media(
+            media_url=url, write=write, chunk_size=chunk_size, **kwargs
+        )
+        if sha256 is not None and not utils.sha256_matches(hasher.digest(), sha256):
+            raise ValueError("Media file hash verification failed")
+        return mimetype
+
     async def get_business_phone_number(
         self,
         phone_id: str | int | None = None,
@@ -1822,6 +1957,69 @@ class WhatsApp(Server, _AsyncListeners, _WhatsApp):
             from_phone_id=sender,
         )
 
+    def broadcast_template(
+        self,
+        recipients: Iterable[str | int | tuple[str | int, Template]],
+        template: Template | None = None,
+        *,
+        tracker: str | CallbackData | None = None,
+        sender: str | int | None = None,
+        workers: int = _DEFAULT_BROADCAST_WORKERS,
+        checkpoint: str | os.PathLike | None = None,
+    ) -> Broadcast:
+        """
+        Send a template to many WhatsApp users (e.g. a marketing campaign).
+
+        - The sends start when you iterate over the returned :class:`~pywa_async.broadcast.Broadcast` (with ``async for``), which
+          yields a :class:`~pywa.broadcast.BroadcastResult` for every recipient as soon as its send completes.
+        - The recipients are read lazily, so they can be a generator over a large table.
+        - Up to ``workers`` templates are sent at once, under the rate limits of the ``outbound_scheduler`` (see
+          :class:`WhatsApp`) and after the replies that are waiting to be sent.
+        - Pass a ``checkpoint`` file to be able to resume the broadcast after a crash: run it again with the same
+          recipients and file, and the recipients that were already sent are skipped.
+
+        Example:
+
+            >>> from pywa.types import Template as Temp
+            >>> wa = WhatsApp(...)
+            >>> broadcast = wa.broadcast_template(
+            ...     recipients=(
+            ...         (buyer.phone, Temp(
+            ...             name='new_arrivals',
+            ...             language=Temp.Language.ENGLISH_US,
+            ...             body=[Temp.TextValue(value=buyer.name)],
+            ...         ))
+            ...         for buyer in get_buyers()
+            ...     ),
+            ...     checkpoint='new_arrivals.jsonl',
+            ... )
+            >>> async for result in broadcast:
+            ...     if not result.ok:
+            ...         print(f'Failed to send to {result.to}: {result.error}')
+
+        Args:
+            recipients: The phone IDs of the WhatsApp users, or ``(phone ID, template)`` pairs to send each user its own
+             template parameters.
+            template: The template to send to the recipients that are not paired with a template.
+            tracker: The data to track the messages with (optional, up to 512 characters, for complex data You can use
+             :class:`CallbackData`).
+            sender: The phone ID to send the messages from (optional, overrides the client's phone ID).
+            workers: How many templates to send at once (default: ``8``).
+            checkpoint: A file to record the results in, as JSON lines, and to resume the broadcast from (optional).
+
+        Returns:
+            The broadcast, to iterate over the results.
+        """
+        return Broadcast(
+            wa=self,
+            recipients=recipients,
+            template=template,
+            tracker=tracker,
+            sender=helpers.resolve_phone_id_param(self, sender, "sender"),
+            workers=workers,
+            checkpoint=checkpoint,
+        )
+
     # fmt: off
     async def create_flow(
         self,
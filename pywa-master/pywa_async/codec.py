@@ -0,0 +1 @@
+from pywa.codec import *  # noqa MUST BE IMPORTED FIRST
@@ -0,0 +1 @@
+from pywa.dedup import *  # noqa MUST BE IMPORTED FIRST
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from pywa.dispatcher import *  # noqa MUST BE IMPORTED FIRST
+
+import asyncio
+import collections
+import logging
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+_logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class UpdatesDispatcher(Generic[_T]):
+    """
+    Handle items (updates) on a bounded group of background tasks, in order per key and concurrently across keys.
+
+    - Used internally by the async :class:`WhatsApp` client when ``background_workers`` is set. The key of an update is
+      its ``listener_identifier`` (sender, recipient), so the updates of each user are handled one after the other.
+    - Items without a key (``None``) are handled independently of each other.
+    - A key is kept only while it has items waiting or in progress, so idle keys do not take any memory.
+    - The tasks are created on the first submitted batch, in the running event loop.
+    - When there is no room, :meth:`submit` waits up to ``enqueue_timeout`` seconds (backpressure) and then gives up.
+
+    Args:
+        handler: The coroutine function to call with every submitted item.
+        workers: The number of worker tasks.
+        max_queued: The maximum number of items waiting to be handled or in progress (``0`` for no limit).
+        max_queued_per_key: The maximum number of items waiting to be handled for each key (``0`` for no limit).
+        enqueue_timeout: How long (in seconds) to wait for room when the queue is full.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[_T], Awaitable[None]],
+        workers: int,
+        max_queued: int,
+        max_queued_per_key: int,
+        enqueue_timeout: float,
+    ):
+        if workers < 1:
+            raise ValueError("The number of workers must be at least 1.")
+        self._handler = handler
+        self._workers_count = workers
+        self._max_queued = max(max_queued, 0)
+        self._max_queued_per_key = max(max_queued_per_key, 0)
+        self._enqueue_timeout = enqueue_timeout
+        self._keys: dict[Hashable, collections.deque[_T]] = {}  # active keys
+        self._ready = collections.deque[Hashable]()  # keys with items, not in progress
+        self._queued = 0
+        self._closed = False
+        self._cond: asyncio.Condition | None = None
+        self._workers: set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """The number of items waiting to be handled or in progress."""
+        return self._queued
+
+    @property
+    def active_keys(self) -> int:
+        """The number of keys with items waiting to be handled or in progress."""
+        return len(self._keys)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the dispatcher stopped accepting new items."""
+        return self._closed
+
+    _has_room = UpdatesDispatcher._has_room
+
+    def _start(self) -> asyncio.Condition:
+        self._cond = asyncio.Condition()
+        for i in range(self._workers_count):
+            self._workers.add(
+                asyncio.create_task(self._work(), name=f"pywa-worker-{i}")
+            )
+        return self._cond
+
+    async def submit(self, items: Iterable[tuple[Hashable | None, _T]]) -> bool:
+        """
+        Submit a batch of ``(key, item)`` pairs to be handled in the background, all or nothing.
+
+        Returns:
+            Whether the items were queued (``False`` if the dispatcher is closed or there was no room in time).
+        """
+        if self._closed:
+            return False
+        items = [(object() if key is None else key, item) for key, item in items]
+        cond = self._cond or self._start()
+        async with cond:
+            try:
+                await asyncio.wait_for(
+                    cond.wait_for(lambda: self._closed or self._has_room(items)),
+                    timeout=self._enqueue_timeout,
+                )
+            except asyncio.TimeoutError:
+                return False
+            if self._closed:
+                return False
+            for key, item in items:
+                if (queue := self._keys.get(key)) is None:
+                    queue = self._keys[key] = collections.deque()
+                    self._ready.append(key)
+                queue.append(item)
+            self._queued += len(items)
+            cond.notify_all()
+        return True
+
+    async def _work(self) -> None:
+        cond = self._cond
+        while True:
+            async with cond:
+                await cond.wait_for(lambda: self._ready or self._closed)
+                if not self._ready:
+                    return  # closed and drained (keys in progress are continued by their workers)
+                key = self._ready.popleft()
+                item = self._keys[key].popleft()
+            try:
+                await self._handler(item)
+            except Exception:
+                _logger.exception(
+                    "An error occurred while handling an update in the background"
+                )
+            finally:
+                async with cond:
+                    self._queued -= 1
+                    if self._keys[key]:
+                        self._ready.append(key)  # behind the other keys, for fairness
+                    else:
+                        del self._keys[key]
+                    cond.notify_all()
+
+    async def shutdown(self, timeout: float | None = None) -> bool:
+        """
+        Stop accepting new items and wait for the queued items to be handled.
+
+        Args:
+            timeout: The maximum time (in seconds) to wait for the queued items (``None`` to wait until they are done).
+
+        Returns:
+            Whether all the queued items were handled in time.
+        """
+        self._closed = True
+        if self._cond is None:
+            return True
+        async with self._cond:
+            self._cond.notify_all()
+        done, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for worker in pending:
+            worker.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._workers.clear()
+        return not pending
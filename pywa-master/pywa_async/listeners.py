@@ -4,10 +4,12 @@ from pywa.listeners import *  # noqa MUST BE IMPORTED FIRST
 from pywa.listeners import Listener as _Listener, ListenerCanceled as _ListenerCanceled  # noqa MUST BE IMPORTED FIRST
 
 import asyncio
-from typing import TYPE_CHECKING, TypeAlias
+import functools
+from typing import TYPE_CHECKING, Any, Callable, TypeAlias
 
 from pywa import utils, _helpers as helpers
 from .filters import Filter
+from pywa.filters import _check_async
 from .types import (
     Message,
     CallbackButton,
@@ -49,27 +51,53 @@ class Listener(_Listener):
     ):
         self.filters = filters
         self.cancelers = cancelers
+        self.result: _SuppoertedUserUpdate | None = None
+        self.exception: Exception | None = None
+        self._timer = None  # the timeout is scheduled on the event loop
         self.future: asyncio.Future[_SuppoertedUserUpdate] = asyncio.Future()
         self.future.add_done_callback(
-            lambda _: wa._remove_listener(from_user=to, phone_id=sent_to_phone_id)
+            functools.partial(
+                self._on_done,
+                wa,
+                utils.listener_identifier(sender=to, recipient=sent_to_phone_id),
+            )
         )
 
+    def _on_done(
+        self,
+        wa: WhatsApp,
+        identifier: tuple[str, str],
+        future: asyncio.Future[_SuppoertedUserUpdate],
+    ) -> None:
+        if not future.cancelled():
+            if (exception := future.exception()) is not None:
+                self.exception = exception
+            else:
+                self.result = future.result()
+        wa._discard_listener(identifier, self)
+
     def set_result(self, result: _SuppoertedUserUpdate) -> None:
-        self.future.set_result(result)
+        if not self.future.done():
+            self.future.set_result(result)
 
     def set_exception(self, exception: Exception) -> None:
-        self.future.set_exception(exception)
+        if not self.future.done():
+            self.future.set_exception(exception)
 
     def is_set(self) -> bool:
         return self.future.done()
 
+    def add_done_callback(self, fn: Callable[[Listener], Any]) -> None:
+        """Call ``fn(listener)`` (soon) when the listener is resolved."""
+        self.future.add_done_callback(lambda _: fn(self))
+
     async def apply_filters(self, wa: WhatsApp, update: _SuppoertedUserUpdate) -> bool:
-        return self.filters is None or await self.filters.check_async(wa, update)
+        return self.filters is None or await _check_async(self.filters, wa, update)
 
     async def apply_cancelers(
         self, wa: WhatsApp, update: _SuppoertedUserUpdate
     ) -> bool:
-        return self.cancelers and await self.cancelers.check_async(wa, update)
+        return self.cancelers and await _check_async(self.cancelers, wa, update)
 
 
 class _AsyncListeners:
@@ -130,9 +158,56 @@ class _AsyncListeners:
             ListenerCanceled: If the listener was canceled by a filter
             ListenerStopped: If the listener was stopped manually
         """
+        listener = self.add_listener(
+            to=to,
+            filters=filters,
+            cancelers=cancelers,
+            timeout=timeout,
+            sent_to_phone_id=sent_to_phone_id,
+        )
+        return await listener.future
+
+    def add_listener(
+        self: WhatsApp,
+        to: str | int,
+        filters: Filter = None,
+        cancelers: Filter = None,
+        timeout: int | None = None,
+        sent_to_phone_id: str | int | None = None,
+        callback: Callable[[Listener], Any] | None = None,
+    ) -> Listener:
+        """
+        Listen to a user update without waiting for it: the listener is resolved later, by the update or by its timeout.
+
+        - Await ``listener.future`` to get the update (this is what :meth:`listen` does), or pass a ``callback`` (the
+          continuation) to be called with the resolved listener.
+        - Up to ``max_listeners`` listeners can be pending (see :class:`WhatsApp`). The timeouts are scheduled on the
+          event loop.
+
+        Args:
+            to: The user to listen to
+            filters: The filters to apply to the update, resolve the listener with the update if the filters pass
+            cancelers: The filters to cancel the listening, resolve the listener with ListenerCanceled if the update matches
+            timeout: The time to wait for the update, resolve the listener with ListenerTimeout if the time passes
+            sent_to_phone_id: The phone id to listen for
+            callback: A function to call with the listener when it is resolved (optional)
+
+        Returns:
+            The pending listener
+
+        Raises:
+            TooManyListeners: If there are already ``max_listeners`` pending listeners
+        """
         recipient = helpers.resolve_phone_id_param(
             self, sent_to_phone_id, "sent_to_phone_id"
         )
+        identifier = utils.listener_identifier(sender=to, recipient=recipient)
+        if (
+            self._max_listeners
+            and len(self._listeners) >= self._max_listeners
+            and identifier not in self._listeners
+        ):
+            raise TooManyListeners(self._max_listeners)
         listener = Listener(
             wa=self,
             to=to,
@@ -140,10 +215,11 @@ class _AsyncListeners:
             filters=filters,
             cancelers=cancelers,
         )
-        self._listeners[utils.listener_identifier(sender=to, recipient=recipient)] = (
-            listener
-        )
-        try:
-            return await asyncio.wait_for(listener.future, timeout=timeout)
-        except asyncio.TimeoutError:
-            raise ListenerTimeout(timeout)
+        if callback is not None:
+            listener.add_done_callback(callback)
+        if timeout is not None:
+            listener._timeout = timeout
+            timer = asyncio.get_running_loop().call_later(timeout, listener._time_out)
+            listener.future.add_done_callback(lambda _: timer.cancel())
+        self._listeners[identifier] = listener
+        return listener
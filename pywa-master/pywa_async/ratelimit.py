@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from pywa.ratelimit import *  # noqa MUST BE IMPORTED FIRST
+from pywa.ratelimit import (
+    OutboundScheduler as _OutboundScheduler,
+    _RETRY_ON,
+    get_request_key,  # noqa: F401
+)
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, TypeVar
+
+_T = TypeVar("_T")
+
+
+class OutboundScheduler(_OutboundScheduler):
+    """
+    Schedule the outgoing API requests of the async :class:`WhatsApp` client under the WhatsApp Cloud API rate limits.
+
+    - Same as :class:`pywa.ratelimit.OutboundScheduler`, but the requests wait in the event loop instead of blocking
+      a thread. Share it only between clients running in the same event loop.
+
+    Example:
+
+        >>> from pywa_async import WhatsApp
+        >>> from pywa_async.ratelimit import OutboundScheduler
+        >>> wa = WhatsApp(..., outbound_scheduler=OutboundScheduler(messages_per_second=80))
+
+    Args:
+        messages_per_second: The messages each phone id may send per second (default: ``80``).
+        burst: The messages each phone id may send at once (default: ``messages_per_second``).
+        pair_messages_per_second: The messages each phone id may send per second to the same recipient (default: one
+         every 6 seconds).
+        pair_burst: The messages each phone id may send at once to the same recipient (default: ``45``).
+        max_retries: How many times to retry a throttled request (default: ``5``, ``0`` to never retry).
+        backoff: The backoff (in seconds) before the first retry, doubled for every retry (default: ``1``).
+        max_backoff: The maximum backoff (in seconds) between retries (default: ``30``).
+    """
+
+    _cond: asyncio.Condition
+
+    def __init__(
+        self,
+        messages_per_second: float = 80,
+        burst: int | None = None,
+        pair_messages_per_second: float = 1 / 6,
+        pair_burst: int = 45,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        super().__init__(
+            messages_per_second=messages_per_second,
+            burst=burst,
+            pair_messages_per_second=pair_messages_per_second,
+            pair_burst=pair_burst,
+            max_retries=max_retries,
+            backoff=backoff,
+            max_backoff=max_backoff,
+        )
+        self._cond = asyncio.Condition()
+
+    async def _wait(self, timeout: float | None) -> None:
+        try:
+            await asyncio.wait_for(self._cond.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def acquire(
+        self,
+        phone_id: str,
+        recipient: str | None = None,
+        priority: Priority = Priority.REPLY,
+    ) -> None:
+        """
+        Wait until a message can be sent from the phone id (to the recipient, if given).
+
+        Args:
+            phone_id: The phone id to send the message from.
+            recipient: The recipient of the message (``None`` to skip the pair limit).
+            priority: The priority of the message.
+        """
+        async with self._cond:
+            self._queue_depth += 1
+            try:
+                if recipient is not None:
+                    pair = self._get_bucket(
+                        self._pairs,
+                        (phone_id, recipient),
+                        self._pair_rate,
+                        self._pair_burst,
+                        time.monotonic(),
+                    )
+                    while (delay := pair.delay(time.monotonic())) > 0:
+                        await self._wait(delay)
+                    pair.take()
+                phone = self._get_bucket(
+                    self._phones, phone_id, self._rate, self._burst, time.monotonic()
+                )
+                entry = (priority, next(self._seq))
+                heapq.heappush(self._waiting.setdefault(phone_id, []), entry)
+                try:
+                    while True:
+                        if self._waiting[phone_id][0] != entry:
+                            # until the requests before it are sent
+                            await self._wait(None)
+                        elif (delay := phone.delay(time.monotonic())) > 0:
+                            await self._wait(delay)
+                        else:
+                            break
+                    phone.take()
+                finally:
+                    self._dequeue(phone_id, entry)
+                    self._cond.notify_all()
+                self._purge_pairs(time.monotonic())
+            finally:
+                self._queue_depth -= 1
+
+    async def run(
+        self,
+        func: Callable[[], Awaitable[_T]],
+        phone_id: str | None = None,
+        recipient: str | None = None,
+        priority: Priority = Priority.REPLY,
+    ) -> _T:
+        """
+        Await ``func()`` when the rate limits allow it, and await it again if it raises a throttling error.
+
+        Args:
+            func: The function that sends the request.
+            phone_id: The phone id the request is sent from (``None`` to send it right away, and only retry it).
+            recipient: The recipient of the message (``None`` to skip the pair limit).
+            priority: The priority of the message.
+
+        Returns:
+            The result of ``func``.
+        """
+        for attempt in itertools.count():
+            if phone_id is not None:
+                await self.acquire(
+                    phone_id=phone_id, recipient=recipient, priority=priority
+                )
+            try:
+                return await func()
+            except _RETRY_ON as e:
+                backoff = self._on_throttled(e, phone_id, recipient, attempt)
+                if backoff is None:
+                    raise
+                await asyncio.sleep(backoff)
@@ -1,8 +1,11 @@
 import asyncio
 import copy
 import logging
-from typing import Callable, cast, TYPE_CHECKING
+from typing import Callable, TypeVar, cast, TYPE_CHECKING
 
+from pywa.dedup import MemoryDedupBackend
+from pywa.server import _background_items, _dedup_key, _split_update
+from .dispatcher import UpdatesDispatcher
 from pywa.types.base_update import BaseUpdate, BaseUserUpdate
 from . import errors, handlers
 from . import utils
@@ -34,6 +37,8 @@ from .types import (
 
 _logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 if TYPE_CHECKING:
     from pywa_async import WhatsApp
@@ -53,6 +58,8 @@ class Server:
     }
     """A dictionary that maps handler types to their respective update constructors."""
 
+    _dispatcher_cls = UpdatesDispatcher
+
     async def webhook_challenge_handler(
         self: "WhatsApp", vt: str, ch: str
     ) -> tuple[str, int]:
@@ -66,8 +73,43 @@ class Server:
         )
         if res:
             return res, status
-        await self._call_handlers(update_dict)
-        return self._after_handling_update(update_hash)
+        if self._dispatcher is not None:
+            items = _background_items(update_dict, update_hash)
+            return self._reject_if_not_queued(
+                await self._dispatcher.submit(items), updates=len(items) - 1
+            )
+        await self._call_handlers(update_dict, update_hash)
+        return "ok", 200
+
+    async def shutdown(self, timeout: float | None = None) -> bool:
+        """
+        Stop accepting updates and wait for the updates that are handled in the background.
+
+        - Only relevant when ``background_workers`` is set (called automatically on FastAPI shutdown).
+        - Updates that arrive after the shutdown are rejected with ``503`` so WhatsApp will retry them later.
+
+        Args:
+            timeout: The maximum time (in seconds) to wait (``None`` to wait until all the updates are handled).
+
+        Returns:
+            Whether all the pending updates were handled.
+        """
+        if self._dispatcher is None:
+            return True
+        return await self._dispatcher.shutdown(timeout=timeout)
+
+    def _register_shutdown(self: "WhatsApp") -> None:
+        if self._server_type == utils.ServerType.FASTAPI:
+            self._server.router.on_shutdown.append(self.shutdown)
+
+    async def _handle_update_in_background(
+        self: "WhatsApp", item: tuple[dict, int | None, str | None]
+    ) -> None:
+        update, index, update_hash = item
+        if index is None:
+            await self._call_raw_update_handler(update, update_hash)
+        else:
+            await self._call_update_handlers(update, index, update_hash)
 
     def _register_routes(self: "WhatsApp") -> None:
         match self._server_type:
@@ -187,49 +229,115 @@ class Server:
 
         return callback_wrapper
 
-    async def _call_handlers(self: "WhatsApp", update: dict) -> None:
-        """Call the handlers for the given update."""
+    async def _call_handlers(
+        self: "WhatsApp", update: dict, update_hash: str | None = None
+    ) -> None:
+        """Split the delivery and call the handlers for each of its updates."""
         try:
-            try:
-                handler_type = self._get_handler(update)
-            except (KeyError, ValueError, TypeError, IndexError):
-                (_logger.error if self._validate_updates else _logger.debug)(
-                    "Webhook ('%s') received unexpected update%s: %s",
-                    self._webhook_endpoint,
-                    " (Enable `validate_updates` to ignore updates with invalid data)"
-                    if not self._validate_updates
-                    else "",
-                    update,
-                )
-                handler_type = None
-
-            if handler_type is None:
-                return
-            try:
-                constructed_update = self._handlers_to_update_constractor[handler_type](
-                    self, update
-                )
-                if constructed_update:
-                    if handler_type._is_user_update and await self._process_listener(
-                        cast(BaseUserUpdate, constructed_update)
-                    ):
-                        return
-                    await self._invoke_callbacks(handler_type, constructed_update)
-            except Exception:
-                _logger.exception("Failed to construct update: %s", update)
+            updates = _split_update(update)
+            self._webhook_stats.record_delivery(len(updates))
+            for i, single_update in enumerate(updates):
+                await self._call_update_handlers(single_update, i, update_hash)
         finally:
-            # Always call raw update handler last
-            await self._call_raw_update_handler(update)
+            # Always call raw update handler last (once per delivery)
+            await self._call_raw_update_handler(update, update_hash)
 
-    async def _call_raw_update_handler(self: "WhatsApp", update: dict) -> None:
-        """Invoke the raw update handler."""
-        await self._invoke_callbacks(RawUpdateHandler, update)
+    async def _call_update_handlers(
+        self: "WhatsApp",
+        update: dict,
+        index: int = 0,
+        update_hash: str | None = None,
+    ) -> None:
+        """Call the handlers for a single (already split) update, unless it was already handled."""
+        if await self._is_duplicate_update(update, index, update_hash):
+            return
+        try:
+            handler_type = self._get_handler(update)
+        except (KeyError, ValueError, TypeError, IndexError):
+            (_logger.error if self._validate_updates else _logger.debug)(
+                "Webhook ('%s') received unexpected update%s: %s",
+                self._webhook_endpoint,
+                " (Enable `validate_updates` to ignore updates with invalid data)"
+                if not self._validate_updates
+                else "",
+                update,
+            )
+            handler_type = None
+
+        if handler_type is None:
+            return
+        try:
+            constructed_update = self._handlers_to_update_constractor[handler_type](
+                self, update
+            )
+            if constructed_update:
+                if handler_type._is_user_update and await self._process_listener(
+                    cast(BaseUserUpdate, constructed_update)
+                ):
+                    return
+                if not await self._invoke_callbacks(handler_type, constructed_update):
+                    await self._forget_update(update, index, update_hash)
+        except Exception:
+            _logger.exception("Failed to construct update: %s", update)
+            await self._forget_update(update, index, update_hash)
+
+    async def _call_raw_update_handler(
+        self: "WhatsApp", update: dict, update_hash: str | None = None
+    ) -> None:
+        """Invoke the raw update handler, unless the delivery was already handled."""
+        if await self._is_duplicate_update(update, None, update_hash):
+            return
+        if not await self._invoke_callbacks(RawUpdateHandler, update):
+            await self._forget_update(update, None, update_hash)
+
+    async def _dedup_call(self, func: Callable[[str], _T], key: str) -> _T:
+        """Call the dedup backend, in a worker thread unless it is in memory (e.g. SQLite or Redis IO)."""
+        if isinstance(self._dedup_backend, MemoryDedupBackend):
+            return func(key)
+        return await asyncio.to_thread(func, key)
+
+    async def _is_duplicate_update(
+        self, update: dict, index: int | None, update_hash: str | None
+    ) -> bool:
+        """Check (and remember) whether the update (or the delivery, when ``index=None``) was already handled."""
+        if self._dedup_backend is None or (
+            (key := _dedup_key(update, index, update_hash)) is None
+        ):
+            return False
+        try:
+            duplicate = not await self._dedup_call(self._dedup_backend.add, key)
+        except Exception:
+            _logger.exception("Failed to check for a duplicate update: %s", key)
+            return False
+        if index is not None:
+            self._webhook_stats.record_dedup(duplicate)
+        if duplicate:
+            _logger.debug(
+                "Webhook ('%s') skipped a duplicate update: %s",
+                self._webhook_endpoint,
+                key,
+            )
+        return duplicate
+
+    async def _forget_update(
+        self, update: dict, index: int | None, update_hash: str | None
+    ) -> None:
+        """Forget an update that failed, so it is handled again if WhatsApp redelivers it."""
+        if self._dedup_backend is None or (
+            (key := _dedup_key(update, index, update_hash)) is None
+        ):
+            return
+        try:
+            await self._dedup_call(self._dedup_backend.discard, key)
+        except Exception:
+            _logger.exception("Failed to forget a failed update: %s", key)
 
     async def _invoke_callbacks(
         self: "WhatsApp", handler_type: type[Handler], update: BaseUpdate | dict
-    ) -> None:
-        """Process and call registered handlers for the update."""
-        for handler in self._handlers[handler_type]:
+    ) -> bool:
+        """Process and call registered handlers for the update. Returns ``False`` if a handler raised an exception."""
+        ok = True
+        for handler in self._get_handlers_index(handler_type).candidates(update):
             try:
                 handled = await handler.ahandle(self, update)
             except StopHandling:
@@ -237,13 +345,14 @@ class Server:
             except ContinueHandling:
                 continue
             except Exception:
-                handled = True
+                handled, ok = True, False
                 _logger.exception(
                     "An error occurred while '%s' was handling an update",
                     handler._callback.__name__,
                 )
             if handled and not self._continue_handling:
                 break
+        return ok
 
     async def _process_listener(self: "WhatsApp", update: BaseUserUpdate) -> bool:
         """Process and answer a listener if present."""
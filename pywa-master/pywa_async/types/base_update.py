@@ -5,6 +5,7 @@ from __future__ import annotations
 __all__ = [
     "StopHandling",
     "ContinueHandling",
+    "MalformedUpdateError",
 ]
 
 from pywa.types.base_update import *  # noqa MUST BE IMPORTED FIRST
@@ -19,11 +19,14 @@ from pywa.types.media import (
     Document as _Document,
     Audio as _Audio,
     MediaUrlResponse as _MediaUrlResponse,
+    _is_stale_media_url,
 )  # noqa MUST BE IMPORTED FIRST
 
 import dataclasses
 from typing import TYPE_CHECKING
 
+import httpx
+
 if TYPE_CHECKING:
     from ..client import WhatsApp
 
@@ -50,6 +53,7 @@ class BaseMediaAsync:
         """
         Download a media file from WhatsApp servers.
             - Same as :func:`~pywa.client.WhatsApp.download_media` with ``media_url=media.get_media_url()``
+            - The file is streamed to disk and verified against the ``sha256`` of the media.
 
         >>> await message.image.download()
 
@@ -62,13 +66,20 @@ class BaseMediaAsync:
         Returns:
             The path of the saved file if ``in_memory`` is False, the file as bytes otherwise.
         """
-        return await self._client.download_media(
-            url=await self.get_media_url(),
-            path=path,
-            filename=filename,
-            in_memory=in_memory,
-            **kwargs,
-        )
+        for retry in (False, True):
+            try:
+                return await self._client.download_media(
+                    url=await self.get_media_url(),
+                    path=path,
+                    filename=filename,
+                    in_memory=in_memory,
+                    sha256=self.sha256,
+                    **kwargs,
+                )
+            except httpx.HTTPStatusError as e:
+                if retry or not _is_stale_media_url(e):
+                    raise
+                self._client._media_urls.invalidate(self.id)
 
     @classmethod
     def from_flow_completion(
@@ -195,10 +206,19 @@ class MediaUrlResponse(_MediaUrlResponse):
         Returns:
             The path of the saved file if ``in_memory`` is False, the file as bytes otherwise.
         """
-        return await self._client.download_media(
-            url=self.url,
-            path=filepath,
-            filename=filename,
-            in_memory=in_memory,
-            **kwargs,
-        )
+        try:
+            return await self._client.download_media(
+                url=self.url,
+                path=filepath,
+                filename=filename,
+                in_memory=in_memory,
+                sha256=self.sha256,
+                **kwargs,
+            )
+        except httpx.HTTPStatusError as e:
+            if not _is_stale_media_url(e):
+                raise
+            self._client._media_urls.invalidate(self.id)
+            return await (await self._client.get_media_url(media_id=self.id)).download(
+                filepath=filepath, filename=filename, in_memory=in_memory, **kwargs
+            )
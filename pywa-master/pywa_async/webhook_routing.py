@@ -0,0 +1 @@
+from pywa.webhook_routing import *  # noqa MUST BE IMPORTED FIRST
@@ -78,10 +78,12 @@ def test_all_methods_are_overwritten_in_async():
             WhatsAppSync._check_for_async_filters,
             WhatsAppSync._flow_req_cls,
             ServerSync._check_and_prepare_update,
-            ServerSync._after_handling_update,
+            ServerSync._reject_if_not_queued,
             ServerSync._delayed_register_callback_url,
             ServerSync._register_callback_url,
             ServerSync._get_handler,
+            ServerSync._is_delivery_wanted,
+            ServerSync._get_handlers_index,
             ServerSync._register_flow_endpoint_callback,
             _HandlerDecorators.on_message,
             _HandlerDecorators.on_callback_button,
@@ -93,7 +95,9 @@ def test_all_methods_are_overwritten_in_async():
             _HandlerDecorators.on_template_status,
             _HandlerDecorators.on_raw_update,
             ListenersSync._remove_listener,
+            ListenersSync._discard_listener,
             BaseUpdate.from_update,
+            BaseUpdate._from_raw,
             BaseUpdate.stop_handling,
             BaseUpdate.continue_handling,
             BaseMediaSync.from_flow_completion,
@@ -111,6 +115,11 @@ def test_all_methods_are_overwritten_in_async():
         "_register_routes",
         "_register_flow_endpoint_callback",
         "_register_flow_callback_wrapper",
+        "_register_shutdown",
+        "broadcast_template",
+        "add_listener",
+        "_dispatcher_cls",
+        "_media_url_cache_cls",
         "_api_cls",
         "_httpx_client",
         "_flow_req_cls",
@@ -125,9 +134,9 @@ def test_all_methods_are_overwritten_in_async():
             )
             if not asyncio.iscoroutinefunction(async_method):
                 if method_name in non_async:
-                    assert sync_method != async_method, (
-                        f"Method/attr {method_name} is not overwritten in {async_obj.__name__}"
-                    )
+                    assert (
+                        sync_method != async_method
+                    ), f"Method/attr {method_name} is not overwritten in {async_obj.__name__}"
                     continue
                 raise AssertionError(
                     f"Method {method_name} is not overwritten in {async_obj.__name__}"
@@ -146,6 +155,8 @@ def test_same_signature():
             "_api_cls",
             "_httpx_client",
             "_flow_req_cls",
+            "_dispatcher_cls",
+            "_media_url_cache_cls",
         }
     )
     skip_signature_check = {
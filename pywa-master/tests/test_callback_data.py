@@ -1,4 +1,7 @@
 import dataclasses
+import enum
+import types
+from typing import Union, get_args, get_origin
 
 import pytest
 
@@ -19,9 +22,9 @@ def test_callback_class_uniqueness():
         id: str
         name: str
 
-    assert User.__callback_id__ != Group.__callback_id__, (
-        "The callback id must be unique for each child class."
-    )
+    assert (
+        User.__callback_id__ != Group.__callback_id__
+    ), "The callback id must be unique for each child class."
 
 
 def test_callback_id_override():
@@ -117,3 +120,130 @@ def test_data_sep():
         User.from_str("1*3456*David~Lev*")
     except ValueError:
         pytest.fail("The data separator override does not work.")
+
+
+class _State(str, enum.Enum):
+    ACTIVE = "a"
+    BLOCKED = "b"
+
+
+def _product_cls() -> type[CallbackData]:
+    """Created in each test, so the ids of the classes in the tests above don't change."""
+
+    @dataclasses.dataclass(slots=True, frozen=True)
+    class Product(CallbackData):
+        id: int
+        name: str
+        price: float
+        in_stock: bool
+        state: _State
+        discount: float | None = None
+        featured: bool | None = None
+
+    return Product
+
+
+def test_optional_enum_and_float_fields():
+    """Test the round trip of every supported field type."""
+    Product = _product_cls()
+    for product in (
+        Product(1, "Shirt", 9.5, True, _State.ACTIVE),
+        Product(2, "Hat", 3.0, False, _State.BLOCKED, discount=0.25, featured=False),
+    ):
+        assert Product.from_str(product.to_str()) == product
+    assert (
+        Product(1, "Shirt", 9.5, True, _State.ACTIVE).to_str().endswith("~9.5~§~a~¤~¤")
+    )
+
+    with pytest.raises(ValueError):  # not a member of the enum
+        Product.from_str(f"{Product.__callback_id__}~1~Shirt~9.5~§~x~¤~¤")
+    with pytest.raises(
+        ValueError
+    ):  # only the true value and the empty string are booleans
+        Product.from_str(f"{Product.__callback_id__}~1~Shirt~9.5~yes~a~¤~¤")
+    with pytest.raises(ValueError):  # the callback separator is reserved
+        Product(1, "Shirt¶Hat", 9.5, True, _State.ACTIVE).to_str()
+
+
+def test_single_field():
+    """Test a callback data class with a single field."""
+
+    @dataclasses.dataclass(slots=True, frozen=True)
+    class Page(CallbackData):
+        number: int
+
+    assert Page.from_str(Page(3).to_str()) == Page(3)
+
+
+def _reflective_from_str(cls, data: str) -> CallbackData:
+    """The per-call annotations walk the compiled codecs replaced (what they must be equivalent to)."""
+    try:
+        positional_args = []
+        for annotation, value in zip(
+            cls.__annotations__.values(),
+            data.split(cls.__callback_data_sep__)[1:],
+            strict=True,
+        ):
+            if get_origin(annotation) in (types.UnionType, Union):
+                if value == cls.__callback_null__:
+                    positional_args.append(None)
+                    continue
+                annotation = next(
+                    a for a in get_args(annotation) if a is not types.NoneType
+                )
+            if annotation is bool:
+                positional_args.append(value == cls.__callback_bool_true__)
+                continue
+            positional_args.append(annotation(value))
+        return cls(*positional_args)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid callback data for {cls.__name__}: {data}") from e
+
+
+def _reflective_to_str(self) -> str:
+    values = [str(self.__callback_id__)]
+    for field_name in self.__annotations__:
+        value = getattr(self, field_name)
+        if value is None:
+            value = self.__callback_null__
+        if isinstance(value, bool):
+            value = self.__callback_bool_true__ if value else ""
+        if isinstance(value, enum.Enum):
+            value = value.value
+        values.append(self._not_contains(value, self.__callback_sep__))
+    return self.__callback_data_sep__.join(values)
+
+
+def _products(Product: type[CallbackData]) -> list[CallbackData]:
+    return [
+        Product(
+            i,
+            f"Product {i}",
+            i * 1.5,
+            i % 2 == 0,
+            _State.ACTIVE if i % 3 else _State.BLOCKED,
+            i / 10 or None,
+            (None, True, False)[i % 3],
+        )
+        for i in range(200)
+    ]
+
+
+def test_compiled_codecs_match_reflective(monkeypatch):
+    """The compiled ``to_str``/``from_str`` round-trip exactly like the reflective ones."""
+    Product = _product_cls()
+    products = _products(Product)
+    invalid = (
+        f"{Product.__callback_id__}~1~Shirt~9.5~§~x~¤~¤"  # not a member of the enum
+    )
+    strings = [product.to_str() for product in products]
+    assert [Product.from_str(s) for s in strings] == products
+    with pytest.raises(ValueError):
+        Product.from_str(invalid)
+
+    monkeypatch.setattr(Product, "to_str", _reflective_to_str)
+    monkeypatch.setattr(Product, "from_str", classmethod(_reflective_from_str))
+    assert [product.to_str() for product in products] == strings
+    assert [Product.from_str(s) for s in strings] == products
+    with pytest.raises(ValueError):
+        Product.from_str(invalid)
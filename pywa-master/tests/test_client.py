@@ -1,12 +1,20 @@
+import base64
+import concurrent.futures
 import dataclasses
+import hashlib
+import io
 import json
 import datetime
+import os
 import tempfile
+import threading
+import time
 from platform import system
 
+import httpx
 import pytest
 
-from pywa import WhatsApp, types, utils, _helpers as helpers, filters
+from pywa import WhatsApp, types, utils, _helpers as helpers, filters, errors
 from pywa.types import sent_message, Contact
 
 PHONE_ID = "123456789"
@@ -782,3 +790,350 @@ def test_mark_message_as_read(api, wa):
 def test_created_flow(api, wa):
     with pytest.warns(DeprecationWarning):
         wa.create_flow(name="flow", categories=[], waba_id=123)
+
+
+def _media_client(content: bytes, chunks: list[int]) -> WhatsApp:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == f"Bearer {TOKEN}"
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "video/mp4"},
+            stream=_RecordingStream(content, chunks),
+        )
+
+    return WhatsApp(
+        phone_id=PHONE_ID,
+        token=TOKEN,
+        session=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    def __init__(self, content: bytes, chunks: list[int]):
+        self._content, self._chunks = content, chunks
+
+    def __iter__(self):
+        for i in range(0, len(self._content), 1000):
+            self._chunks.append(1000)
+            yield self._content[i : i + 1000]
+
+
+def test_download_media_is_streamed_and_verified():
+    content = bytes(range(256)) * 40
+    sha256 = hashlib.sha256(content).hexdigest()
+    chunks = []
+    wa = _media_client(content, chunks)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = wa.download_media(
+            url="https://lookaside.fbsbx.com/media", path=tmp, sha256=sha256
+        )
+        assert path.endswith(".mp4")
+        with open(path, "rb") as f:
+            assert f.read() == content
+        assert os.listdir(tmp) == [os.path.basename(path)]  # no leftover temp files
+    assert len(chunks) == 11  # the body was read chunk by chunk
+
+    buffer = io.BytesIO()
+    assert (
+        wa.stream_media(
+            url="https://lookaside.fbsbx.com/media",
+            file=buffer,
+            sha256=base64.b64encode(hashlib.sha256(content).digest()).decode(),
+        )
+        == "video/mp4"
+    )
+    assert buffer.getvalue() == content
+
+
+def test_download_media_hash_mismatch_keeps_nothing():
+    wa = _media_client(b"corrupted", [])
+    with tempfile.TemporaryDirectory() as tmp:
+        with pytest.raises(ValueError):
+            wa.download_media(
+                url="https://lookaside.fbsbx.com/media",
+                path=tmp,
+                sha256=hashlib.sha256(b"original").hexdigest(),
+            )
+        assert os.listdir(tmp) == []
+    with pytest.raises(ValueError):
+        wa.download_media(
+            url="https://lookaside.fbsbx.com/media",
+            in_memory=True,
+            sha256=hashlib.sha256(b"original").hexdigest(),
+        )
+
+
+def test_get_media_url_is_cached_and_coalesced(api, wa):
+    calls = []
+    release = threading.Event()
+
+    def get_media_url(media_id):
+        calls.append(media_id)
+        release.wait(5)
+        return {
+            "id": media_id,
+            "url": f"https://lookaside.fbsbx.com/{len(calls)}",
+            "mime_type": "image/jpeg",
+            "sha256": "abc",
+            "file_size": 1,
+        }
+
+    api.get_media_url.side_effect = get_media_url
+    with concurrent.futures.ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(wa.get_media_url, MEDIA_ID) for _ in range(8)]
+        time.sleep(0.05)
+        release.set()
+        urls = {f.result().url for f in futures}
+    assert calls == [MEDIA_ID] and urls == {"https://lookaside.fbsbx.com/1"}
+    assert wa.get_media_url(MEDIA_ID).url == "https://lookaside.fbsbx.com/1"
+    wa._media_urls.invalidate(MEDIA_ID)
+    assert wa.get_media_url(MEDIA_ID).url == "https://lookaside.fbsbx.com/2"
+
+
+def test_stale_media_url_is_looked_up_again():
+    content = b"image"
+    lookups = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "graph.facebook.com":
+            lookups.append(request.url.path)
+            return httpx.Response(
+                200,
+                json={
+                    "id": MEDIA_ID,
+                    "url": f"https://lookaside.fbsbx.com/{len(lookups)}",
+                    "mime_type": "image/jpeg",
+                    "sha256": hashlib.sha256(content).hexdigest(),
+                    "file_size": len(content),
+                },
+            )
+        if request.url.path == "/1":  # the first URL expired before the cache entry
+            return httpx.Response(404)
+        return httpx.Response(200, content=content)
+
+    wa = WhatsApp(
+        phone_id=PHONE_ID,
+        token=TOKEN,
+        session=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    image = types.Image(
+        _client=wa,
+        id=MEDIA_ID,
+        sha256=hashlib.sha256(content).hexdigest(),
+        mime_type="image/jpeg",
+    )
+    assert wa.get_media_url(MEDIA_ID).url.endswith("/1")
+    assert image.download(in_memory=True) == content
+    assert len(lookups) == 2
+    assert image.download(in_memory=True) == content
+    assert len(lookups) == 2  # the refreshed URL is cached
+
+
+def test_outbound_scheduler_retries_throttled_messages():
+    from pywa.ratelimit import OutboundScheduler
+
+    responses = [
+        httpx.Response(
+            400,
+            json={"error": {"code": 130429, "message": "Rate limit hit"}},
+        ),
+        httpx.Response(200, json=SENT_MESSAGE),
+    ]
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return responses.pop(0)
+
+    scheduler = OutboundScheduler(backoff=0.01)
+    wa = WhatsApp(
+        phone_id=PHONE_ID,
+        token=TOKEN,
+        session=httpx.Client(transport=httpx.MockTransport(handler)),
+        outbound_scheduler=scheduler,
+    )
+    assert wa.send_message(to=TO, text="Hi").id == MSG_ID
+    assert len(requests) == 2 and requests[0] == requests[1]
+    assert scheduler.throttle_events == {130429: 1} and scheduler.retries == 1
+    assert scheduler.queue_depth == 0
+
+    responses.extend(
+        httpx.Response(400, json={"error": {"code": 131056, "message": "Pair"}})
+        for _ in range(2)
+    )
+    with pytest.raises(errors.TooManyMessages):
+        WhatsApp(
+            phone_id=PHONE_ID,
+            token=TOKEN,
+            session=httpx.Client(transport=httpx.MockTransport(handler)),
+            outbound_scheduler=OutboundScheduler(max_retries=1, backoff=0.01),
+        ).send_message(to=TO, text="Hi")
+
+
+def test_outbound_scheduler_sends_replies_before_templates():
+    from pywa.ratelimit import OutboundScheduler, Priority, get_request_key
+
+    assert get_request_key(
+        "POST", f"/{PHONE_ID}/messages", {"to": TO, "type": "template"}
+    ) == (PHONE_ID, TO, Priority.BULK)
+    assert get_request_key(
+        "POST", f"/{PHONE_ID}/messages", {"to": TO, "type": "text"}
+    ) == (PHONE_ID, TO, Priority.REPLY)
+    assert get_request_key("GET", f"/{MEDIA_ID}", None)[0] is None
+
+    scheduler = OutboundScheduler(messages_per_second=10, burst=1)
+    scheduler.acquire(PHONE_ID)  # the next token is in 0.1 seconds
+    sent = []
+
+    def send(name, priority):
+        scheduler.acquire(PHONE_ID, recipient=name, priority=priority)
+        sent.append(name)
+
+    bulk = threading.Thread(target=send, args=("template", Priority.BULK))
+    bulk.start()
+    time.sleep(0.02)
+    reply = threading.Thread(target=send, args=("reply", Priority.REPLY))
+    reply.start()
+    time.sleep(0.02)
+    assert scheduler.queue_depth == 2
+    bulk.join(2)
+    reply.join(2)
+    assert sent == ["reply", "template"]
+
+
+def test_outbound_scheduler_limits_each_pair():
+    from pywa.ratelimit import OutboundScheduler
+
+    scheduler = OutboundScheduler(pair_messages_per_second=10, pair_burst=1)
+    start = time.monotonic()
+    scheduler.acquire(PHONE_ID, recipient=TO)
+    scheduler.acquire(PHONE_ID, recipient="another user")
+    assert time.monotonic() - start < 0.05  # different pairs are not limited
+    scheduler.acquire(PHONE_ID, recipient=TO)
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_async_outbound_scheduler_retries_throttled_requests():
+    from pywa_async.ratelimit import OutboundScheduler
+
+    scheduler = OutboundScheduler(backoff=0.01)
+    calls = []
+
+    async def send():
+        calls.append(1)
+        if len(calls) == 1:
+            raise errors.WhatsAppError.from_dict(
+                {"code": 131056, "message": "Pair rate limit hit"}
+            )
+        return SENT_MESSAGE
+
+    assert await scheduler.run(send, phone_id=PHONE_ID, recipient=TO) == SENT_MESSAGE
+    assert len(calls) == 2 and scheduler.throttle_events == {131056: 1}
+
+
+def _broadcast_handler(sent: list, fail: set):
+    def handler(request: httpx.Request) -> httpx.Response:
+        to = json.loads(request.content)["to"]
+        if to in fail:
+            return httpx.Response(
+                400, json={"error": {"code": 131026, "message": "Undeliverable"}}
+            )
+        sent.append(to)
+        return httpx.Response(
+            200,
+            json={
+                "messaging_product": "whatsapp",
+                "contacts": [{"input": to, "wa_id": to}],
+                "messages": [{"id": f"wamid.{to}"}],
+            },
+        )
+
+    return handler
+
+
+def test_broadcast_template_resumes_from_checkpoint(tmp_path):
+    template = types.Template(
+        name="new_arrivals", language=types.Template.Language.ENGLISH_US
+    )
+    recipients = [str(n) for n in range(100, 120)]
+    checkpoint = tmp_path / "broadcast.jsonl"
+    sent = []
+    wa = WhatsApp(
+        phone_id=PHONE_ID,
+        token=TOKEN,
+        session=httpx.Client(
+            transport=httpx.MockTransport(_broadcast_handler(sent, fail={"105"}))
+        ),
+    )
+    broadcast = wa.broadcast_template(
+        (r for r in recipients), template, workers=4, checkpoint=checkpoint
+    )
+    assert sent == []  # nothing is sent before iterating
+    results = list(broadcast)
+    assert sorted(r.to for r in results) == recipients
+    assert {r.to for r in results if not r.ok} == {"105"}
+    assert all(r.sent.id == f"wamid.{r.to}" for r in results if r.ok)
+    assert (broadcast.sent, broadcast.failed, broadcast.skipped) == (19, 1, 0)
+    with pytest.raises(RuntimeError):
+        list(broadcast)
+
+    sent.clear()
+    wa = WhatsApp(
+        phone_id=PHONE_ID,
+        token=TOKEN,
+        session=httpx.Client(
+            transport=httpx.MockTransport(_broadcast_handler(sent, set()))
+        ),
+    )
+    resumed = wa.broadcast_template(
+        ((r, template) for r in recipients), checkpoint=checkpoint
+    )
+    assert [r.to for r in resumed] == ["105"] and sent == ["105"]
+    assert resumed.skipped == 19
+    assert len(checkpoint.read_text().splitlines()) == 21
+
+
+def test_broadcast_template_records_the_sends_in_progress_when_stopped(tmp_path):
+    template = types.Template(
+        name="new_arrivals", language=types.Template.Language.ENGLISH_US
+    )
+    checkpoint = tmp_path / "broadcast.jsonl"
+    sent = []
+    wa = WhatsApp(
+        phone_id=PHONE_ID,
+        token=TOKEN,
+        session=httpx.Client(
+            transport=httpx.MockTransport(_broadcast_handler(sent, set()))
+        ),
+    )
+    for _ in wa.broadcast_template(
+        map(str, range(1000)), template, workers=2, checkpoint=checkpoint
+    ):
+        break
+    lines = checkpoint.read_text().splitlines()
+    assert len(lines) == len(sent) < 1000
+
+
+@pytest.mark.asyncio
+async def test_async_broadcast_template(tmp_path):
+    from pywa_async import WhatsApp as WhatsAppAsync
+
+    template = types.Template(
+        name="new_arrivals", language=types.Template.Language.ENGLISH_US
+    )
+    sent = []
+    wa = WhatsAppAsync(
+        phone_id=PHONE_ID,
+        token=TOKEN,
+        session=httpx.AsyncClient(
+            transport=httpx.MockTransport(_broadcast_handler(sent, fail={"3"}))
+        ),
+    )
+    broadcast = wa.broadcast_template(
+        map(str, range(10)), template, checkpoint=tmp_path / "broadcast.jsonl"
+    )
+    results = [r async for r in broadcast]
+    assert sorted(sent) == [str(n) for n in range(10) if n != 3]
+    assert [r.to for r in results if not r.ok] == ["3"]
+    assert (broadcast.sent, broadcast.failed) == (9, 1)
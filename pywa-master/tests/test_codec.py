@@ -0,0 +1,84 @@
+import json
+import pathlib
+
+import httpx
+import pytest
+
+from pywa import WhatsApp, codec
+from pywa.codec import JsonCodec, MsgspecJsonCodec, OrjsonCodec, StdlibJsonCodec
+
+FIXTURES = {
+    path.stem: [
+        json.dumps(update).encode("utf-8")
+        for update in json.loads(path.read_text("utf-8")).values()
+    ]
+    for path in sorted(pathlib.Path("tests/data/updates/18.0").glob("*.json"))
+}
+
+
+def _codecs() -> list[JsonCodec]:
+    codecs = [StdlibJsonCodec()]
+    for codec_cls in (OrjsonCodec, MsgspecJsonCodec):
+        try:
+            codecs.append(codec_cls())
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize("json_codec", _codecs(), ids=lambda c: c.name)
+def test_codec_round_trip(json_codec: JsonCodec):
+    for updates in FIXTURES.values():
+        for update in updates:
+            decoded = json_codec.loads(update)
+            assert decoded == json.loads(update)
+            assert json_codec.loads(json_codec.dumps(decoded)) == decoded
+            assert json_codec.loads(update.decode("utf-8")) == decoded
+    assert json_codec.dumps({"text": "שלום", "n": [1, None]}) == (
+        '{"text":"שלום","n":[1,null]}'.encode("utf-8")
+    )
+    with pytest.raises(ValueError):
+        json_codec.loads(b"not json")
+
+
+def test_default_codec_is_the_fastest_installed():
+    default = codec.get_default_json_codec()
+    assert default is codec.get_default_json_codec()
+    assert default.name == (_codecs()[1:] or _codecs())[0].name  # orjson first
+
+
+class _CountingCodec(StdlibJsonCodec):
+    def __init__(self):
+        self.loads_calls = self.dumps_calls = 0
+
+    def loads(self, data):
+        self.loads_calls += 1
+        return super().loads(data)
+
+    def dumps(self, obj):
+        self.dumps_calls += 1
+        return super().dumps(obj)
+
+
+def test_client_uses_the_codec():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Content-Type"] == "application/json"
+        assert json.loads(request.content)["text"]["body"] == "hi"
+        return httpx.Response(
+            200, json={"messages": [{"id": "wamid.1"}], "contacts": [{"wa_id": "1"}]}
+        )
+
+    json_codec = _CountingCodec()
+    wa = WhatsApp(
+        phone_id="123",
+        token="xyz",
+        session=httpx.Client(transport=httpx.MockTransport(handler)),
+        json_codec=json_codec,
+        validate_updates=False,
+    )
+    assert wa.send_message(to="1", text="hi").id == "wamid.1"
+    assert (json_codec.dumps_calls, json_codec.loads_calls) == (1, 1)
+
+    _, _, update, _ = wa._check_and_prepare_update(FIXTURES["message"][0])
+    assert update == json.loads(FIXTURES["message"][0])
+    assert json_codec.loads_calls == 2
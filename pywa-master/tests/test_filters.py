@@ -295,6 +295,66 @@ def test_filters():
                             ) from e
 
 
+def _sync_update(filename: str, test_name: str) -> BaseUpdate:
+    wa = next(iter(CLIENTS))
+    return next(
+        t[test_name] for t in CLIENTS[wa][RANDOM_API_VER][filename] if test_name in t
+    )
+
+
+def test_filters_are_evaluated_once_per_update():
+    from pywa import WhatsApp, handlers
+
+    wa = WhatsApp(server=None, verify_token="xyz")
+    calls = []
+    counted = fil.new(
+        lambda _, m: calls.append(m.id) or True, name="counted", pure=True
+    )
+    seen = []
+    for f in (counted & fil.matches("nope"), counted | fil.image, ~counted, counted):
+        wa.add_handlers(
+            handlers.MessageHandler(lambda _, m: seen.append(m.id), f, priority=1)
+        )
+    wa._continue_handling = True
+    msg = modify_text(_sync_update("message", "text"), "hello")
+
+    wa._invoke_callbacks(handlers.MessageHandler, msg)
+    assert calls == [msg.id]  # shared by all the handlers
+    assert seen == [msg.id, msg.id]
+    wa._invoke_callbacks(handlers.MessageHandler, modify_text(msg, "hi"))
+    assert len(calls) == 2  # a new update is evaluated again
+
+
+def test_stateful_filters_are_called_for_each_handler():
+    """Filters created with ``new`` are not memoized unless ``pure=True`` (e.g. counters and rate limits)."""
+    from pywa import WhatsApp, handlers
+
+    wa = WhatsApp(server=None, verify_token="xyz")
+    calls = []
+    counted = fil.new(lambda _, m: calls.append(m.id) or True, name="counted")
+    for f in (counted & fil.text, counted | fil.image, ~counted):
+        wa.add_handlers(handlers.MessageHandler(lambda _, __: None, f, priority=1))
+    wa._continue_handling = True
+    msg = modify_text(_sync_update("message", "text"), "hello")
+
+    wa._invoke_callbacks(handlers.MessageHandler, msg)
+    assert calls == [msg.id] * 3  # once per handler
+    assert not (counted & fil.text)._pure and (fil.text & fil.image)._pure
+
+
+def test_text_filters_normalize_the_text_once_per_update():
+    msg = modify_text(_sync_update("message", "text"), "/Start Now")
+    wa = next(iter(CLIENTS))
+    assert fil.command("start", ignore_case=True).check_sync(wa, msg)
+    assert fil.command("stArt", ignore_case=True).check_sync(wa, msg)
+    assert fil.startswith("/start", ignore_case=True).check_sync(wa, msg)
+    assert not fil.command("start").check_sync(wa, msg)
+    assert not fil.regex(r"/start").check_sync(wa, msg)
+    assert msg._filters_results[("_texts", True)] == ("/start now",)
+    assert msg._filters_results[("_command", True)] == "start now"
+    assert not fil.command("start").check_sync(wa, modify_text(msg, ""))
+
+
 def modify_text(msg: Message, to: str):
     return dataclasses.replace(msg, text=to)
 
@@ -232,3 +232,119 @@ def test_shared_data():
     )
 
     assert msg.shared_data["key"] == "value"
+
+
+def _indexed_handlers_and_updates():
+    import dataclasses
+    from tests.common import CLIENTS, API_VERSIONS
+
+    @dataclasses.dataclass(slots=True, frozen=True)
+    class Item(types.CallbackData):
+        id: int
+
+    @dataclasses.dataclass(slots=True, frozen=True)
+    class Other(types.CallbackData):
+        id: int
+
+    message_filters = [
+        None,
+        filters.text,
+        filters.image,
+        filters.video,
+        filters.voice,
+        filters.static_sticker,
+        filters.reaction_added,
+        filters.current_location,
+        filters.is_command,
+        filters.command("start"),
+        filters.text | filters.image,
+        filters.text & filters.matches("hi"),
+        ~filters.text,
+        filters.media,
+    ]
+    status_filters = [
+        None,
+        filters.sent,
+        filters.read | filters.delivered,
+        filters.failed_with(131051),
+    ]
+    callback_handlers = lambda handler_type: [
+        handler_type(lambda _, __: None),
+        handler_type(lambda _, __: None, factory=Item),
+        handler_type(lambda _, __: None, factory=Other),
+        handler_type(
+            lambda _, __: None,
+            filters.new(lambda _, c: c.data.id == 1),
+            factory=Item,
+        ),
+    ]
+    wa = next(iter(CLIENTS))
+    updates = CLIENTS[wa][API_VERSIONS[-1]]
+    return wa, {
+        handlers.MessageHandler: (
+            [handlers.MessageHandler(lambda _, __: None, f) for f in message_filters],
+            [u for test in updates["message"] for u in test.values()],
+        ),
+        handlers.MessageStatusHandler: (
+            [
+                handlers.MessageStatusHandler(lambda _, __: None, f)
+                for f in status_filters
+            ],
+            [u for test in updates["message_status"] for u in test.values()],
+        ),
+        handlers.CallbackButtonHandler: (
+            callback_handlers(handlers.CallbackButtonHandler),
+            [
+                dataclasses.replace(u, data=data)
+                for test in updates["callback_button"]
+                for u in test.values()
+                for data in (u.data, Item(id=1).to_str(), Other(id=2).to_str())
+            ],
+        ),
+        handlers.CallbackSelectionHandler: (
+            callback_handlers(handlers.CallbackSelectionHandler),
+            [u for test in updates["callback_selection"] for u in test.values()],
+        ),
+    }
+
+
+def test_handlers_index_yields_the_matching_handlers():
+    wa, handlers_and_updates = _indexed_handlers_and_updates()
+    for handler_type, (hs, updates) in handlers_and_updates.items():
+        index = handlers._HandlersIndex(hs)
+        for update in updates:
+            candidates = list(index.candidates(update))
+            assert candidates == [h for h in hs if h in candidates]  # same priority
+            assert [h for h in candidates if h.handle(wa, update)] == [
+                h for h in hs if h.handle(wa, update)
+            ], (handler_type, update)
+
+
+def test_handlers_index_is_rebuilt_when_handlers_change():
+    wa = WhatsApp(server=None, verify_token="1234567890")
+    calls = []
+    text_handler = handlers.MessageHandler(
+        lambda _, m: calls.append("text"), filters.text, priority=1
+    )
+    wa.add_handlers(text_handler)
+    msg = next(
+        u
+        for u in _indexed_handlers_and_updates()[1][handlers.MessageHandler][1]
+        if u.type == types.MessageType.TEXT
+    )
+    wa._invoke_callbacks(handlers.MessageHandler, msg)
+
+    @wa.on_message(filters.image)
+    def on_image(_, __):
+        calls.append("image")
+
+    @wa.on_message(filters.text, priority=2)
+    def on_text(_, __):
+        calls.append("first")
+
+    wa._invoke_callbacks(handlers.MessageHandler, msg)
+    wa.remove_callbacks(on_text)
+    wa._invoke_callbacks(handlers.MessageHandler, msg)
+    wa.remove_handlers(text_handler)
+    wa._invoke_callbacks(handlers.MessageHandler, msg)
+    assert calls == ["text", "first", "text"]
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from pywa import WhatsApp, utils
+from pywa.listeners import (
+    Listener,
+    ListenerStopped,
+    ListenerTimeout,
+    TooManyListeners,
+    _TimerWheel,
+)
+
+PHONE_ID = "123456789"
+TO = "135792468"
+
+
+@pytest.fixture
+def wa():
+    return WhatsApp(phone_id=PHONE_ID, token="xyz", max_listeners=100)
+
+
+def test_add_listener_calls_the_continuation(wa):
+    replies = []
+
+    def on_reply(listener: Listener):
+        replies.append(listener.result)
+        if len(replies) < 2:  # the continuation can listen to the user again
+            wa.add_listener(to=TO, callback=on_reply)
+
+    first = wa.add_listener(to=TO, callback=on_reply)
+    identifier = utils.listener_identifier(sender=TO, recipient=PHONE_ID)
+    assert wa._listeners[identifier] is first and not first.is_set()
+    first.set_result("hi")
+    second = wa._listeners[identifier]
+    assert second is not first
+    second.set_result("bye")
+    assert replies == ["hi", "bye"] and wa._listeners == {}
+    first.set_result("ignored")  # resolved only once
+    assert first.result == "hi"
+
+
+def test_add_listener_timeouts_use_the_timer_wheel(wa):
+    resolved = threading.Event()
+    listener = wa.add_listener(to=TO, timeout=0.1, callback=lambda _: resolved.set())
+    assert resolved.wait(2)
+    assert isinstance(listener.exception, ListenerTimeout)
+    assert wa._listeners == {}
+
+    stopped = wa.add_listener(to=TO, timeout=60)
+    wa.stop_listening(to=TO, reason="done")
+    assert isinstance(stopped.exception, ListenerStopped)
+    assert wa._listeners == {}
+
+
+def test_blocking_listen(wa):
+    threading.Timer(
+        0.05,
+        lambda: wa._listeners[
+            utils.listener_identifier(sender=TO, recipient=PHONE_ID)
+        ].set_result("hi"),
+    ).start()
+    assert wa.listen(to=TO, timeout=5) == "hi"
+    with pytest.raises(ListenerTimeout):
+        wa.listen(to=TO, timeout=0.1)
+    assert wa._listeners == {}
+
+
+def test_max_listeners(wa):
+    wa._max_listeners = 2
+    wa.add_listener(to="1")
+    wa.add_listener(to="2")
+    wa.add_listener(to="2")  # replacing a listener is allowed
+    with pytest.raises(TooManyListeners):
+        wa.add_listener(to="3")
+
+
+def test_timer_wheel_expires_in_order_and_cancels():
+    wheel = _TimerWheel(tick=0.01, slots=8)
+    expired = []
+    for delay in (0.15, 0.05, 0.1):  # longer than a round of the wheel, too
+        wheel.schedule(delay, lambda d=delay: expired.append(d))
+    wheel.cancel(wheel.schedule(0.05, lambda: expired.append("canceled")))
+    assert len(wheel) == 3
+    time.sleep(0.4)
+    assert expired == [0.05, 0.1, 0.15] and len(wheel) == 0
+
+
+def _continue(listener: Listener) -> None:
+    pass
+
+
+def test_memory_per_pending_listener(wa):
+    wa._max_listeners = 0
+    count = 2_000
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(count):
+        wa.add_listener(to=str(i), timeout=600, callback=_continue)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    per_listener = (
+        sum(s.size_diff for s in after.compare_to(before, "filename")) / count
+    )
+    assert per_listener < 1024  # no thread or event per listener
+    for listener in list(wa._listeners.values()):
+        listener.stop()
+    assert wa._listeners == {}
+
+
+@pytest.mark.asyncio
+async def test_async_add_listener():
+    from pywa_async import WhatsApp as WhatsAppAsync
+
+    wa = WhatsAppAsync(phone_id=PHONE_ID, token="xyz", max_listeners=1)
+    resolved = asyncio.Event()
+    listener = wa.add_listener(to=TO, timeout=0.05, callback=lambda _: resolved.set())
+    await asyncio.wait_for(resolved.wait(), 2)
+    assert isinstance(listener.exception, ListenerTimeout) and wa._listeners == {}
+
+    wa.add_listener(to=TO)
+    with pytest.raises(TooManyListeners):
+        wa.add_listener(to="another user")
+    wa._listeners[utils.listener_identifier(sender=TO, recipient=PHONE_ID)].set_result(
+        "hi"
+    )
+    await asyncio.sleep(0)
+    assert wa._listeners == {}
+    with pytest.raises(ListenerTimeout):
+        await wa.listen(to=TO, timeout=0.05)
@@ -1,7 +1,14 @@
+import dataclasses
+import json
+import pathlib
 from typing import Any, Callable
 
+import pytest
+
+from pywa import utils
 from pywa.types import (
     MessageType,
+    Metadata,
     MessageStatusType,
     TemplateStatus,
 )
@@ -98,3 +105,125 @@ def test_types():
                                 raise AssertionError(
                                     f"Failed to assert test='{test_name}', v={version}, error={e}"
                                 )
+
+
+def test_message_fields_are_decoded_on_first_access():
+    update = json.loads(
+        pathlib.Path("tests/data/updates/18.0/message.json").read_text("utf-8")
+    )["image"]
+    for client in CLIENTS:
+        msg = client._handlers_to_update_constractor[client._get_handler(update)](
+            client, update
+        )
+        assert msg.raw is update  # not copied
+        for field in ("image", "metadata", "timestamp"):
+            with pytest.raises(AttributeError):
+                object.__getattribute__(msg, field)  # not decoded yet
+        assert msg.image is not None and msg.video is None
+        object.__getattribute__(msg, "text")  # decoded along with the image
+        with pytest.raises(AttributeError):
+            object.__getattribute__(msg, "metadata")
+        assert msg.sender == msg.from_user.wa_id and msg.recipient
+        with pytest.raises(AttributeError):
+            msg.not_a_field
+        eager = type(msg)(
+            **{f.name: getattr(msg, f.name) for f in dataclasses.fields(msg) if f.init}
+        )
+        assert eager == msg and repr(eager) == repr(msg)
+
+
+def test_malformed_message_fields_raise_malformed_update_error(caplog):
+    from pywa import WhatsApp, filters, handlers
+    from pywa.types import MalformedUpdateError
+
+    update = json.loads(
+        pathlib.Path("tests/data/updates/18.0/message.json").read_text("utf-8")
+    )["image"]
+    update["entry"][0]["changes"][0]["value"]["messages"][0]["image"] = "not a dict"
+    for client in CLIENTS:
+        msg = client._handlers_to_update_constractor[client._get_handler(update)](
+            client, update
+        )
+        assert msg.id  # the eager fields still work
+        caplog.clear()
+        with pytest.raises(MalformedUpdateError, match="'image'") as exc_info:
+            msg.image
+        assert exc_info.value.field == "image"
+        assert exc_info.value.__cause__ is not None
+        # not hidden by getattr/hasattr (so filters can't mask a corrupt update)
+        with pytest.raises(MalformedUpdateError):
+            getattr(msg, "image", None)
+        with pytest.raises(MalformedUpdateError):
+            hasattr(msg, "caption")  # decoded along with the image
+        assert msg.timestamp  # other decoders are not affected
+        # logged once, not decoded again on every access
+        assert len([r for r in caplog.records if r.levelname == "ERROR"]) == 1
+
+    wa = WhatsApp(server=None, verify_token="xyz")
+    called = []
+    wa.add_handlers(
+        handlers.MessageHandler(
+            lambda _, m: called.append(m.id),
+            filters.new(lambda _, m: getattr(m, "image", None) is not None),
+        )
+    )
+    msg = wa._handlers_to_update_constractor[handlers.MessageHandler](wa, update)
+    # the filter can't mask the corrupt update, the handling fails (and is logged)
+    assert not wa._invoke_callbacks(handlers.MessageHandler, msg)
+    assert called == []
+
+
+def test_from_dict_ignores_extra_keys_and_prefers_kwargs():
+    data = {"display_phone_number": "123", "phone_number_id": "456", "extra": 1}
+    assert Metadata.from_dict(data) == Metadata(
+        display_phone_number="123", phone_number_id="456"
+    )
+    assert Metadata.from_dict(data, phone_number_id="789").phone_number_id == "789"
+    with pytest.raises(TypeError):
+        Metadata.from_dict({"display_phone_number": "123"})  # missing field
+
+
+def _generic_from_dict(cls, data: dict, **kwargs):
+    """The reflective ``FromDict.from_dict`` (what the generated ``from_dict`` must be equivalent to)."""
+    return cls(
+        **{
+            k: v
+            for k, v in (data | kwargs).items()
+            if k in (f.name for f in dataclasses.fields(cls))
+        }
+    )
+
+
+def _update_fixtures() -> list[tuple[Callable, Any, dict]]:
+    """Every update fixture with its constructor, for each client."""
+    fixtures = []
+    for path in sorted(pathlib.Path("tests/data/updates/18.0").glob("*.json")):
+        for update in json.loads(path.read_text("utf-8")).values():
+            for client in CLIENTS:
+                constructor = client._handlers_to_update_constractor[
+                    client._get_handler(update)
+                ]
+                fixtures.append((constructor, client, update))
+    return fixtures
+
+
+def _build_update(constructor: Callable, client, update: dict):
+    obj = constructor(client, update)
+    for field in dataclasses.fields(obj):  # decode every field
+        getattr(obj, field.name)
+    return obj
+
+
+def test_generated_from_dict_matches_reflective(monkeypatch):
+    fixtures = _update_fixtures()
+    generated = [_build_update(*fixture) for fixture in fixtures]
+    monkeypatch.setattr(utils.FromDict, "from_dict", classmethod(_generic_from_dict))
+    reflective = [_build_update(*fixture) for fixture in fixtures]
+    assert len(generated) == len(reflective) > 0
+    for (_, _, update), gen, ref in zip(fixtures, generated, reflective):
+        assert type(gen) is type(ref)
+        for field in dataclasses.fields(gen):
+            gen_value, ref_value = getattr(gen, field.name), getattr(ref, field.name)
+            if isinstance(gen_value, Exception):  # errors don't compare by value
+                gen_value, ref_value = repr(gen_value), repr(ref_value)
+            assert gen_value == ref_value, (field.name, update)
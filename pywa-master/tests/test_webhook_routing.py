@@ -0,0 +1,143 @@
+import hashlib
+import hmac
+import json
+import pathlib
+
+import pytest
+
+pytest.importorskip("msgspec")
+
+from pywa import WhatsApp, handlers, webhook_routing  # noqa: E402
+from pywa.handlers import Handler  # noqa: E402
+from pywa.server import _split_update  # noqa: E402
+
+from .test_codec import _CountingCodec  # noqa: E402
+
+FIXTURES = {
+    path.stem: [
+        json.dumps(update).encode("utf-8")
+        for update in json.loads(path.read_text("utf-8")).values()
+    ]
+    for path in sorted(pathlib.Path("tests/data/updates/18.0").glob("*.json"))
+}
+
+HANDLER_TYPES = (
+    handlers.MessageHandler,
+    handlers.MessageStatusHandler,
+    handlers.CallbackButtonHandler,
+    handlers.CallbackSelectionHandler,
+    handlers.ChatOpenedHandler,
+    handlers.FlowCompletionHandler,
+    handlers.TemplateStatusHandler,
+)
+
+
+def _wa(**kwargs) -> WhatsApp:
+    kwargs.setdefault("skip_unhandled_deliveries", True)
+    return WhatsApp(
+        phone_id="123456789",
+        server=None,
+        verify_token="xyzxyz",
+        validate_updates=False,
+        filter_updates=False,
+        skip_duplicate_updates=False,
+        **kwargs,
+    )
+
+
+def test_every_fixture_is_decoded():
+    for name, updates in FIXTURES.items():
+        for update in updates:
+            delivery = webhook_routing.decode_delivery(update)
+            raw = json.loads(update)
+            change = delivery.entry[0].changes[0]
+            assert change.field == raw["entry"][0]["changes"][0]["field"], name
+            value = raw["entry"][0]["changes"][0]["value"]
+            if "messages" in value:
+                assert change.value.messages[0].from_ == value["messages"][0]["from"]
+                assert change.value.messages[0].type == value["messages"][0]["type"]
+            if "statuses" in value:
+                assert (
+                    change.value.statuses[0].recipient_id
+                    == value["statuses"][0]["recipient_id"]
+                )
+
+
+def test_invalid_deliveries_are_rejected():
+    with pytest.raises(ValueError):
+        webhook_routing.decode_delivery(b"not json")
+    with pytest.raises(ValueError):  # `entry` must be a list
+        webhook_routing.decode_delivery(b'{"object": "x", "entry": {}}')
+
+
+@pytest.mark.parametrize("handler_type", HANDLER_TYPES, ids=lambda h: h.__name__)
+def test_routing_matches_get_handler(handler_type: type[Handler]):
+    """A delivery is wanted exactly when the regular path would find a handler of the registered type."""
+    wa = _wa()
+    wa.add_handlers(handler_type(lambda _, __: None))
+    for name, updates in FIXTURES.items():
+        for update in updates:
+            expected = any(
+                wa._get_handler(single) is handler_type
+                for single in _split_update(json.loads(update))
+            )
+            delivery = webhook_routing.decode_delivery(update)
+            assert wa._is_delivery_wanted(delivery) is expected, name
+
+
+def test_unwanted_deliveries_are_skipped():
+    wa = _wa()
+    called = []
+    wa.add_handlers(handlers.MessageHandler(lambda _, m: called.append(m.id)))
+    status = FIXTURES["message_status"][0]
+    assert wa.webhook_update_handler(status) == ("ok", 200)
+    assert wa.webhook_stats.unhandled_deliveries == 1
+    assert wa.webhook_stats.deliveries == 0
+
+    message = FIXTURES["message"][0]
+    assert wa.webhook_update_handler(message) == ("ok", 200)
+    assert called == [
+        json.loads(message)["entry"][0]["changes"][0]["value"]["messages"][0]["id"]
+    ]
+
+    # raw update handlers want every delivery
+    wa.add_handlers(handlers.RawUpdateHandler(lambda _, __: None))
+    wa.webhook_update_handler(status)
+    assert wa.webhook_stats.unhandled_deliveries == 1
+
+
+def test_unhandled_deliveries_are_not_decoded_into_dicts():
+    json_codec = _CountingCodec()
+    wa = _wa(json_codec=json_codec)
+    wa.add_handlers(handlers.MessageHandler(lambda _, __: None))
+    for update in FIXTURES["message_status"]:
+        assert wa.webhook_update_handler(update) == ("ok", 200)
+    assert json_codec.loads_calls == 0
+    assert wa.webhook_stats.unhandled_deliveries == len(FIXTURES["message_status"])
+
+    wa.webhook_update_handler(FIXTURES["message"][0])
+    assert json_codec.loads_calls == 1
+
+
+def test_listeners_want_their_updates():
+    wa = _wa()
+    update = json.loads(FIXTURES["message_status"][0])
+    value = update["entry"][0]["changes"][0]["value"]
+    delivery = webhook_routing.decode_delivery(FIXTURES["message_status"][0])
+    assert not wa._is_delivery_wanted(delivery)
+    wa._listeners[
+        (value["statuses"][0]["recipient_id"], value["metadata"]["phone_number_id"])
+    ] = object()
+    assert wa._is_delivery_wanted(delivery)
+
+
+def test_schema_mismatch_falls_back_to_dicts():
+    """A delivery that does not match the schema is not rejected (WhatsApp would retry it)."""
+    bad = b'{"object": "whatsapp_business_account", "entry": [{"id": 1}]}'
+    wa = _wa()
+    wa._validate_updates, wa._app_secret = True, "secret"
+    signature = hmac.new(b"secret", bad, hashlib.sha256).hexdigest()
+    assert wa._check_and_prepare_update(bad, hmac_header=signature)[2] == json.loads(
+        bad
+    )
+    assert wa.webhook_stats.unhandled_deliveries == 0
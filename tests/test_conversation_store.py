@@ -0,0 +1,17 @@
+from conversation_store import ConversationStore
+
+
+def test_restore_skips_conversations_deleted_after_the_snapshot(tmp_path):
+    db, snapshot = str(tmp_path / "conversations.db"), str(tmp_path / "snapshot.json")
+    store = ConversationStore(db)
+    store.put("a", {"x": 1})
+    store.put("b", {"x": 2})
+    store.snapshot(snapshot)
+    store.delete("a")
+    store.close()
+
+    restored = ConversationStore(db)
+    assert restored.restore(snapshot) == 1
+    assert restored.get("a") is None
+    assert restored.get("b") == {"x": 2}
+    restored.close()
@@ -0,0 +1,43 @@
+import hashlib
+import os
+
+from whatsapp_client import MediaStore
+
+
+def _put(store: MediaStore, tmp_path, data: bytes) -> str:
+    sha256 = hashlib.sha256(data).hexdigest()
+    file_path = store.temp_path()
+    with open(file_path, "wb") as f:
+        f.write(data)
+    return store.put(sha256, file_path, ".bin", str(tmp_path / f"{sha256[:16]}.bin"))
+
+
+def test_new_blob_is_not_evicted(tmp_path):
+    """Over max_bytes with every older blob still linked, the blob just written must survive."""
+    store = MediaStore(str(tmp_path / "store"), max_bytes=100)
+    paths = [_put(store, tmp_path, bytes([i]) * 60) for i in range(3)]
+    for i, path in enumerate(paths):
+        with open(path, "rb") as f:
+            assert f.read() == bytes([i]) * 60
+
+
+def test_unreferenced_blobs_are_evicted(tmp_path):
+    store = MediaStore(str(tmp_path / "store"), max_bytes=100)
+    first = _put(store, tmp_path, b"a" * 60)
+    sha256 = hashlib.sha256(b"a" * 60).hexdigest()
+    store.release(sha256, first)
+    _put(store, tmp_path, b"b" * 60)
+    assert not store.has(sha256)
+    assert store.link(sha256, str(tmp_path / "again.bin")) is None
+
+
+def test_index_is_rebuilt_from_blobs(tmp_path):
+    """Index writes are batched, so blobs written after the last flush are found again on startup."""
+    root = str(tmp_path / "store")
+    store = MediaStore(root, flush_interval=3600)
+    _put(store, tmp_path, b"a" * 10)
+    _put(store, tmp_path, b"b" * 10)
+    reopened = MediaStore(root)
+    assert reopened.has(hashlib.sha256(b"b" * 10).hexdigest())
+    assert reopened.disk_usage == 20
+    assert os.path.exists(store.index_path)
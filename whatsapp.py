@@ -1,6 +1,13 @@
-import requests
+import httpx
+import asyncio
+import importlib.util
 import logging
 import os # Keep os import for now, might be useful later or for phone_number_id initially
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Iterable
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -9,18 +16,96 @@ logger = logging.getLogger(__name__)
 # Consider moving this URL construction logic inside the class or making it more dynamic if needed
 META_GRAPH_API_URL = "https://graph.facebook.com/v20.0/" # Use a recent version
 
+@dataclass
+class SendResult:
+    """The outcome of sending one message."""
+    to: str
+    ok: bool
+    message_id: str | None = None
+    status_code: int | None = None
+    error: str | None = None
+    latency_ms: float = 0.0
+
+@dataclass
+class SenderStats:
+    """Counters of a sender: requests, failures, new connections (handshakes) and latency."""
+    requests: int = 0
+    failures: int = 0
+    tcp_handshakes: int = 0 # New connections opened (each one is a TCP handshake)
+    tls_handshakes: int = 0
+    total_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+
+    def record(self, result: SendResult):
+        self.requests += 1
+        self.failures += not result.ok
+        self.total_latency_ms += result.latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, result.latency_ms)
+
+    def on_trace(self, event: str):
+        if event == "connection.connect_tcp.complete":
+            self.tcp_handshakes += 1
+        elif event == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    @property
+    def avg_latency_ms(self) -> float:
+        return self.total_latency_ms / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "avg_latency_ms": self.avg_latency_ms}
+
+def _text_payload(to: str, message_body: str) -> dict:
+    return {
+        "messaging_product": "whatsapp",
+        "recipient_type": "individual",
+        "to": to,
+        "type": "text",
+        "text": {"preview_url": False, "body": message_body},
+    }
+
+def _http2_available(http2: bool) -> bool:
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1 (pip install 'httpx[http2]').")
+        return False
+    return http2
+
+def _result(to: str, started: float, response: httpx.Response | None = None, error: Exception | None = None) -> SendResult:
+    """Builds the SendResult of one request (and logs it like send_text_message always did)."""
+    latency_ms = (time.perf_counter() - started) * 1000
+    if error is not None:
+        logger.error(f"Error sending WhatsApp message to {to}: {error}")
+        return SendResult(to=to, ok=False, error=str(error), latency_ms=latency_ms)
+    if response.is_error:
+        logger.error(f"Error sending WhatsApp message to {to}: HTTP {response.status_code}")
+        logger.error(f"Response body: {response.text}")
+        return SendResult(to=to, ok=False, status_code=response.status_code, error=response.text, latency_ms=latency_ms)
+    response_data = response.json()
+    message_id = response_data.get("messages", [{}])[0].get("id")
+    if not message_id:
+        logger.warning(f"Message sending API call succeeded but no message ID found in response for {to}. Response: {response_data}")
+        return SendResult(to=to, ok=False, status_code=response.status_code, error="No message ID in response", latency_ms=latency_ms)
+    logger.info(f"Message sent successfully to {to}. Message ID: {message_id}")
+    return SendResult(to=to, ok=True, message_id=message_id, status_code=response.status_code, latency_ms=latency_ms)
+
 class WhatsAppClient:
     """
     A client for interacting with the WhatsApp Business API (Cloud API).
     Handles sending text messages.
+
+    All requests go through one persistent, pooled httpx.Client (keep-alive, HTTP/2 when `h2` is
+    installed), so replies don't pay a new TCP+TLS handshake to graph.facebook.com each time.
     """
-    def __init__(self, access_token: str, phone_number_id: str):
+    def __init__(self, access_token: str, phone_number_id: str, pool_size: int = 10, http2: bool = True, timeout: float = 10):
         """
         Initializes the WhatsAppClient.
 
         Args:
             access_token: The specific access token (e.g., Business Token) for API calls.
             phone_number_id: The WhatsApp Business Account phone number ID to send messages from.
+            pool_size: The maximum number of pooled (kept-alive) connections, also the concurrency of send_many.
+            http2: Use HTTP/2 when the `h2` package is installed.
+            timeout: The timeout (in seconds) of each request.
         """
         if not access_token:
             raise ValueError("Access token cannot be empty.")
@@ -29,13 +114,52 @@ class WhatsAppClient:
 
         self.access_token = access_token
         self.phone_number_id = phone_number_id
+        self.pool_size = pool_size
         self.base_url = f"{META_GRAPH_API_URL}{self.phone_number_id}/messages"
         self.headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
         }
+        self.stats = SenderStats()
+        self._stats_lock = threading.Lock() # send_many updates the stats from several threads
+        self.session = httpx.Client(
+            headers=self.headers,
+            http2=_http2_available(http2),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=timeout,
+        )
         logger.info(f"WhatsAppClient initialized for phone number ID: {self.phone_number_id}") # Avoid logging token
 
+    def _trace(self, event: str, info: dict):
+        with self._stats_lock:
+            self.stats.on_trace(event)
+
+    def close(self):
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def send(self, to: str, message_body: str) -> SendResult:
+        """
+        Sends a text message to a WhatsApp user.
+
+        Args:
+            to: The recipient's phone number (with country code, no '+').
+            message_body: The content of the text message.
+
+        Returns:
+            SendResult: Whether it was sent, the message ID or the error, and the latency.
+        """
+        logger.info(f"Attempting to send message to {to} via number ID {self.phone_number_id}")
+        started = time.perf_counter()
+        try:
+            response = self.session.post(self.base_url, json=_text_payload(to, message_body), extensions={"trace": self._trace})
+            result = _result(to, started, response=response)
+        except Exception as e:
+            result = _result(to, started, error=e)
+        with self._stats_lock:
+            self.stats.record(result)
+        return result
+
     def send_text_message(self, to: str, message_body: str):
         """
         Sends a text message to a WhatsApp user.
@@ -47,36 +171,113 @@ class WhatsAppClient:
         Returns:
             bool: True if the message was sent successfully (API accepted it), False otherwise.
         """
-        payload = {
-            "messaging_product": "whatsapp",
-            "recipient_type": "individual",
-            "to": to,
-            "type": "text",
-            "text": {"preview_url": False, "body": message_body},
+        return self.send(to, message_body).ok
+
+    def send_many(self, messages: Iterable[tuple[str, str]]) -> list[SendResult]:
+        """
+        Sends a batch of text messages concurrently over the pooled connections (up to pool_size at a time).
+
+        Args:
+            messages: (to, message_body) pairs.
+
+        Returns:
+            list[SendResult]: One result per message, in the same order.
+        """
+        messages = list(messages)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.pool_size, len(messages)))) as pool:
+            return list(pool.map(lambda m: self.send(*m), messages))
+
+class AsyncWhatsAppClient:
+    """
+    The asyncio version of WhatsAppClient, on one persistent, pooled httpx.AsyncClient.
+    """
+    def __init__(self, access_token: str, phone_number_id: str, pool_size: int = 10, http2: bool = True, timeout: float = 10):
+        """
+        Initializes the AsyncWhatsAppClient.
+
+        Args:
+            access_token: The specific access token (e.g., Business Token) for API calls.
+            phone_number_id: The WhatsApp Business Account phone number ID to send messages from.
+            pool_size: The maximum number of pooled (kept-alive) connections, also the concurrency of send_many.
+            http2: Use HTTP/2 when the `h2` package is installed (multiplexes the batch on fewer connections).
+            timeout: The timeout (in seconds) of each request.
+        """
+        if not access_token:
+            raise ValueError("Access token cannot be empty.")
+        if not phone_number_id:
+            raise ValueError("Phone number ID cannot be empty.")
+
+        self.access_token = access_token
+        self.phone_number_id = phone_number_id
+        self.pool_size = pool_size
+        self.base_url = f"{META_GRAPH_API_URL}{self.phone_number_id}/messages"
+        self.headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
         }
+        self.stats = SenderStats()
+        self.session = httpx.AsyncClient(
+            headers=self.headers,
+            http2=_http2_available(http2),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=timeout,
+        )
+        logger.info(f"AsyncWhatsAppClient initialized for phone number ID: {self.phone_number_id}") # Avoid logging token
+
+    async def _trace(self, event: str, info: dict):
+        self.stats.on_trace(event)
+
+    async def aclose(self):
+        """Closes the pooled connections."""
+        await self.session.aclose()
+
+    async def send(self, to: str, message_body: str) -> SendResult:
+        """
+        Sends a text message to a WhatsApp user.
+
+        Args:
+            to: The recipient's phone number (with country code, no '+').
+            message_body: The content of the text message.
+
+        Returns:
+            SendResult: Whether it was sent, the message ID or the error, and the latency.
+        """
         logger.info(f"Attempting to send message to {to} via number ID {self.phone_number_id}")
+        started = time.perf_counter()
         try:
-            response = requests.post(self.base_url, headers=self.headers, json=payload, timeout=10)
-            response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-
-            response_data = response.json()
-            message_id = response_data.get("messages", [{}])[0].get("id")
-            if message_id:
-                logger.info(f"Message sent successfully to {to}. Message ID: {message_id}")
-                return True
-            else:
-                logger.warning(f"Message sending API call succeeded but no message ID found in response for {to}. Response: {response_data}")
-                return False # Or potentially True depending on desired handling
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error sending WhatsApp message to {to}: {e}")
-            if e.response is not None:
-                logger.error(f"Response status code: {e.response.status_code}")
-                logger.error(f"Response body: {e.response.text}")
-            return False
+            response = await self.session.post(self.base_url, json=_text_payload(to, message_body), extensions={"trace": self._trace})
+            result = _result(to, started, response=response)
         except Exception as e:
-            logger.error(f"An unexpected error occurred while sending message to {to}: {e}")
-            return False
+            result = _result(to, started, error=e)
+        self.stats.record(result)
+        return result
+
+    async def send_text_message(self, to: str, message_body: str):
+        """
+        Sends a text message to a WhatsApp user.
+
+        Returns:
+            bool: True if the message was sent successfully (API accepted it), False otherwise.
+        """
+        return (await self.send(to, message_body)).ok
+
+    async def send_many(self, messages: Iterable[tuple[str, str]]) -> list[SendResult]:
+        """
+        Sends a batch of text messages concurrently over the pooled connections (up to pool_size at a time).
+
+        Args:
+            messages: (to, message_body) pairs.
+
+        Returns:
+            list[SendResult]: One result per message, in the same order.
+        """
+        semaphore = asyncio.Semaphore(self.pool_size)
+
+        async def send_one(to: str, message_body: str) -> SendResult:
+            async with semaphore:
+                return await self.send(to, message_body)
+
+        return list(await asyncio.gather(*(send_one(to, body) for to, body in messages)))
 
 # Example usage (for testing purposes, remove or comment out in production)
 # if __name__ == "__main__":
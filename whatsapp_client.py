@@ -1,37 +1,292 @@
 import os
-import requests
+import asyncio
+import importlib.util
+import httpx
 import logging
-import uuid
 import mimetypes # Import mimetypes
+import hashlib
+import json
+import tempfile
+import threading
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 MEDIA_UPLOAD_DIR = "media_uploads"
+MEDIA_URL_TTL_SEC = 270 # Media URLs are valid for 5 minutes
 
-class WhatsAppClient:
-    """Client primarily for downloading media from the Meta WhatsApp Cloud API."""
+class MediaStore:
+    """
+    Content-addressed store for downloaded media, keyed by the sha256 that the Graph API returns in the media info.
+
+    Each distinct file is kept once as a blob under `<root>/.blobs/`. Callers get a hardlink to the blob
+    (or, where hardlinks aren't supported, the blob path itself, recorded as a reference in the index).
+    A blob with no hardlinks and no recorded references is unreferenced, and can be evicted (least
+    recently used first) when the store grows over `max_bytes`.
+
+    The methods do blocking file IO; call them with `asyncio.to_thread` from async code. Index changes
+    are written at most every `flush_interval` seconds (and on `flush`); blobs missing from the index
+    after a crash are picked up again on startup.
+    """
+    def __init__(self, root: str = MEDIA_UPLOAD_DIR, max_bytes: int = 0, flush_interval: float = 5.0):
+        """
+        Initializes the MediaStore.
+
+        Args:
+            root: The directory to keep the blobs (and the index file) in.
+            max_bytes: Evict unreferenced blobs when the blobs take more than this many bytes (0 for no limit).
+            flush_interval: The minimum time (in seconds) between two writes of the index (0 to write on every change).
+        """
+        self.blobs_dir = os.path.join(root, ".blobs")
+        self.index_path = os.path.join(self.blobs_dir, "index.json")
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        # sha256 -> [blob filename, size, last used (unix time), non-hardlink references]
+        self._index: dict[str, list] = {}
+        try:
+            with open(self.index_path, "r") as f:
+                self._index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read media index {self.index_path}, starting empty: {e}")
+        # Drop entries whose blob was removed behind our back
+        self._index = {sha: entry for sha, entry in self._index.items() if os.path.exists(self._blob_path(entry))}
+        # Pick up blobs stored after the last index write (the blob name is the sha256 plus the extension)
+        known = {entry[0] for entry in self._index.values()}
+        for name in os.listdir(self.blobs_dir):
+            sha256, extension = os.path.splitext(name)
+            if name in known or extension in (".json", ".tmp", ".part") or len(sha256) != 64:
+                continue
+            stat = os.stat(os.path.join(self.blobs_dir, name))
+            self._index[sha256] = [name, stat.st_size, stat.st_mtime, []]
+
+    def _blob_path(self, entry: list) -> str:
+        return os.path.join(self.blobs_dir, entry[0])
+
+    def _save_index(self, force: bool = False):
+        """Writes the index atomically (compact JSON, one small file), at most every `flush_interval` seconds."""
+        self._dirty = True
+        now = time.monotonic()
+        if not force and now - self._saved_at < self.flush_interval:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.blobs_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._index, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+        self._saved_at = now
+
+    def flush(self):
+        """Writes the pending index changes."""
+        with self._lock:
+            if self._dirty:
+                self._save_index(force=True)
+
+    @property
+    def disk_usage(self) -> int:
+        """The total size of the blobs, in bytes."""
+        return sum(entry[1] for entry in self._index.values())
+
+    def temp_path(self) -> str:
+        """Returns a fresh temporary path inside the store (same filesystem as the blobs, so `put` is a rename)."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.blobs_dir, suffix=".part")
+        os.close(fd)
+        return tmp_path
+
+    def has(self, sha256: str) -> bool:
+        """Whether a blob with this sha256 is already stored."""
+        return sha256.lower() in self._index
+
+    def put(self, sha256: str, file_path: str, extension: str, dest_path: str) -> str:
+        """
+        Moves a downloaded (and verified) file into the store and links it to `dest_path`.
+
+        The new blob is referenced before the store is trimmed, so it is never the one evicted.
+
+        Args:
+            sha256: The sha256 (hex) of the file.
+            file_path: The path of the file (ideally from `temp_path`).
+            extension: The extension of the blob (with dot).
+            dest_path: Where the caller wants the file.
+
+        Returns:
+            The path to use (see `link`).
+        """
+        sha256 = sha256.lower()
+        with self._lock:
+            if sha256 in self._index: # Downloaded concurrently by someone else
+                os.remove(file_path)
+            else:
+                entry = [f"{sha256}{extension}", os.path.getsize(file_path), time.time(), []]
+                os.replace(file_path, self._blob_path(entry))
+                self._index[sha256] = entry
+            path = self._link(sha256, dest_path)
+            self._evict(keep=sha256)
+            self._save_index()
+            return path
 
-    def __init__(self, bearer_token: str, api_version: str = "v19.0"):
+    def link(self, sha256: str, dest_path: str) -> str | None:
+        """
+        References a stored blob from `dest_path` (a hardlink, so no bytes are copied).
+
+        Args:
+            sha256: The sha256 (hex) of a stored blob.
+            dest_path: Where the caller wants the file.
+
+        Returns:
+            The path to use: `dest_path`, or the blob path if hardlinks aren't supported.
+            None if the blob is not stored (e.g. evicted since `has` was checked).
+        """
+        sha256 = sha256.lower()
+        with self._lock:
+            if sha256 not in self._index:
+                return None
+            path = self._link(sha256, dest_path)
+            self._save_index()
+            return path
+
+    def _link(self, sha256: str, dest_path: str) -> str:
+        entry = self._index[sha256]
+        entry[2] = time.time()
+        blob_path = self._blob_path(entry)
+        try:
+            if not os.path.exists(dest_path):
+                os.link(blob_path, dest_path)
+            return dest_path
+        except OSError:
+            if dest_path not in entry[3]:
+                entry[3].append(dest_path)
+            return blob_path
+
+    def release(self, sha256: str, path: str) -> None:
+        """Drops a reference returned by `link` (deletes the hardlink), making the blob evictable once unreferenced."""
+        sha256 = sha256.lower()
+        with self._lock:
+            entry = self._index.get(sha256)
+            if entry is None:
+                return
+            if path in entry[3]:
+                entry[3].remove(path)
+            elif path != self._blob_path(entry) and os.path.exists(path):
+                os.remove(path)
+            self._save_index()
+
+    def _is_referenced(self, entry: list) -> bool:
+        try:
+            return bool(entry[3]) or os.stat(self._blob_path(entry)).st_nlink > 1
+        except FileNotFoundError:
+            return False
+
+    def _evict(self, keep: str | None = None):
+        """Removes unreferenced blobs (except `keep`), least recently used first, until the store fits in `max_bytes`."""
+        if not self.max_bytes:
+            return
+        usage = self.disk_usage
+        for sha256, entry in sorted(self._index.items(), key=lambda item: item[1][2]):
+            if usage <= self.max_bytes:
+                break
+            if sha256 == keep or self._is_referenced(entry):
+                continue
+            try:
+                os.remove(self._blob_path(entry))
+            except FileNotFoundError:
+                pass
+            del self._index[sha256]
+            usage -= entry[1]
+            logger.info(f"Evicted unreferenced media blob {sha256} ({entry[1]} bytes)")
+
+def _guess_extension(mime_type: str | None, original_filename: str | None) -> str:
+    """Picks the file extension: from the original filename, else guessed from the MIME type, else '.bin'."""
+    extension = ".bin" # Default fallback
+    if original_filename: # Prefer extension from original filename if available
+        _, ext = os.path.splitext(original_filename)
+        if ext:
+            extension = ext.lower()
+            logger.info(f"Using extension '{extension}' from original filename: {original_filename}")
+    elif mime_type: # Otherwise, try to guess from MIME type
+        guessed_extension = mimetypes.guess_extension(mime_type)
+        if guessed_extension:
+            extension = guessed_extension
+            logger.info(f"Using extension '{extension}' guessed from MIME type: {mime_type}")
+        else:
+             logger.warning(f"Could not guess extension for MIME type: {mime_type}. Using default '{extension}'.")
+    else:
+         logger.warning("No original filename or MIME type provided. Using default extension '.bin'.")
+    return extension
+
+class AsyncWhatsAppClient:
+    """
+    Async client primarily for downloading media from the Meta WhatsApp Cloud API.
+
+    All requests go through one shared httpx.AsyncClient (connection limits, keep-alive, HTTP/2 when
+    the `h2` package is installed), so downloads never block the event loop and reuse connections.
+    """
+
+    def __init__(
+        self,
+        bearer_token: str,
+        api_version: str = "v19.0",
+        store: MediaStore | None = None,
+        max_connections: int = 20,
+        http2: bool = True,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         """
         Initializes the client for media download.
 
         Args:
             bearer_token: Meta WhatsApp Access Token.
             api_version: Graph API version (defaults to v19.0).
+            store: The content-addressed store for downloaded media (defaults to one under media_uploads/).
+            max_connections: The maximum number of open connections (Graph API + CDN).
+            http2: Use HTTP/2 when the `h2` package is installed (multiplexes requests on fewer connections).
+            http_client: An httpx.AsyncClient to use instead of creating one (it must send the Authorization header).
         """
         self.bearer_token = bearer_token
         self.base_url = f"https://graph.facebook.com/{api_version}"
         self.headers = {
             "Authorization": f"Bearer {self.bearer_token}",
         }
+        if http2 and http_client is None and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1 (pip install 'httpx[http2]').")
+            http2 = False
+        # One pooled client, so the URL lookup and the download reuse keep-alive connections
+        self.http = http_client or httpx.AsyncClient(
+            headers=self.headers,
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(30, connect=10),
+            follow_redirects=True,
+        )
+        # media_id -> (expires at, media info), so retries don't repeat the Graph API lookup
+        self._media_info_cache: dict[str, tuple[float, dict]] = {}
+        # media_id -> lookup in progress, so concurrent lookups of the same media share one request
+        self._media_info_lookups: dict[str, asyncio.Future] = {}
         # Ensure media upload directory exists
         os.makedirs(MEDIA_UPLOAD_DIR, exist_ok=True)
-        logger.info(f"WhatsAppClient initialized for media operations.")
+        self.store = store or MediaStore(MEDIA_UPLOAD_DIR, max_bytes=int(os.getenv("MEDIA_STORE_MAX_BYTES", "0")))
+        logger.info(f"AsyncWhatsAppClient initialized for media operations (http2={http2}).")
         logger.info(f"Media will be saved to: {os.path.abspath(MEDIA_UPLOAD_DIR)}")
 
-    def get_media_url(self, media_id: str) -> str | None:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes the pooled connections and writes the pending media index changes."""
+        await self.http.aclose()
+        await asyncio.to_thread(self.store.flush)
+
+    async def get_media_url(self, media_id: str) -> str | None:
         """
         Retrieves the temporary download URL for a given media ID.
 
@@ -41,71 +296,101 @@ class WhatsAppClient:
         Returns:
             The temporary download URL string, or None if an error occurs.
         """
+        media_info = await self.get_media_info(media_id)
+        return media_info["url"] if media_info else None
+
+    async def get_media_info(self, media_id: str, refresh: bool = False) -> dict | None:
+        """
+        Retrieves the media info (url, mime_type, sha256, file_size) for a given media ID.
+        Results are cached for MEDIA_URL_TTL_SEC (the URL is only valid for 5 minutes).
+
+        Args:
+            media_id: The ID of the media object.
+            refresh: Skip the cache (e.g. when the cached URL was rejected).
+
+        Returns:
+            The media info dict, or None if an error occurs.
+        """
+        now = time.monotonic()
+        cached = self._media_info_cache.get(media_id)
+        if cached and cached[0] > now and not refresh:
+            return cached[1]
+        if media_id in self._media_info_lookups:
+            return await asyncio.shield(self._media_info_lookups[media_id])
+        # Drop expired entries while we're here
+        self._media_info_cache = {k: v for k, v in self._media_info_cache.items() if v[0] > now}
+        lookup = self._media_info_lookups[media_id] = asyncio.get_running_loop().create_future()
+        try:
+            media_info = await self._fetch_media_info(media_id) # Logs errors and returns None, doesn't raise
+        except BaseException:
+            lookup.cancel() # Cancelled: the waiters retry on their own
+            raise
+        finally:
+            del self._media_info_lookups[media_id]
+        lookup.set_result(media_info)
+        if media_info:
+            self._media_info_cache[media_id] = (time.monotonic() + MEDIA_URL_TTL_SEC, media_info)
+        return media_info
+
+    async def _fetch_media_info(self, media_id: str) -> dict | None:
         url = f"{self.base_url}/{media_id}"
         try:
-            response = requests.get(url, headers=self.headers)
+            response = await self.http.get(url, timeout=10)
             response.raise_for_status()
             media_info = response.json()
-            media_url = media_info.get("url")
-            if not media_url:
+            if not media_info.get("url"):
                  logger.error(f"Could not find 'url' in response for media ID {media_id}: {media_info}")
                  return None
             logger.info(f"Retrieved media URL for ID {media_id}")
-            return media_url
-        except requests.exceptions.RequestException as e:
+            return media_info
+        except httpx.HTTPStatusError as e:
             logger.error(f"Error retrieving media URL for ID {media_id}: {e}")
-            if e.response is not None:
-                logger.error(f"Response status code: {e.response.status_code}")
-                logger.error(f"Response body: {e.response.text}")
+            logger.error(f"Response status code: {e.response.status_code}")
+            logger.error(f"Response body: {e.response.text}")
             return None
         except Exception as e:
             logger.error(f"An unexpected error occurred retrieving media URL: {e}")
             return None
 
-    def download_media(self, media_url: str, save_path: str) -> bool:
+    async def download_media(self, media_url: str, save_path: str, expected_sha256: str | None = None) -> bool:
         """
-        Downloads media content from a URL and saves it to a file.
+        Downloads media content from a URL and saves it to a file, streaming it in chunks.
 
         Args:
             media_url: The URL to download the media from.
             save_path: The full local file path to save the media.
+            expected_sha256: The sha256 (hex) from the media info; the download fails if the content doesn't match.
 
         Returns:
             True if download and save were successful, False otherwise.
         """
         try:
-            with requests.get(media_url, headers=self.headers, stream=True) as r:
+            hasher = hashlib.sha256()
+            async with self.http.stream("GET", media_url) as r:
                 r.raise_for_status()
                 with open(save_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
+                    async for chunk in r.aiter_bytes(64 * 1024):
+                        hasher.update(chunk)
                         f.write(chunk)
+            if expected_sha256 and hasher.hexdigest() != expected_sha256.lower():
+                raise ValueError(f"sha256 mismatch: expected {expected_sha256}, got {hasher.hexdigest()}")
             logger.info(f"Successfully downloaded media to: {save_path}")
             return True
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPStatusError as e:
             logger.error(f"Error downloading media from {media_url}: {e}")
-            if e.response is not None:
-                logger.error(f"Response status code: {e.response.status_code}")
-                logger.error(f"Response body: {e.response.text}")
-            # Clean up potentially partially downloaded file
-            if os.path.exists(save_path):
-                try:
-                    os.remove(save_path)
-                    logger.info(f"Removed partially downloaded file: {save_path}")
-                except OSError as remove_err:
-                    logger.error(f"Error removing partially downloaded file {save_path}: {remove_err}")
-            return False
+            logger.error(f"Response status code: {e.response.status_code}")
         except Exception as e:
             logger.error(f"An unexpected error occurred downloading media: {e}")
-             # Clean up potentially partially downloaded file
-            if os.path.exists(save_path):
-                 try:
-                     os.remove(save_path)
-                     logger.info(f"Removed partially downloaded file: {save_path}")
-                 except OSError as remove_err:
-                     logger.error(f"Error removing partially downloaded file {save_path}: {remove_err}")
-            return False
+        # Clean up potentially partially downloaded file
+        if os.path.exists(save_path):
+            try:
+                os.remove(save_path)
+                logger.info(f"Removed partially downloaded file: {save_path}")
+            except OSError as remove_err:
+                logger.error(f"Error removing partially downloaded file {save_path}: {remove_err}")
+        return False
 
-    def download_media_by_id(
+    async def download_media_by_id(
         self,
         media_id: str,
         filename_prefix: str = "media",
@@ -115,6 +400,7 @@ class WhatsAppClient:
     ) -> str | None:
         """
         Orchestrates getting the media URL and downloading the media, constructing a better filename.
+        Media we already hold (same sha256) is not downloaded again; the file is linked to the stored blob.
 
         Args:
             media_id: The ID of the media to download.
@@ -127,36 +413,95 @@ class WhatsAppClient:
             The absolute path to the saved media file, or None if an error occurs.
         """
         logger.info(f"Attempting to download media with ID: {media_id}")
-        media_url = self.get_media_url(media_id)
-        if not media_url:
+        media_info = await self.get_media_info(media_id)
+        if not media_info:
             return None
+        media_url = media_info["url"]
+        sha256 = media_info.get("sha256")
+        extension = _guess_extension(mime_type or media_info.get("mime_type"), original_filename)
 
-        # Determine file extension
-        extension = ".bin" # Default fallback
-        if original_filename: # Prefer extension from original filename if available
-            _, ext = os.path.splitext(original_filename)
-            if ext:
-                extension = ext.lower()
-                logger.info(f"Using extension '{extension}' from original filename: {original_filename}")
-        elif mime_type: # Otherwise, try to guess from MIME type
-            guessed_extension = mimetypes.guess_extension(mime_type)
-            if guessed_extension:
-                extension = guessed_extension
-                logger.info(f"Using extension '{extension}' guessed from MIME type: {mime_type}")
-            else:
-                 logger.warning(f"Could not guess extension for MIME type: {mime_type}. Using default '{extension}'.")
-        else:
-             logger.warning("No original filename or MIME type provided. Using default extension '.bin'.")
+        if not sha256: # Can't address it by content, download as before
+            save_path = os.path.join(save_dir, f"{filename_prefix}_{media_id}{extension}")
+            return os.path.abspath(save_path) if await self.download_media(media_url, save_path) else None
 
         # Construct filename
-        # Use prefix, media_id, and a unique ID to avoid collisions
-        filename = f"{filename_prefix}_{uuid.uuid4()}{extension}"
+        # Use prefix and the content hash (deterministic, so a redelivered message maps to the same file)
+        filename = f"{filename_prefix}_{sha256[:16]}{extension}"
         save_path = os.path.join(save_dir, filename)
 
-        if self.download_media(media_url, save_path):
-            return os.path.abspath(save_path)
-        else:
-            return None
+        if self.store.has(sha256):
+            path = await asyncio.to_thread(self.store.link, sha256, save_path)
+            if path is not None:
+                logger.info(f"Media {media_id} (sha256 {sha256}) already stored, skipping download")
+                return os.path.abspath(path)
+        tmp_path = await asyncio.to_thread(self.store.temp_path)
+        if not await self.download_media(media_url, tmp_path, expected_sha256=sha256):
+            # The cached URL may have been rejected by the CDN (401/404); retry once with a fresh one
+            media_info = await self.get_media_info(media_id, refresh=True)
+            if not media_info or not await self.download_media(media_info["url"], tmp_path, expected_sha256=sha256):
+                return None
+        return os.path.abspath(await asyncio.to_thread(self.store.put, sha256, tmp_path, extension, save_path))
+
+class WhatsAppClient:
+    """
+    Blocking client for downloading media, for scripts.
+
+    A thin wrapper that runs AsyncWhatsAppClient on a private event loop; use AsyncWhatsAppClient
+    from async code (e.g. pywa_async handlers).
+    """
+
+    def __init__(self, bearer_token: str, api_version: str = "v19.0", store: MediaStore | None = None, **kwargs):
+        """
+        Initializes the client for media download.
+
+        Args:
+            bearer_token: Meta WhatsApp Access Token.
+            api_version: Graph API version (defaults to v19.0).
+            store: The content-addressed store for downloaded media (defaults to one under media_uploads/).
+            **kwargs: Passed to AsyncWhatsAppClient (max_connections, http2, ...).
+        """
+        self._loop = asyncio.new_event_loop()
+        self._lock = threading.Lock() # The private loop can only run one call at a time
+        self._client = AsyncWhatsAppClient(bearer_token, api_version=api_version, store=store, **kwargs)
+        self.store = self._client.store
+
+    def _run(self, coro):
+        with self._lock:
+            return self._loop.run_until_complete(coro)
+
+    def close(self):
+        """Closes the pooled connections and the private event loop."""
+        self._run(self._client.aclose())
+        self._loop.close()
+
+    def get_media_url(self, media_id: str) -> str | None:
+        """See AsyncWhatsAppClient.get_media_url."""
+        return self._run(self._client.get_media_url(media_id))
+
+    def get_media_info(self, media_id: str, refresh: bool = False) -> dict | None:
+        """See AsyncWhatsAppClient.get_media_info."""
+        return self._run(self._client.get_media_info(media_id, refresh=refresh))
+
+    def download_media(self, media_url: str, save_path: str, expected_sha256: str | None = None) -> bool:
+        """See AsyncWhatsAppClient.download_media."""
+        return self._run(self._client.download_media(media_url, save_path, expected_sha256=expected_sha256))
+
+    def download_media_by_id(
+        self,
+        media_id: str,
+        filename_prefix: str = "media",
+        save_dir: str = MEDIA_UPLOAD_DIR,
+        mime_type: str | None = None,
+        original_filename: str | None = None
+    ) -> str | None:
+        """See AsyncWhatsAppClient.download_media_by_id."""
+        return self._run(self._client.download_media_by_id(
+            media_id,
+            filename_prefix=filename_prefix,
+            save_dir=save_dir,
+            mime_type=mime_type,
+            original_filename=original_filename,
+        ))
 
 # Example Usage (Updated for testing download only)
 if __name__ == '__main__':